@@ -1,3 +1,5 @@
+import multiprocessing
+
 try:
     from .main import run
 except ImportError:
@@ -5,6 +7,8 @@ except ImportError:
 
 
 def main() -> None:
+    # Needed for the parallel CSV reader's worker processes in frozen builds.
+    multiprocessing.freeze_support()
     run()
 
 
@@ -0,0 +1,520 @@
+"""
+Headless command-line tools for large address books (no GUI import).
+
+Usage:
+    ringcentral-csv-editor-cli batch INPUT.csv OUTPUT.csv [--checkpoint-every N] [--restart]
+    ringcentral-csv-editor-cli shard INPUT.csv OUT_DIR [--max-rows N] [--max-bytes N] [--route-by COLUMN]
+    ringcentral-csv-editor-cli convert INPUT OUTPUT [--columns A,B,...] [--no-normalise] [--keep-format]
+    ringcentral-csv-editor-cli registry {add,refresh,remove,list,lookup} ...
+    ringcentral-csv-editor-cli watch IN_DIR OUT_DIR [--workers N] [--max-pending N] [--interval SECONDS]
+    ringcentral-csv-editor-cli upload INPUT URL [--token T] [--batch-size N] [--concurrency N] [--restart]
+    ringcentral-csv-editor-cli mock-server [--port N] [--rate-limit N] [--fail-rate F] [--latency SECONDS]
+    ringcentral-csv-editor-cli serve BOOK [--host H] [--port N] [--out PATH] [--token T]
+    ringcentral-csv-editor-cli loadtest URL [--requests N] [--concurrency N] [--token T]
+    ringcentral-csv-editor-cli region [BOOK [REGION]]
+    ringcentral-csv-editor-cli rules [RULES.toml]
+
+--region XX (before the command) sets the numbering plan for phone numbers
+written without a "+"; otherwise the book's saved region (or AU) is used.
+--rules PATH (before the command) sets the validation rules file; otherwise
+~/ringcentral-csv-editor/rules.toml is used if it exists.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import sys
+
+from .helper.batch import BatchJob
+from .helper.columnar import is_columnar
+from .helper.csv_helper import RingCentralCSV
+from .helper.loadtest import run_load_test
+from .helper.logs import LOG_FORMAT, RateLimitFilter
+from .helper.mock_server import MockContactsServer
+from .helper.numbering import DEFAULT_REGION, NUMBERING_PLANS, book_region, set_book_region
+from .helper.registry import NumberRegistry
+from .helper.rules import DEFAULT_RULES_PATH, RuleSet
+from .helper.service import BookService, ServiceServer
+from .helper.upload import BulkUploader, UploadError, target_key
+from .helper.watcher import FolderWatcher
+
+
+def _region(args: argparse.Namespace, book: str | None = None) -> str:
+    return args.region or (book and book_region(book)) or DEFAULT_REGION
+
+
+def cmd_batch(args: argparse.Namespace) -> int:
+    job = BatchJob(
+        args.input, args.output,
+        checkpoint_every=args.checkpoint_every, region=_region(args, args.input),
+        rules=args.rule_set,
+    )
+    try:
+        resume = None if args.restart else job.load_checkpoint()
+    except ValueError as ex:
+        print(ex, file=sys.stderr)
+        return 1
+    if resume:
+        print(f"Resuming from row {resume['rows_read']} (byte {resume['input_offset']})")
+
+    def progress(state: dict) -> None:
+        print(f"  {state['rows_read']} rows read, {state['rows_emitted']} written", flush=True)
+
+    try:
+        state = job.run(restart=args.restart, progress=progress)
+    except (FileNotFoundError, ValueError) as ex:
+        print(ex, file=sys.stderr)
+        return 1
+
+    print(f"Written: {job.out_path}")
+    print(f"Issues:  {job.issues_path} ({state['invalid']} invalid, {state['duplicates']} duplicates)")
+    return 0
+
+
+def cmd_shard(args: argparse.Namespace) -> int:
+    if args.max_rows is None and args.max_bytes is None and not args.route_by:
+        print("Give --max-rows, --max-bytes and/or --route-by", file=sys.stderr)
+        return 1
+    rc = RingCentralCSV()
+    try:
+        rows = rc.parallel_checker(args.input)
+        manifest = rc.shard_writer(
+            rc.fieldnames, rows, args.out_dir,
+            max_rows=args.max_rows, max_bytes=args.max_bytes,
+            name_template=args.template, route_by=args.route_by, workers=args.workers,
+        )
+    except (FileNotFoundError, ValueError) as ex:
+        print(ex, file=sys.stderr)
+        return 1
+    print(f"Written: {manifest}")
+    return 0
+
+
+def cmd_convert(args: argparse.Namespace) -> int:
+    rc = RingCentralCSV(region=_region(args, args.input), rules=args.rule_set)
+    columns = [c.strip() for c in args.columns.split(",")] if args.columns else None
+    try:
+        if is_columnar(args.input):
+            rows = rc.columnar_checker(args.input)
+        else:
+            rows = rc.parallel_checker(args.input)
+        if is_columnar(args.output):
+            saved = rc.columnar_writer(
+                rc.fieldnames, rows, args.output,
+                columns=columns, normalise=not args.no_normalise,
+            )
+        else:
+            saved = rc.writer(
+                columns or rc.fieldnames, rows, out_path=args.output,
+                csv_format=rc.csv_format if args.keep_format else None,
+            )
+    except (FileNotFoundError, ImportError, ValueError) as ex:
+        print(ex, file=sys.stderr)
+        return 1
+    print(f"Written: {saved} ({len(rows)} rows)")
+    return 0
+
+
+def _load_book(path: str, rc: RingCentralCSV | None = None) -> list[dict]:
+    rc = rc or RingCentralCSV()
+    if is_columnar(path):
+        return rc.columnar_checker(path)
+    return rc.parallel_checker(path)
+
+
+def cmd_registry(args: argparse.Namespace) -> int:
+    registry = NumberRegistry(args.db)
+    try:
+        if args.action in ("add", "refresh"):
+            books = args.books if args.action == "add" else registry.stale_books()
+            if not books:
+                print("Registry is up to date")
+            failed = 0
+            for book in books:
+                try:
+                    added, removed = registry.update_book(book, _load_book(book))
+                except FileNotFoundError:
+                    registry.remove_book(book)
+                    print(f"Removed (file gone): {book}")
+                    continue
+                except (ImportError, ValueError) as ex:
+                    print(f"{book}: {ex}", file=sys.stderr)
+                    failed += 1
+                    continue
+                print(f"{book}: +{added} / -{removed} numbers")
+            if failed:
+                return 1
+        elif args.action == "remove":
+            for book in args.books:
+                registry.remove_book(book)
+                print(f"Removed: {book}")
+        elif args.action == "list":
+            for book, rows, updated in registry.books():
+                stale = "  (changed since)" if registry.is_stale(book) else ""
+                print(f"{book}  {rows} rows  {updated}{stale}")
+        elif args.action == "lookup":
+            try:
+                number = RingCentralCSV.field_formatter("Mobile Number", args.number, region=_region(args))
+            except ValueError:
+                number = args.number.strip()
+            hits = registry.lookup(number)
+            if not hits:
+                print(f"{number}: not registered")
+                return 1
+            for book, row, field, external_id in hits:
+                ext = f"  External Id {external_id}" if external_id else ""
+                print(f"{number}: {book} row {row+1} ({field}){ext}")
+    except ValueError as ex:
+        print(ex, file=sys.stderr)
+        return 1
+    finally:
+        registry.close()
+    return 0
+
+
+def cmd_watch(args: argparse.Namespace) -> int:
+    watcher = FolderWatcher(
+        args.in_dir, args.out_dir,
+        workers=args.workers, max_pending=args.max_pending, poll_interval=args.interval,
+        region=_region(args), rules_path=args.rules,
+    )
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: watcher.stop())
+    # The daemon is pointless without progress output
+    logging.getLogger().setLevel(logging.INFO)
+    print(f"Watching {watcher.in_dir} (Ctrl+C to stop)", flush=True)
+
+    stats = watcher.run()
+    print(
+        f"Stopped: {stats['processed']} processed, {stats['failed']} failed, "
+        f"{stats['rows']} rows in {stats['elapsed_s']}s"
+    )
+    return 0
+
+
+def cmd_upload(args: argparse.Namespace) -> int:
+    rc = RingCentralCSV(region=_region(args, args.input), rules=args.rule_set)
+    try:
+        rows = _load_book(args.input, rc)
+    except (FileNotFoundError, ImportError, ValueError) as ex:
+        print(ex, file=sys.stderr)
+        return 1
+
+    # Only upload what writer() would have accepted
+    cleaned, invalid = [], []
+    unique = rc.unique_index(cleaned)
+    for n, row in enumerate(rows, start=1):
+        try:
+            row = rc.normalise_row(row)
+            unique.check(row)
+        except ValueError as ex:
+            invalid.append(f"row {n}: {ex}")
+        else:
+            cleaned.append(row)
+            unique.add(row)
+    if invalid:
+        more = f"\n...and {len(invalid) - 10} more" if len(invalid) > 10 else ""
+        print("Fix these rows before uploading:\n" + "\n".join(invalid[:10]) + more, file=sys.stderr)
+        return 1
+
+    token = args.token or os.environ.get("RINGCENTRAL_TOKEN")
+    uploader = BulkUploader(
+        args.url,
+        token=token,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        max_retries=args.retries,
+        state_path=f"{args.input}.{target_key(args.url, token)}.upload.json",
+    )
+
+    def progress(acked: int, total: int) -> None:
+        if args.verbose or acked == total:
+            print(f"  {acked}/{total} batches acknowledged", flush=True)
+
+    try:
+        stats = uploader.upload(cleaned, restart=args.restart, progress=progress)
+    except (UploadError, ValueError) as ex:
+        print(ex, file=sys.stderr)
+        if uploader.state_path.exists():
+            print(f"Progress saved to {uploader.state_path}; run the same command again to resume.", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        print(f"Interrupted; progress saved to {uploader.state_path}", file=sys.stderr)
+        return 130
+
+    print(
+        f"Uploaded {stats['rows']} rows in {stats['batches']} batches "
+        f"({stats['skipped_batches']} already sent) in {stats['elapsed_s']}s: "
+        f"{stats['rows_per_s']} rows/s, {stats['retries']} retries "
+        f"({stats['rate_limited']} rate-limited), {stats['connections']} connections"
+    )
+    return 0
+
+
+def cmd_mock_server(args: argparse.Namespace) -> int:
+    server = MockContactsServer(
+        args.host, args.port,
+        rate_limit=args.rate_limit, fail_rate=args.fail_rate, latency=args.latency, token=args.token,
+    )
+    print(f"Mock contacts endpoint: {server.url} (Ctrl+C to stop)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    print(f"Stored {server.contacts} contacts; {server.stats}")
+    return 0
+
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    service = BookService(args.book, region=_region(args, args.book), rules=args.rule_set, out_path=args.out)
+    try:
+        service.load()
+    except (FileNotFoundError, ImportError, ValueError) as ex:
+        print(ex, file=sys.stderr)
+        return 1
+    stats = service.stats()
+    print(
+        f"Loaded {stats['rows']} rows ({stats['invalid_rows']} invalid, "
+        f"{stats['duplicate_numbers']} duplicate numbers) in {stats['load_s']}s"
+    )
+    server = ServiceServer(service, args.host, args.port, token=args.token or os.environ.get("RINGCENTRAL_TOKEN"))
+
+    async def serve() -> None:
+        await server.start()
+        print(f"Serving {args.book} on {server.url} (Ctrl+C to stop); exports go to {service.out_path}", flush=True)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    except OSError as ex:
+        print(ex, file=sys.stderr)
+        return 1
+    print(f"Answered {server.requests} requests; appended {service.appended} rows, {service.exports} exports")
+    return 0
+
+
+def cmd_loadtest(args: argparse.Namespace) -> int:
+    try:
+        stats = asyncio.run(run_load_test(
+            args.url, requests=args.requests, concurrency=args.concurrency,
+            token=args.token or os.environ.get("RINGCENTRAL_TOKEN"),
+        ))
+    except (OSError, ValueError) as ex:
+        print(ex, file=sys.stderr)
+        return 1
+    print(
+        f"{stats['requests']} requests in {stats['elapsed_s']}s: {stats['requests_per_s']} requests/s, "
+        f"{stats['errors']} errors, statuses {stats['statuses']}"
+    )
+    for kind in ("overall", "lookup", "search", "validate"):
+        if kind in stats:
+            s = stats[kind]
+            print(f"  {kind:<9} {s['count']:>7}  p50 {s['p50_ms']} ms  p95 {s['p95_ms']} ms  p99 {s['p99_ms']} ms")
+    return 0 if not stats["errors"] else 1
+
+
+def cmd_region(args: argparse.Namespace) -> int:
+    if not args.book:
+        for code, plan in NUMBERING_PLANS.items():
+            default = "  (default)" if code == DEFAULT_REGION else ""
+            print(f"{code}  +{plan['country_code']}  {plan['name']}{default}")
+        return 0
+    if args.set_region:
+        try:
+            set_book_region(args.book, args.set_region.upper())
+        except ValueError as ex:
+            print(ex, file=sys.stderr)
+            return 1
+    saved = book_region(args.book)
+    print(f"{args.book}: {saved or DEFAULT_REGION + ' (default)'}")
+    return 0
+
+
+def cmd_rules(args: argparse.Namespace) -> int:
+    rules = args.rule_set
+    if rules is None:
+        print(f"No rules file ({DEFAULT_RULES_PATH} does not exist); built-in validation only")
+        return 0
+    print(f"{rules.source}: OK")
+    for column, spec in rules.columns.items():
+        print(f"  {column}: " + ", ".join(f"{k}={v!r}" for k, v in spec.items()))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="ringcentral-csv-editor-cli",
+        description="Headless tools for RingCentral address book CSVs.",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log progress to stderr")
+    parser.add_argument("--region", type=str.upper, choices=list(NUMBERING_PLANS), metavar="XX",
+                        help=f"Numbering plan for numbers without a '+' ({', '.join(NUMBERING_PLANS)}; "
+                             f"default: the book's saved region, else {DEFAULT_REGION})")
+    parser.add_argument("--rules", metavar="PATH",
+                        help=f"Validation rules file (default: {DEFAULT_RULES_PATH}, if it exists)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    batch = sub.add_parser(
+        "batch",
+        help="Clean + normalise a large CSV, resumable after interruption",
+    )
+    batch.add_argument("input", help="RingCentral CSV to clean")
+    batch.add_argument("output", help="Cleaned CSV to write")
+    batch.add_argument("--checkpoint-every", type=int, default=10000, metavar="N",
+                       help="Rows between checkpoints (default 10000)")
+    batch.add_argument("--restart", action="store_true",
+                       help="Ignore any saved checkpoint and start from the beginning")
+    batch.set_defaults(func=cmd_batch)
+
+    shard = sub.add_parser(
+        "shard",
+        help="Split a CSV into size-capped import files with a manifest",
+    )
+    shard.add_argument("input", help="RingCentral CSV to split")
+    shard.add_argument("out_dir", help="Folder for the shards and manifest.json")
+    shard.add_argument("--max-rows", type=int, metavar="N", help="Maximum data rows per file")
+    shard.add_argument("--max-bytes", type=int, metavar="N", help="Maximum file size in bytes (header included)")
+    shard.add_argument("--route-by", metavar="COLUMN", help="Write a separate set of files per value of COLUMN (e.g. Company)")
+    shard.add_argument("--template", metavar="NAME",
+                       help="Filename template using {index}, {key}, {part} (default AddressBook-{index:03d}.csv)")
+    shard.add_argument("--workers", type=int, default=4, help="Files written concurrently (default 4)")
+    shard.set_defaults(func=cmd_shard)
+
+    convert = sub.add_parser(
+        "convert",
+        help="Convert between CSV and Parquet / Arrow IPC (by file suffix)",
+    )
+    convert.add_argument("input", help="Source .csv, .parquet, .arrow or .feather")
+    convert.add_argument("output", help="Destination .csv, .parquet, .arrow or .feather")
+    convert.add_argument("--columns", metavar="A,B,...", help="Only write these columns, in this order")
+    convert.add_argument("--no-normalise", action="store_true",
+                         help="Write Parquet/Arrow rows as-is instead of validating and normalising them")
+    convert.add_argument("--keep-format", action="store_true",
+                         help="CSV to CSV: keep the input's encoding, delimiter and line endings (default UTF-8, comma)")
+    convert.set_defaults(func=cmd_convert)
+
+    registry = sub.add_parser(
+        "registry",
+        help="Manage the cross-book phone-number registry",
+    )
+    registry.add_argument("--db", metavar="PATH",
+                          help="Registry database (default ~/ringcentral-csv-editor/registry.sqlite3)")
+    actions = registry.add_subparsers(dest="action", required=True)
+    add = actions.add_parser("add", help="Register (or re-index) books")
+    add.add_argument("books", nargs="+", metavar="BOOK")
+    actions.add_parser("refresh", help="Re-index registered books whose file changed")
+    remove = actions.add_parser("remove", help="Forget books")
+    remove.add_argument("books", nargs="+", metavar="BOOK")
+    actions.add_parser("list", help="List registered books")
+    lookup = actions.add_parser("lookup", help="Show which books use a number")
+    lookup.add_argument("number")
+    registry.set_defaults(func=cmd_registry)
+
+    watch = sub.add_parser(
+        "watch",
+        help="Clean every CSV dropped into a folder (runs until Ctrl+C / SIGTERM)",
+    )
+    watch.add_argument("in_dir", help="Drop folder to watch")
+    watch.add_argument("out_dir", help="Folder for <name>.cleaned.csv and <name>.report.json")
+    watch.add_argument("--workers", type=int, default=2, help="Files processed in parallel (default 2)")
+    watch.add_argument("--max-pending", type=int, metavar="N",
+                       help="Files queued or running before polling pauses (default 2 x workers)")
+    watch.add_argument("--interval", type=float, default=2.0, metavar="SECONDS",
+                       help="Polling interval (default 2)")
+    watch.set_defaults(func=cmd_watch)
+
+    upload = sub.add_parser(
+        "upload",
+        help="Upload a cleaned book to a contacts endpoint in batches (resumable)",
+    )
+    upload.add_argument("input", help="Cleaned .csv, .parquet, .arrow or .feather to upload")
+    upload.add_argument("url", help="Endpoint URL, e.g. http://127.0.0.1:8080/contacts")
+    upload.add_argument("--token", help="Bearer token (default: $RINGCENTRAL_TOKEN)")
+    upload.add_argument("--batch-size", type=int, default=100, metavar="N", help="Contacts per request (default 100)")
+    upload.add_argument("--concurrency", type=int, default=4, metavar="N",
+                        help="Requests in flight / pooled connections (default 4)")
+    upload.add_argument("--retries", type=int, default=5, metavar="N",
+                        help="Retries per batch on 429 / 5xx / connection errors (default 5)")
+    upload.add_argument("--restart", action="store_true",
+                        help="Ignore saved progress and upload every batch again")
+    upload.set_defaults(func=cmd_upload)
+
+    mock = sub.add_parser(
+        "mock-server",
+        help="Run a local mock contacts endpoint for testing uploads offline",
+    )
+    mock.add_argument("--host", default="127.0.0.1")
+    mock.add_argument("--port", type=int, default=8080)
+    mock.add_argument("--rate-limit", type=float, default=0, metavar="N",
+                      help="Requests per second before answering 429 (default: no limit)")
+    mock.add_argument("--fail-rate", type=float, default=0.0, metavar="F",
+                      help="Fraction of requests answered with 503 (default 0)")
+    mock.add_argument("--latency", type=float, default=0.0, metavar="SECONDS",
+                      help="Delay added to every response (default 0)")
+    mock.add_argument("--token", help="Require this bearer token")
+    mock.set_defaults(func=cmd_mock_server)
+
+    serve = sub.add_parser(
+        "serve",
+        help="Load a book once and answer validate / lookup / search / append / export over local HTTP",
+    )
+    serve.add_argument("book", metavar="BOOK", help=".csv, .parquet, .arrow or .feather to serve")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--out", metavar="PATH", help="Default export path (default: BOOK.served.<ext>)")
+    serve.add_argument("--token", help="Require this bearer token (default: $RINGCENTRAL_TOKEN)")
+    serve.set_defaults(func=cmd_serve)
+
+    loadtest = sub.add_parser(
+        "loadtest",
+        help="Measure requests/s and latency of a running serve",
+    )
+    loadtest.add_argument("url", help="Service URL, e.g. http://127.0.0.1:8765")
+    loadtest.add_argument("--requests", type=int, default=10_000, metavar="N", help="Requests to send (default 10000)")
+    loadtest.add_argument("--concurrency", type=int, default=32, metavar="N",
+                          help="Keep-alive connections in parallel (default 32)")
+    loadtest.add_argument("--token", help="Bearer token (default: $RINGCENTRAL_TOKEN)")
+    loadtest.set_defaults(func=cmd_loadtest)
+
+    region = sub.add_parser(
+        "region",
+        help="List supported regions, or show / set a book's default region",
+    )
+    region.add_argument("book", nargs="?", metavar="BOOK")
+    region.add_argument("set_region", nargs="?", metavar="REGION", help="Save REGION as BOOK's default")
+    region.set_defaults(func=cmd_region)
+
+    rules = sub.add_parser(
+        "rules",
+        help="Check a validation rules file and list its rules",
+    )
+    rules.add_argument("rules_file", nargs="?", metavar="RULES.toml", help="Rules file (default: --rules or the default file)")
+    rules.set_defaults(func=cmd_rules)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format=LOG_FORMAT,
+    )
+    for handler in logging.getLogger().handlers:
+        handler.addFilter(RateLimitFilter())
+    try:
+        args.rule_set = RuleSet.load(getattr(args, "rules_file", None) or args.rules)
+    except (FileNotFoundError, ValueError) as ex:
+        print(ex, file=sys.stderr)
+        sys.exit(1)
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+#!/usr/bin/python
+
+# Import Libraries
+import io
+import os
+import csv
+import json
+import mmap
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+import logging
+
+from .csv_format import sniff_format
+from .csv_helper import RingCentralCSV
+from .numbering import DEFAULT_REGION
+from .rules import RuleSet
+from .parallel_reader import find_header
+logger = logging.getLogger(__name__)
+
+
+class BatchJob:
+	'''
+	Clean + normalise a (possibly multi-GB) CSV into out_path, recording a
+	checkpoint every checkpoint_every rows so an interrupted run can resume.
+
+	Files written next to out_path:
+	  <out>                   cleaned rows (same format as RingCentralCSV.writer)
+	  <out>.issues.csv        row, kind (invalid | duplicate), detail
+	  <out>.index             duplicate-index journal: number, row, field
+	                          (and value, row, "unique:<column>" for unique rules)
+	  <out>.checkpoint.json   input byte offset + output/issues/index offsets
+
+	The input's encoding and delimiter are sniffed once and kept in the
+	checkpoint; UTF-16/32 input can't be split on raw bytes and is rejected
+	(convert it first). Output is always UTF-8 with commas.
+
+	A checkpoint is only written after the three data files are flushed and
+	fsynced, so on resume they are truncated back to the recorded offsets and
+	the input is re-read from the recorded byte offset. The final files are
+	byte-identical to an uninterrupted run. The journal and checkpoint are
+	removed once the run completes.
+	'''
+	def __init__(
+		self,
+		csv_in_path: str | Path,
+		out_path: str | Path,
+		required_headers: Iterable[str] = ("First Name", "Surname"),
+		checkpoint_every: int = 10000,
+		region: str = DEFAULT_REGION,
+		rules: RuleSet | None = None,
+	):
+		self.in_path = Path(csv_in_path).expanduser()
+		self.out_path = Path(out_path).expanduser()
+		self.required = {str(h or "").strip() for h in required_headers}
+		self.checkpoint_every = max(1, checkpoint_every)
+		self.region = region
+		self.rules = rules
+
+		self.issues_path = self.out_path.with_name(self.out_path.name + ".issues.csv")
+		self.index_path = self.out_path.with_name(self.out_path.name + ".index")
+		self.checkpoint_path = self.out_path.with_name(self.out_path.name + ".checkpoint.json")
+
+
+	def _input_stamp(self) -> dict:
+		stat = self.in_path.stat()
+		return {
+			"input": str(self.in_path.resolve()),
+			"input_size": stat.st_size,
+			"input_mtime": stat.st_mtime_ns,
+			# Resuming under another region would mix two numbering plans in one output
+			"region": self.region,
+			# ...and rows before the checkpoint were validated under these rules
+			"rules": (self.rules or RuleSet()).digest(),
+		}
+
+
+	def load_checkpoint(self) -> dict | None:
+		'''
+		Returns the saved checkpoint, or None if there is nothing to resume.
+		Raises ValueError if the input file, region or rules changed since it
+		was written.
+		'''
+		if not self.checkpoint_path.exists():
+			return None
+		state = json.loads(self.checkpoint_path.read_text(encoding="utf-8"))
+		stamp = self._input_stamp()
+		changed = [k for k, v in stamp.items() if state.get(k) != v]
+		if changed:
+			what = "Rules" if changed == ["rules"] else "Region" if changed == ["region"] else "Input"
+			raise ValueError(
+				f"{what} changed since checkpoint {self.checkpoint_path}; delete it (or use restart) to start over."
+			)
+		return state
+
+
+	def _save_checkpoint(self, state: dict) -> None:
+		tmp = self.checkpoint_path.with_name(self.checkpoint_path.name + ".tmp")
+		with tmp.open("w", encoding="utf-8") as f:
+			json.dump(state, f)
+			f.flush()
+			os.fsync(f.fileno())
+		os.replace(tmp, self.checkpoint_path)
+
+
+	def _records(self, f, fieldnames: list[str], progress: dict, encoding: str = "utf-8", delimiter: str = ",") -> Iterator[dict]:
+		'''
+		Yield DictReader-style rows from the binary file f, keeping
+		progress["offset"] at the byte offset just past the last yielded record.
+		'''
+		def lines() -> Iterator[str]:
+			for raw in f:
+				progress["pending"] += len(raw)
+				try:
+					yield raw.decode(encoding)
+				except UnicodeDecodeError as ex:
+					raise ValueError(
+						f"{self.in_path.name} is not valid {encoding} near byte {progress['offset'] + progress['pending']}: "
+						f"{ex.reason}. Convert it to UTF-8 first (e.g. with the convert command)."
+					) from None
+
+		n = len(fieldnames)
+		for row in csv.reader(lines(), delimiter=delimiter):
+			progress["offset"] += progress["pending"]
+			progress["pending"] = 0
+			if not row:
+				continue
+			d = dict(zip(fieldnames, row))
+			if len(row) < n:
+				for key in fieldnames[len(row):]:
+					d[key] = ""
+			yield d
+
+
+	def run(self, restart: bool = False, progress: Callable[[dict], None] | None = None) -> dict:
+		'''
+		Process the input, resuming from the last checkpoint unless restart.
+		progress (if given) is called with the checkpoint state after each save.
+		Returns the final state (rows_read, rows_emitted, invalid, duplicates...).
+		'''
+		if not self.in_path.exists():
+			logger.error("CSV not found: %s", self.in_path)
+			raise FileNotFoundError(f"CSV not found: {self.in_path}")
+
+		state = None if restart else self.load_checkpoint()
+		rc = RingCentralCSV(region=self.region, rules=self.rules)
+
+		if state is None:
+			with self.in_path.open("rb") as f:
+				if os.fstat(f.fileno()).st_size == 0:
+					raise ValueError("CSV is empty (no headers).")
+			fmt = sniff_format(self.in_path)
+			if not fmt.byte_safe:
+				raise ValueError(
+					f"{self.in_path.name} is {fmt.describe()}; batch needs a byte-oriented encoding. "
+					"Convert it to UTF-8 first (e.g. with the convert command)."
+				)
+			with self.in_path.open("rb") as f:
+				with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+					fieldnames, body = find_header(mm, self.required, fmt.encoding, fmt.delimiter)
+
+			state = {
+				**self._input_stamp(),
+				"encoding": fmt.encoding,
+				"delimiter": fmt.delimiter,
+				"fieldnames": fieldnames,
+				"input_offset": body,
+				"rows_read": 0,
+				"rows_emitted": 0,
+				"invalid": 0,
+				"duplicates": 0,
+				"output_offset": 0,
+				"issues_offset": 0,
+				"index_offset": 0,
+			}
+			self.out_path.parent.mkdir(parents=True, exist_ok=True)
+			for path in (self.out_path, self.issues_path, self.index_path):
+				path.write_bytes(b"")
+
+			header = io.StringIO()
+			csv.DictWriter(header, fieldnames=fieldnames).writeheader()
+			issues_header = io.StringIO()
+			csv.writer(issues_header).writerow(["row", "kind", "detail"])
+			with self.out_path.open("ab") as out, self.issues_path.open("ab") as issues:
+				state["output_offset"] = out.write(header.getvalue().encode("utf-8"))
+				state["issues_offset"] = issues.write(issues_header.getvalue().encode("utf-8"))
+			self._save_checkpoint(state)
+			logger.info("Batch started: %s -> %s", self.in_path, self.out_path)
+		else:
+			logger.info(
+				"Resuming batch at byte %d (%d rows read, %d emitted)",
+				state["input_offset"], state["rows_read"], state["rows_emitted"],
+			)
+
+		fieldnames = state["fieldnames"]
+		rc.fieldnames = fieldnames
+		phone_fields = [k for k in fieldnames if rc._is_phone_field(k)]
+		unique_fields = self.rules.unique_fields(fieldnames) if self.rules else []
+
+		# Roll the data files back to the last checkpoint and reload the index.
+		for path, key in ((self.out_path, "output_offset"), (self.issues_path, "issues_offset"), (self.index_path, "index_offset")):
+			with path.open("r+b") as f:
+				f.truncate(state[key])
+
+		seen: dict[str, tuple[int, str]] = {}
+		seen_unique: dict[tuple[str, str], int] = {}
+		with self.index_path.open("r", newline="", encoding="utf-8") as f:
+			for value, row_i, field in csv.reader(f):
+				if field.startswith("unique:"):
+					seen_unique[(field[7:], value)] = int(row_i)
+				else:
+					seen[value] = (int(row_i), field)
+
+		out_buf, issues_buf, index_buf = io.StringIO(), io.StringIO(), io.StringIO()
+		out_writer = csv.DictWriter(out_buf, fieldnames=fieldnames, extrasaction="ignore")
+		issues_writer = csv.writer(issues_buf)
+		index_writer = csv.writer(index_buf)
+
+		with self.in_path.open("rb") as src, \
+			self.out_path.open("ab") as out, \
+			self.issues_path.open("ab") as issues, \
+			self.index_path.open("ab") as index:
+
+			def checkpoint() -> None:
+				for buf, f, key in ((out_buf, out, "output_offset"), (issues_buf, issues, "issues_offset"), (index_buf, index, "index_offset")):
+					data = buf.getvalue().encode("utf-8")
+					f.write(data)
+					f.flush()
+					os.fsync(f.fileno())
+					state[key] += len(data)
+					buf.seek(0)
+					buf.truncate()
+				state["input_offset"] = offsets["offset"]
+				self._save_checkpoint(state)
+				if progress is not None:
+					progress(state)
+
+			src.seek(state["input_offset"])
+			offsets = {"offset": state["input_offset"], "pending": 0}
+			since_checkpoint = 0
+
+			records = self._records(
+				src, fieldnames, offsets,
+				encoding=state.get("encoding", "utf-8"), delimiter=state.get("delimiter", ","),
+			)
+			for raw_row in records:
+				state["rows_read"] += 1
+				try:
+					cleaned = rc.normalise_row(raw_row)
+					taken = [
+						f"{key}: {cleaned[key]!r} is already used by output row {seen_unique[(key, cleaned[key])]+1} (must be unique)"
+						for key in unique_fields if (key, cleaned[key]) in seen_unique
+					]
+					if taken:
+						raise ValueError("; ".join(taken))
+				except ValueError as ex:
+					state["invalid"] += 1
+					issues_writer.writerow([state["rows_read"], "invalid", str(ex)])
+				else:
+					row_i = state["rows_emitted"]
+					for key in unique_fields:
+						if cleaned[key]:
+							seen_unique[(key, cleaned[key])] = row_i
+							index_writer.writerow([cleaned[key], row_i, "unique:" + key])
+					for key in phone_fields:
+						number = cleaned[key]
+						if not number:
+							continue
+						if number in seen:
+							first_i, first_field = seen[number]
+							state["duplicates"] += 1
+							issues_writer.writerow([
+								state["rows_read"], "duplicate",
+								f"{number}: row {first_i+1} ({first_field}) and row {row_i+1} ({key})",
+							])
+						else:
+							seen[number] = (row_i, key)
+							index_writer.writerow([number, row_i, key])
+					out_writer.writerow(cleaned)
+					state["rows_emitted"] += 1
+
+				since_checkpoint += 1
+				if since_checkpoint >= self.checkpoint_every:
+					checkpoint()
+					since_checkpoint = 0
+
+			checkpoint()
+
+		self.checkpoint_path.unlink(missing_ok=True)
+		self.index_path.unlink(missing_ok=True)
+		logger.info(
+			"Batch complete: %d rows read, %d emitted, %d invalid, %d duplicates",
+			state["rows_read"], state["rows_emitted"], state["invalid"], state["duplicates"],
+		)
+		return state
@@ -0,0 +1,135 @@
+#!/usr/bin/python
+
+# Import Libraries
+import json
+from pathlib import Path
+from typing import Iterable
+import logging
+logger = logging.getLogger(__name__)
+
+
+# Suffix -> format. ".feather" is Arrow IPC file format (Feather v2).
+COLUMNAR_SUFFIXES = {
+	".parquet": "parquet",
+	".pq": "parquet",
+	".arrow": "arrow",
+	".feather": "arrow",
+}
+
+# Schema metadata keys written by this app
+META_FIELDNAMES = b"ringcentral_csv_editor.fieldnames"
+META_NORMALISED = b"ringcentral_csv_editor.normalised"
+
+
+def is_columnar(path: str | Path) -> bool:
+	return Path(path).suffix.lower() in COLUMNAR_SUFFIXES
+
+
+def _require_pyarrow():
+	'''
+	pyarrow is optional; import it only when a columnar file is used.
+	'''
+	try:
+		import pyarrow
+		import pyarrow.compute
+		import pyarrow.ipc
+		import pyarrow.parquet
+	except ImportError:
+		raise ImportError(
+			"Parquet/Arrow support needs pyarrow: pip install 'ringcentral-csv-editor[columnar]'"
+		) from None
+	return pyarrow
+
+
+def _format(path: Path) -> str:
+	fmt = COLUMNAR_SUFFIXES.get(path.suffix.lower())
+	if fmt is None:
+		raise ValueError(f"Not a Parquet/Arrow file (expected {', '.join(sorted(COLUMNAR_SUFFIXES))}): {path}")
+	return fmt
+
+
+def write_columnar(
+	fieldnames: list[str],
+	rows: list[dict],
+	out_path: str | Path,
+	columns: Iterable[str] | None = None,
+	normalised: str | None = None,
+) -> Path:
+	'''
+	Write rows as a Parquet or Arrow IPC file (chosen by suffix), every column
+	a string column. columns projects (and orders) the output columns.
+	The fieldnames are kept in the schema metadata so the book reloads
+	without a header hunt. normalised marks the rows as cleaned, recording
+	what they were cleaned under (see RingCentralCSV.clean_stamp).
+	'''
+	pa = _require_pyarrow()
+	out_path = Path(out_path).expanduser()
+	fmt = _format(out_path)
+
+	names = list(columns) if columns is not None else list(fieldnames)
+	unknown = [c for c in names if c not in fieldnames]
+	if unknown:
+		raise ValueError(f"Unknown column(s): {', '.join(unknown)}")
+
+	schema = pa.schema(
+		[pa.field(name, pa.string()) for name in names],
+		metadata={
+			META_FIELDNAMES: json.dumps(names).encode("utf-8"),
+			META_NORMALISED: (normalised or "").encode("utf-8"),
+		},
+	)
+	arrays = [pa.array([str(row.get(name, "") or "") for row in rows], type=pa.string()) for name in names]
+	table = pa.Table.from_arrays(arrays, schema=schema)
+
+	out_path.parent.mkdir(parents=True, exist_ok=True)
+	if fmt == "parquet":
+		pa.parquet.write_table(table, out_path, compression="zstd")
+	else:
+		with pa.OSFile(str(out_path), "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+			writer.write_table(table)
+
+	logger.info("Wrote %d rows x %d columns to %s (%s)", len(rows), len(names), out_path, fmt)
+	return out_path
+
+
+def read_columnar(csv_in_path: str | Path, columns: Iterable[str] | None = None) -> tuple[list[str], list[dict], str | None]:
+	'''
+	Read a Parquet or Arrow IPC file. Arrow files are memory-mapped.
+	Nulls become "" and non-string columns are cast to strings, so rows look
+	exactly like checker() output.
+	Returns (fieldnames, rows, normalised), normalised being the stamp the
+	file was cleaned under (None if it wasn't).
+	'''
+	pa = _require_pyarrow()
+	path = Path(csv_in_path).expanduser()
+	fmt = _format(path)
+	if not path.exists():
+		raise FileNotFoundError(f"File not found: {path}")
+
+	columns = list(columns) if columns is not None else None
+	if fmt == "parquet":
+		table = pa.parquet.read_table(path, columns=columns)
+	else:
+		with pa.memory_map(str(path), "r") as source:
+			table = pa.ipc.open_file(source).read_all()
+		if columns is not None:
+			table = table.select(columns)
+
+	metadata = table.schema.metadata or {}
+	names = table.column_names
+	if META_FIELDNAMES in metadata and columns is None:
+		stored = json.loads(metadata[META_FIELDNAMES])
+		if sorted(stored) == sorted(names):
+			names = stored
+	normalised = metadata.get(META_NORMALISED, b"").decode("utf-8") or None
+
+	values = []
+	for name in names:
+		col = table.column(name)
+		if not pa.types.is_string(col.type) and not pa.types.is_large_string(col.type):
+			col = pa.compute.cast(col, pa.string())
+		values.append(pa.compute.fill_null(col, "").to_pylist())
+
+	rows = [dict(zip(names, row)) for row in zip(*values)]
+	logger.info("Loaded %d rows from %s (%s)", len(rows), path, fmt)
+	return list(names), rows, normalised
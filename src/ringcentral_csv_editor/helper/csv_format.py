@@ -0,0 +1,187 @@
+#!/usr/bin/python
+
+# Import Libraries
+import os
+import re
+import codecs
+from collections import Counter
+from dataclasses import dataclass, replace
+from pathlib import Path
+import logging
+logger = logging.getLogger(__name__)
+
+
+# Bytes read from the start (and again from the end) of a file to sniff it
+SNIFF_BYTES = 64 * 1024
+DELIMITERS = (",", ";", "\t", "|")
+
+# UTF-32 LE first: its BOM starts with the UTF-16 LE one
+_BOMS = (
+	(codecs.BOM_UTF32_LE, "utf-32"),
+	(codecs.BOM_UTF32_BE, "utf-32"),
+	(codecs.BOM_UTF8, "utf-8-sig"),
+	(codecs.BOM_UTF16_LE, "utf-16"),
+	(codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# Tried in turn when the sniffed encoding turns out to be wrong further into
+# the file than the sample reached. latin-1 decodes any byte.
+_FALLBACKS = {"utf-8": "cp1252", "cp1252": "latin-1"}
+
+# Bytes cp1252 leaves undefined
+_NOT_CP1252 = re.compile(rb"[\x81\x8d\x8f\x90\x9d]")
+_QUOTED = re.compile(r'"[^"\n]*"')
+
+_DELIMITER_NAMES = {",": "comma", ";": "semicolon", "\t": "tab", "|": "pipe"}
+_ENCODING_NAMES = {
+	"utf-8": "UTF-8",
+	"utf-8-sig": "UTF-8 (BOM)",
+	"utf-16": "UTF-16",
+	"utf-16-le": "UTF-16 LE",
+	"utf-16-be": "UTF-16 BE",
+	"utf-32": "UTF-32",
+	"cp1252": "Windows-1252",
+	"latin-1": "Latin-1",
+}
+
+
+@dataclass(frozen=True)
+class CsvFormat:
+	'''
+	How a CSV file is encoded and laid out, as found by sniff_format().
+	The defaults are what writer() has always produced.
+
+	encoding:  codec to read (and re-write) the file with; "utf-8-sig",
+	           "utf-16" and "utf-32" handle the byte order mark themselves
+	delimiter: field separator
+	newline:   line ending ("\\r\\n" or "\\n")
+	'''
+	encoding: str = "utf-8"
+	delimiter: str = ","
+	newline: str = "\r\n"
+
+
+	@property
+	def byte_safe(self) -> bool:
+		'''
+		True if quotes, newlines and the delimiter are single bytes that never
+		occur inside another character, so the raw bytes can be split on them
+		(parallel_reader, BatchJob). False for UTF-16/32.
+		'''
+		return not self.encoding.startswith(("utf-16", "utf-32"))
+
+
+	def describe(self) -> str:
+		'''
+		Short label for the status bar, e.g. "Windows-1252 · semicolon · CRLF".
+		'''
+		encoding = _ENCODING_NAMES.get(self.encoding, self.encoding)
+		delimiter = _DELIMITER_NAMES.get(self.delimiter, repr(self.delimiter))
+		newline = "CRLF" if self.newline == "\r\n" else "LF"
+		return f"{encoding} · {delimiter} · {newline}"
+
+
+	def fallback(self) -> "CsvFormat | None":
+		encoding = _FALLBACKS.get(self.encoding)
+		return replace(self, encoding=encoding) if encoding else None
+
+
+def _utf16_without_bom(sample: bytes) -> str | None:
+	'''
+	Mostly-ASCII UTF-16 text has a NUL in every other byte.
+	'''
+	if len(sample) < 4 or b"\x00" not in sample[:512]:
+		return None
+	head = sample[:4096]
+	odd = head[1::2].count(0)
+	even = head[0::2].count(0)
+	if odd > len(head) // 4 and odd > even * 4:
+		return "utf-16-le"
+	if even > len(head) // 4 and even > odd * 4:
+		return "utf-16-be"
+	return None
+
+
+def _is_utf8(chunk: bytes, final: bool, at_start: bool = True) -> bool:
+	if not at_start:
+		# The chunk was cut at an arbitrary byte: skip a partial character
+		chunk = chunk.lstrip(bytes(range(0x80, 0xc0)))
+	try:
+		codecs.getincrementaldecoder("utf-8")().decode(chunk, final)
+	except UnicodeDecodeError:
+		return False
+	return True
+
+
+def sniff_delimiter(text: str) -> str:
+	'''
+	The candidate delimiter that splits the most lines into the same
+	(non-zero) number of fields. Quoted text is ignored, so commas inside
+	"Smith, John" don't count. Ties go to the comma.
+	'''
+	lines = [_QUOTED.sub("", line) for line in text.splitlines()[:200] if line.strip()]
+	best, best_lines = ",", 0
+	for delimiter in DELIMITERS:
+		counts = Counter(line.count(delimiter) for line in lines)
+		counts.pop(0, None)
+		if not counts:
+			continue
+		_fields, agreeing = counts.most_common(1)[0]
+		if agreeing > best_lines:
+			best, best_lines = delimiter, agreeing
+	return best
+
+
+def sniff_bytes(head: bytes, tail: bytes = b"", complete: bool = True) -> CsvFormat:
+	'''
+	Detect the format from the first bytes of a file (head) and optionally
+	its last bytes (tail). complete means head is the whole file.
+	'''
+	encoding = None
+	for bom, name in _BOMS:
+		if head.startswith(bom):
+			encoding = name
+			break
+	if encoding is None:
+		encoding = _utf16_without_bom(head)
+	if encoding is None:
+		if _is_utf8(head, final=complete) and (not tail or _is_utf8(tail, final=True, at_start=False)):
+			encoding = "utf-8"
+		elif _NOT_CP1252.search(head) or _NOT_CP1252.search(tail):
+			encoding = "latin-1"
+		else:
+			encoding = "cp1252"
+
+	decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+	text = decoder.decode(head, final=complete)
+	if not complete:
+		# The last line is probably cut short
+		text = text[:text.rfind("\n") + 1] or text
+
+	crlf = text.count("\r\n")
+	return CsvFormat(
+		encoding=encoding,
+		delimiter=sniff_delimiter(text),
+		newline="\n" if text.count("\n") - crlf > crlf else "\r\n",
+	)
+
+
+def sniff_format(path: str | Path, sample_bytes: int = SNIFF_BYTES) -> CsvFormat:
+	'''
+	Sniff a file's encoding, delimiter and line ending from at most
+	2 x sample_bytes: its start, plus its end for files larger than that
+	(a stray cp1252 byte is often in the last rows someone added).
+	'''
+	path = Path(path).expanduser()
+	with path.open("rb") as f:
+		size = os.fstat(f.fileno()).st_size
+		head = f.read(sample_bytes)
+		tail = b""
+		if size > 2 * sample_bytes:
+			f.seek(size - sample_bytes)
+			tail = f.read(sample_bytes)
+		elif size > sample_bytes:
+			tail = f.read()
+	fmt = sniff_bytes(head, tail, complete=size <= sample_bytes)
+	logger.info("Detected %s in %s", fmt.describe(), path)
+	return fmt
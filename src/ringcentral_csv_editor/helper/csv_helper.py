@@ -4,28 +4,89 @@
 import os
 import csv
 import re
+import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable
 import logging
+
+from .columnar import read_columnar, write_columnar
+from .csv_format import CsvFormat, sniff_format
+from .parallel_reader import PARALLEL_MIN_BYTES, parse_parallel
+from .sharding import write_shards
+from .near_duplicates import NearDuplicateCluster, find_near_duplicates, merge_rows
+from .numbering import DEFAULT_REGION, normalise_number
+from .registry import NumberRegistry, book_key
+from .rules import RuleSet, UniqueIndex
+from .union_find import UnionFind
 logger = logging.getLogger(__name__)
 
 
+class BulkAppendError(ValueError):
+	'''
+	Raised by append_rows when any row in the batch is rejected. Nothing is
+	appended. errors holds (batch_row_number, message), 1-based.
+	'''
+	def __init__(self, errors: list[tuple[int, str]], limit: int = 10):
+		self.errors = errors
+		lines = [f"Row {n}: {msg}" for n, msg in errors[:limit]]
+		more = "" if len(errors) <= limit else f"\n…and {len(errors)-limit} more."
+		super().__init__(f"{len(errors)} row(s) rejected, nothing imported:\n" + "\n".join(lines) + more)
+
+
+def intern_rows(rows: list[dict]) -> list[dict]:
+	'''
+	Swap every cell for the one shared copy of its text (sys.intern), in
+	place. Company names, job titles, sources, ... repeat across rows and
+	across open books, so each distinct value is then held once. Interned
+	strings are still freed when no row uses them any more.
+	'''
+	intern = sys.intern
+	for row in rows:
+		for key, value in row.items():
+			if type(value) is str:
+				row[key] = intern(value)
+	return rows
+
+
 class RingCentralCSV:
 	'''
 	Helper class to handle the RingCentral address book file.
 	'''
-	def __init__(self, csv_in=None, csv_path_out="results"):
+	def __init__(
+		self,
+		csv_in=None,
+		csv_path_out="results",
+		registry: NumberRegistry | None = None,
+		region: str = DEFAULT_REGION,
+		rules: RuleSet | None = None,
+	):
 		self.csv_in = csv_in
 		self.csv_path_out = csv_path_out
-
-
-	def checker(self, csv_in_path: str, required_headers: Iterable[str] = ("First Name", "Surname")) -> list[dict]:
+		# Numbering plan used for phone numbers entered without a "+"
+		self.region = region
+		# Optional cross-book number registry; book is this book's registry key
+		self.registry = registry
+		self.book: str | None = book_key(csv_in) if csv_in else None
+		# Optional user rules; unique is the index of their unique columns
+		self.rules = rules
+		self.unique: UniqueIndex | None = None
+		# Encoding / delimiter of the last CSV read (None for columnar books)
+		self.csv_format: CsvFormat | None = None
+		# True if the last book read was a columnar file already cleaned under
+		# this region and these rules, so its rows need no normalise_row
+		self.normalised = False
+		self._validators_key: tuple | None = None
+		self._validators_map: dict[str, Callable[[str], str]] = {}
+
+
+	def checker(self, csv_in_path: str, required_headers: Iterable[str] = ("First Name", "Surname"), csv_format: CsvFormat | None = None) -> list[dict]:
 		'''
 		Check the file until the real header row is found, then parse into list dict. 
-		Returns list dict, sets self.fieldnames.
+		Returns list dict, sets self.fieldnames and self.csv_format.
 		
 		required_headers: headers that MUST appear in the header row
+		csv_format: encoding / delimiter to read with (sniffed if not given)
 		'''
 		path = Path(csv_in_path).expanduser()
 		logger.info("Reading CSV: %s", path)
@@ -37,7 +98,23 @@ class RingCentralCSV:
 		required = {str(h or "").strip() for h in required_headers}
 		logger.debug("Required headers: %s", sorted(required))
 
-		with path.open("r", newline="", encoding="utf-8-sig") as f:
+		fmt = csv_format or sniff_format(path)
+		while True:
+			try:
+				data = self._read_text(path, required, fmt)
+				break
+			except UnicodeDecodeError as ex:
+				fmt = self._fallback(path, fmt, ex)
+		self.csv_format = fmt
+		self.normalised = False
+		self.book = book_key(path)
+		return data
+
+
+	def _read_text(self, path: Path, required: set[str], fmt: CsvFormat) -> list[dict]:
+		# The file is decoded as it is parsed (TextIOWrapper reads and decodes
+		# in blocks), so it is never held in memory as bytes and text at once.
+		with path.open("r", newline="", encoding=fmt.encoding) as f:
 			start = f.read(2048)
 			if not start.strip():
 				self.fieldnames = []
@@ -54,14 +131,14 @@ class RingCentralCSV:
 					logger.error("Header row not found in %s", path)
 					raise ValueError(f"Could not find header row containing {sorted(required)} in file: {path}")
 
-				row = next(csv.reader([line]))
+				row = next(csv.reader([line], delimiter=fmt.delimiter))
 				row_set = {str(cell or "").strip().lstrip("\ufeff") for cell in row}
 
 				if required.issubset(row_set):
 					logger.info("Header found at byte offset %s in %s", pos, path)
 					f.seek(pos)
 
-					reader = csv.DictReader(f, restkey="__extra__", restval="")
+					reader = csv.DictReader(f, restkey="__extra__", restval="", delimiter=fmt.delimiter)
 					self.fieldnames = reader.fieldnames or []
 					logger.debug("Detected fieldnames: %s", self.fieldnames)
 
@@ -74,6 +151,76 @@ class RingCentralCSV:
 					return data
 
 
+	@staticmethod
+	def _fallback(path: Path, fmt: CsvFormat, ex: UnicodeDecodeError) -> CsvFormat:
+		'''
+		The next encoding to try after fmt failed past the sniffed sample.
+		'''
+		fallback = fmt.fallback()
+		if fallback is None:
+			raise ValueError(f"Could not decode {path.name} as {fmt.encoding}: {ex}") from None
+		logger.warning("%s is not %s (%s); reading it as %s", path, fmt.encoding, ex.reason, fallback.encoding)
+		return fallback
+
+
+	def parallel_checker(self, csv_in_path: str, required_headers: Iterable[str] = ("First Name", "Surname"), workers: int | None = None) -> list[dict]:
+		'''
+		Same result as checker(), but memory-maps the file and parses
+		record-aligned chunks on a process pool (see parallel_reader).
+		Files under PARALLEL_MIN_BYTES, and UTF-16/32 files (which can't be
+		split on raw bytes), are handed to checker() instead.
+		'''
+		path = Path(csv_in_path).expanduser()
+		if not path.exists():
+			logger.error("CSV not found: %s", path)
+			raise FileNotFoundError(f"CSV not found: {path}")
+
+		fmt = sniff_format(path)
+		if path.stat().st_size < PARALLEL_MIN_BYTES or not fmt.byte_safe:
+			return self.checker(csv_in_path, required_headers=required_headers, csv_format=fmt)
+
+		logger.info("Reading CSV (parallel): %s", path)
+		while True:
+			try:
+				self.fieldnames, data = parse_parallel(
+					path, required_headers, workers=workers, encoding=fmt.encoding, delimiter=fmt.delimiter,
+				)
+				break
+			except UnicodeDecodeError as ex:
+				fmt = self._fallback(path, fmt, ex)
+		logger.info("Loaded %d data rows from %s", len(data), path)
+		self.csv_format = fmt
+		self.normalised = False
+		self.book = book_key(path)
+		return data
+
+
+	def columnar_checker(self, in_path: str, required_headers: Iterable[str] = ("First Name", "Surname"), columns: Iterable[str] | None = None) -> list[dict]:
+		'''
+		Load a Parquet / Arrow IPC book written by columnar_writer (or any
+		tool). No header hunt: fieldnames come from the schema.
+		Returns list dict, sets self.fieldnames and self.normalised (True
+		only if the file was cleaned under clean_stamp()).
+		'''
+		fieldnames, data, stamp = read_columnar(in_path, columns=columns)
+		required = {str(h or "").strip() for h in required_headers}
+		if columns is None and not required.issubset(fieldnames):
+			raise ValueError(f"Could not find columns {sorted(required)} in file: {in_path}")
+
+		self.fieldnames = fieldnames
+		self.normalised = stamp is not None and stamp == self.clean_stamp()
+		self.csv_format = None
+		self.book = book_key(in_path)
+		return data
+
+
+	def clean_stamp(self) -> str:
+		"""
+		What a cleaned columnar file records it was cleaned under: region and
+		rules. A file cleaned under other ones is validated again on load.
+		"""
+		return f"{self.region}:{(self.rules or RuleSet()).digest()}"
+
 	def normalise_row(self, raw_row: dict) -> dict:
 		"""
 		Take raw user input (dict[str,str]) and return a cleaned row dict.
@@ -82,12 +229,49 @@ class RingCentralCSV:
 		if not getattr(self, "fieldnames", None):
 			raise ValueError("No fieldnames loaded.")
 
+		validators = self.validators()
 		cleaned = {k: "" for k in self.fieldnames}
 		for key in self.fieldnames:
 			raw_text = (raw_row.get(key, "") or "").strip()
-			cleaned[key] = self.field_formatter(key, raw_text)
+			try:
+				cleaned[key] = validators[key](raw_text)
+			except ValueError as ex:
+				raise ValueError(f"{key}: {ex}") from None
 		return cleaned
 
+	def validators(self) -> dict[str, Callable[[str], str]]:
+		"""
+		One validator closure per column (user rules over field_formatter),
+		compiled once and reused until fieldnames, region or rules change.
+		"""
+		key = (tuple(self.fieldnames), self.region, id(self.rules))
+		if key != self._validators_key:
+			region = self.region
+			builtin = lambda field, value: RingCentralCSV.field_formatter(field, value, region=region)
+			self._validators_map = (self.rules or RuleSet()).compile(self.fieldnames, builtin)
+			self._validators_key = key
+		return self._validators_map
+
+	def format_field(self, field: str, value: str) -> str:
+		"""
+		Validate + normalise a single cell with this book's rules.
+		"""
+		validator = self.validators().get(field) if getattr(self, "fieldnames", None) else None
+		if validator is None:
+			return self.field_formatter(field, value, region=self.region)
+		return validator(value)
+
+	def unique_index(self, csv_data: list[dict]) -> UniqueIndex:
+		"""
+		Index of the unique-rule columns of csv_data, built on first use.
+		Callers that keep csv_data between calls set self.unique to their own
+		index and keep it current (see the GUI).
+		"""
+		if self.unique is None:
+			fields = self.rules.unique_fields(self.fieldnames) if self.rules else []
+			self.unique = UniqueIndex(fields, csv_data)
+		return self.unique
+
 	def append_row(self, csv_data: list[dict], raw_row: dict) -> dict:
 		"""
 		Validate + append one row to csv_data. Returns the appended cleaned row.
@@ -111,18 +295,137 @@ class RingCentralCSV:
 
 		# Check duplicates against existing data
 		self.assert_no_duplicate_numbers(csv_data + [cleaned])
+		self.assert_not_in_other_books([cleaned])
+		unique = self.unique_index(csv_data)
+		unique.check(cleaned)
 
 		csv_data.append(cleaned)
+		unique.add(cleaned)
 		logger.info("Row appended successfully. New row count: %d", len(csv_data))
 		return cleaned
 
 
-	def writer(self, fieldnames: list[str], csv_data: list[dict], out_path: Path | None = None) -> Path:
+	def number_index(self, rows: list[dict]) -> dict[str, tuple[int, str]]:
+		"""
+		Map each phone number to the first (row_index, field) holding it.
+		"""
+		index: dict[str, tuple[int, str]] = {}
+		for i, row in enumerate(rows):
+			for key, value in row.items():
+				if not self._is_phone_field(key):
+					continue
+				number = (value or "").strip()
+				if number and number not in index:
+					index[number] = (i, key)
+		return index
+
+	def append_rows(self, csv_data: list[dict], raw_rows: Iterable[dict], index: dict[str, tuple[int, str]] | None = None) -> list[dict]:
+		"""
+		Validate + append many rows at once, all or nothing.
+
+		Every row is normalised, then checked for duplicate numbers inside
+		itself, against earlier rows of the batch and against csv_data, in a
+		single pass over a number index built once (O(n + k) rather than a
+		rescan per row). Duplicates already inside csv_data are not re-reported.
+		Unique-rule columns are checked the same way against unique_index().
+		Raises BulkAppendError listing every rejected row; otherwise extends
+		csv_data and returns the cleaned rows.
+
+		index is number_index(csv_data) kept by the caller (e.g. a long-lived
+		service); it is only updated if the whole batch is appended.
+		"""
+		if index is None:
+			index = self.number_index(csv_data)
+		batch_index: dict[str, tuple[int, str]] = {}
+		unique = self.unique_index(csv_data)
+		batch_unique: dict[tuple[str, str], int] = {}
+		base = len(csv_data)
+		cleaned_rows: list[dict] = []
+		errors: list[tuple[int, str]] = []
+
+		for n, raw_row in enumerate(raw_rows, start=1):
+			try:
+				cleaned = self.normalise_row(raw_row)
+			except ValueError as ex:
+				errors.append((n, str(ex)))
+				continue
+
+			row_errors = []
+			new_nums: dict[str, str] = {}
+			for key, value in cleaned.items():
+				if not self._is_phone_field(key) or not value:
+					continue
+				if value in new_nums:
+					row_errors.append(f"Duplicate number inside row: {value} in {new_nums[value]} and {key}")
+				elif value in index:
+					other_i, other_field = index[value]
+					row_errors.append(f"{value} ({key}) already in row {other_i+1} ({other_field})")
+				elif value in batch_index:
+					other_i, other_field = batch_index[value]
+					row_errors.append(f"{value} ({key}) already in import row {other_i-base+1} ({other_field})")
+				new_nums[value] = key
+
+			if self.registry is not None and new_nums:
+				for number, _i, key, book, other_row, _other_field in self.registry.conflicts([cleaned], exclude_book=self.book):
+					row_errors.append(f"{number} ({key}) already in {Path(book).name} row {other_row+1}")
+
+			row_errors.extend(unique.conflicts(cleaned))
+			new_unique = [(field, cleaned[field]) for field in unique.fields if cleaned.get(field)]
+			for field, value in new_unique:
+				if (field, value) in batch_unique:
+					row_errors.append(f"{field}: {value!r} also in import row {batch_unique[(field, value)]} (must be unique)")
+
+			if row_errors:
+				errors.append((n, "; ".join(row_errors)))
+				continue
+			# Index batch rows by their batch position so messages can name them
+			for value, key in new_nums.items():
+				batch_index[value] = (base + n - 1, key)
+			for field_value in new_unique:
+				batch_unique[field_value] = n
+			cleaned_rows.append(cleaned)
+
+		if errors:
+			logger.info("Bulk append rejected: %d of %d rows invalid", len(errors), len(cleaned_rows) + len(errors))
+			raise BulkAppendError(errors)
+
+		csv_data.extend(cleaned_rows)
+		index.update(batch_index)
+		for cleaned in cleaned_rows:
+			unique.add(cleaned)
+		logger.info("Bulk appended %d rows. New row count: %d", len(cleaned_rows), len(csv_data))
+		return cleaned_rows
+
+	def rows_from_text(self, text: str) -> list[dict]:
+		"""
+		Parse pasted CSV text into raw rows for append_rows. If the first line
+		names First Name and Surname it is used as the header; otherwise cells
+		are taken in self.fieldnames order. Blank lines are skipped.
+		"""
+		if not getattr(self, "fieldnames", None):
+			raise ValueError("No fieldnames loaded.")
+		records = [r for r in csv.reader(text.strip().splitlines()) if any(c.strip() for c in r)]
+		if not records:
+			return []
+		header = [c.strip() for c in records[0]]
+		if {"First Name", "Surname"}.issubset(header):
+			names, records = header, records[1:]
+		else:
+			names = self.fieldnames
+		return [dict(zip(names, r)) for r in records]
+
+
+	def writer(self, fieldnames: list[str], csv_data: list[dict], out_path: Path | None = None, csv_format: CsvFormat | None = None, replace_previous: bool = False) -> Path:
 		'''
 		Accepts incoming csv data after appended data is added to the new list.
 		Writes a new csv file. If out_path is given it is used as-is; otherwise
 		a timestamped filename is generated inside csv_path_out.
+		csv_format (e.g. self.csv_format from checker) keeps the source file's
+		encoding, delimiter and line endings; the default is UTF-8, comma, CRLF.
+		replace_previous drops the registry entries of the file the book was
+		loaded from (self.book) even if that file still exists.
 		'''
+		fmt = csv_format or CsvFormat()
 		if out_path is None:
 			file_date = datetime.now().strftime("%Y%m%d-%H%M")
 			out_dir = Path(self.csv_path_out).expanduser()
@@ -132,13 +435,82 @@ class RingCentralCSV:
 			out_path = Path(out_path)
 			out_path.parent.mkdir(parents=True, exist_ok=True)
 
-		with out_path.open("w", newline="", encoding="utf-8") as f:
-			writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
-			writer.writeheader()
-			writer.writerows(csv_data)
+		try:
+			with out_path.open("w", newline="", encoding=fmt.encoding) as f:
+				writer = csv.DictWriter(
+					f, fieldnames=fieldnames, extrasaction="ignore",
+					delimiter=fmt.delimiter, lineterminator=fmt.newline,
+				)
+				writer.writeheader()
+				writer.writerows(csv_data)
+		except UnicodeEncodeError as ex:
+			out_path.unlink(missing_ok=True)
+			bad = ex.object[ex.start:ex.end]
+			raise ValueError(f"{bad!r} can't be saved as {fmt.encoding}; write the file as UTF-8 instead") from None
+
+		if self.registry is not None:
+			# The book now lives at out_path; the file it came from keeps its
+			# entries unless it is gone or replace_previous is set
+			self.registry.update_book(out_path, csv_data, previous=self.book, replace_previous=replace_previous)
+			self.book = book_key(out_path)
+		return out_path
+
 
+	def columnar_writer(self, fieldnames: list[str], csv_data: list[dict], out_path: Path, columns: Iterable[str] | None = None, normalise: bool = True, replace_previous: bool = False) -> Path:
+		'''
+		Write the book as Parquet (.parquet) or Arrow IPC (.arrow / .feather).
+		With normalise, every row goes through normalise_row first (the first
+		invalid row raises ValueError) and the file is marked as cleaned.
+		Rows just read from a file cleaned under the same region and rules
+		(self.normalised) are not normalised again.
+		columns optionally projects the output to a subset of fieldnames.
+		replace_previous is as for writer().
+		'''
+		if normalise and not self.normalised:
+			self.fieldnames = fieldnames
+			cleaned = []
+			for i, row in enumerate(csv_data):
+				try:
+					cleaned.append(self.normalise_row(row))
+				except ValueError as ex:
+					raise ValueError(f"Row {i+1}: {ex}") from None
+			csv_data = cleaned
+		out_path = write_columnar(
+			fieldnames, csv_data, out_path, columns=columns, normalised=self.clean_stamp() if normalise else None,
+		)
+		if self.registry is not None:
+			# The book now lives at out_path; the file it came from keeps its
+			# entries unless it is gone or replace_previous is set
+			self.registry.update_book(out_path, csv_data, previous=self.book, replace_previous=replace_previous)
+			self.book = book_key(out_path)
 		return out_path
 
+
+	def shard_writer(
+		self,
+		fieldnames: list[str],
+		csv_data: list[dict],
+		out_dir: Path | None = None,
+		max_rows: int | None = None,
+		max_bytes: int | None = None,
+		name_template: str | None = None,
+		route_by: str | None = None,
+		workers: int = 4,
+	) -> Path:
+		'''
+		Like writer(), but splits the book into several files capped at
+		max_rows and/or max_bytes, optionally one set per route_by value.
+		Returns the manifest path (see sharding.write_shards).
+		'''
+		if out_dir is None:
+			file_date = datetime.now().strftime("%Y%m%d-%H%M")
+			out_dir = Path(self.csv_path_out).expanduser() / f"AddressBook-{file_date}"
+		return write_shards(
+			fieldnames, csv_data, out_dir,
+			max_rows=max_rows, max_bytes=max_bytes, name_template=name_template,
+			route_by=route_by, workers=workers,
+		)
+
 		
 
 	def _is_phone_field(self, field: str) -> bool:
@@ -172,6 +544,66 @@ class RingCentralCSV:
 		logger.info("Duplicate scan complete: %d duplicates found", len(dups))
 		return dups
 
+	def find_duplicate_clusters(self, rows: list[dict]) -> list[tuple[list[int], list[str]]]:
+		"""
+		Group rows connected through shared phone numbers, including chains
+		(row A shares one number with B, B shares another with C).
+		Returns (row_indexes, shared_numbers) per group, ordered by first row.
+		Near-linear in the number of phone cells (union-find).
+		"""
+		logger.debug("Clustering %d rows by shared numbers", len(rows))
+
+		uf = UnionFind(len(rows))
+		first_row: dict[str, int] = {}
+		shared: set[str] = set()
+		involved: set[int] = set()
+
+		for i, row in enumerate(rows):
+			for key, value in row.items():
+				if not self._is_phone_field(key):
+					continue
+				number = (value or "").strip()
+				if not number:
+					continue
+
+				if number in first_row:
+					uf.union(first_row[number], i)
+					shared.add(number)
+					involved.add(first_row[number])
+					involved.add(i)
+				else:
+					first_row[number] = i
+
+		members: dict[int, list[int]] = {}
+		for i in sorted(involved):
+			members.setdefault(uf.find(i), []).append(i)
+		numbers: dict[int, list[str]] = {}
+		for number in shared:
+			numbers.setdefault(uf.find(first_row[number]), []).append(number)
+
+		clusters = [(members[root], sorted(numbers[root])) for root in members]
+		clusters.sort(key=lambda c: c[0][0])
+		logger.info("Duplicate clustering complete: %d groups", len(clusters))
+		return clusters
+
+	def rows_sharing_numbers(self, rows: list[dict], keep: int, candidates: Iterable[int]) -> list[int]:
+		"""
+		The candidates (other than keep) holding at least one of rows[keep]'s
+		phone numbers, in order. A cluster can chain through rows that share
+		nothing with keep; those are not returned.
+		"""
+		numbers = {
+			(value or "").strip() for key, value in rows[keep].items()
+			if self._is_phone_field(key) and (value or "").strip()
+		}
+		return [
+			i for i in candidates
+			if i != keep and any(
+				self._is_phone_field(key) and (value or "").strip() in numbers
+				for key, value in rows[i].items()
+			)
+		]
+
 	def format_duplicate_report(self, rows: list[dict], limit: int = 10) -> str:
 		dups = self.find_duplicate_numbers(rows)
 		if not dups:
@@ -184,6 +616,30 @@ class RingCentralCSV:
 		more = "" if len(dups) <= limit else f"\n…and {len(dups)-limit} more."
 		return "Duplicate phone numbers detected:\n" + "\n".join(lines) + more
 
+	def find_near_duplicates(self, rows: list[dict], threshold: float = 0.85) -> list[NearDuplicateCluster]:
+		"""
+		Returns clusters of rows that are probably the same contact entered
+		more than once (similar name, email or company). See near_duplicates.
+		"""
+		return find_near_duplicates(rows, threshold=threshold)
+
+	def merge_near_duplicates(self, rows: list[dict], keep: int, others: list[int]) -> dict:
+		"""
+		Merge rows[others] into rows[keep] in place, filling the kept row's blank
+		fields, then delete the other rows. Returns the merged row.
+		"""
+		phone_fields = {k for k in rows[keep] if self._is_phone_field(k)}
+		merged = merge_rows(rows, keep, others, phone_fields)
+		if self.unique is not None:
+			for i in {keep, *others}:
+				self.unique.remove(rows[i])
+			self.unique.add(merged)
+		rows[keep] = merged
+		for i in sorted(set(others) - {keep}, reverse=True):
+			del rows[i]
+		logger.info("Merged %d rows into row %d", len(others), keep + 1)
+		return merged
+
 	def assert_no_duplicate_numbers(self, rows: list[dict]) -> None:
 		"""
 		Raise ValueError if any phone number appears more than once.
@@ -194,8 +650,20 @@ class RingCentralCSV:
 		raise ValueError(self.format_duplicate_report(rows))
 
 
+	def assert_not_in_other_books(self, rows: list[dict]) -> None:
+		"""
+		Raise ValueError if any number in rows is already used by another
+		book in the registry. No-op without a registry.
+		"""
+		if self.registry is None:
+			return
+		conflicts = self.registry.conflicts(rows, exclude_book=self.book)
+		if conflicts:
+			raise ValueError(self.registry.format_conflicts(conflicts, show_row=len(rows) > 1))
+
+
 	@staticmethod
-	def field_formatter(field, value: str) -> str:
+	def field_formatter(field, value: str, region: str = DEFAULT_REGION) -> str:
 		"""
 		Automatically normalises entries based on field header. 
 		
@@ -208,19 +676,16 @@ class RingCentralCSV:
 		Job Title/Company Name:
 		  Strings only, no numbers.
 
-		Mobiles:
+		Phone numbers (see helper/numbering.py for the supported countries):
+		  "+<country code>..."   -> validated against that country's plan
+		  anything else          -> read as dialled from region, e.g. for AU:
 		  04XXXXXXXX      -> +614XXXXXXXX
 		  614XXXXXXXX     -> +614XXXXXXXX
-		  +614XXXXXXXX    -> +614XXXXXXXX
-
-		Landlines:
 		  0[2378]XXXXXXXX -> +61[2378]XXXXXXXX
-		  +61[2378]XXXXXXXX stays as-is
-
-		Service numbers:
 		  13XXXX          -> +6113XXXX
 		  1300XXXXXX      -> +611300XXXXXX
 		  1800XXXXXX      -> +611800XXXXXX
+		  0011 44 7XXX... -> +447XXX...
 		"""
 
 		field = field.strip().casefold()
@@ -249,44 +714,9 @@ class RingCentralCSV:
 				raise ValueError("Email doesn't look valid (expected name@domain.tld)")
 			return email
 
-		# --- Phone numbers (AU) ---
+		# --- Phone numbers ---
 		if field in {"home number", "business number", "mobile number", "company main number"}:
-			number_cleaned = re.sub(r"[^\d+]", "", raw_value)
-
-			# If starts with +, validate then return
-			if number_cleaned.startswith("+"):
-				if re.fullmatch(r"\+614\d{8}", number_cleaned):
-					return number_cleaned
-				if re.fullmatch(r"\+61[2378]\d{8}", number_cleaned):
-					return number_cleaned
-				if re.fullmatch(r"\+6113\d{4}", number_cleaned) or re.fullmatch(r"\+611(300|800)\d{6}", number_cleaned):
-					return number_cleaned
-				raise ValueError("Expected Australian number in E.164 format (e.g. +614..., +612..., +611300...)")
-
-			# Digits only
-			number_cleaned = re.sub(r"\D", "", number_cleaned)
-
-			# Mobile
-			if re.fullmatch(r"04\d{8}", number_cleaned):
-				return "+61" + number_cleaned[1:]
-			if re.fullmatch(r"614\d{8}", number_cleaned):
-				return "+" + number_cleaned
-
-			# Landline
-			if re.fullmatch(r"0[2378]\d{8}", number_cleaned):
-				return "+61" + number_cleaned[1:]
-			if re.fullmatch(r"61[2378]\d{8}", number_cleaned):
-				return "+" + number_cleaned
-
-			# Service numbers
-			if re.fullmatch(r"13\d{4}", number_cleaned):
-				return "+61" + number_cleaned
-			if re.fullmatch(r"1300\d{6}", number_cleaned) or re.fullmatch(r"1800\d{6}", number_cleaned):
-				return "+61" + number_cleaned
-			if re.fullmatch(r"6113\d{4}", number_cleaned) or re.fullmatch(r"611(300|800)\d{6}", number_cleaned):
-				return "+" + number_cleaned
-
-			raise ValueError("Not a valid AU phone number (mobile, landline(must include area code(08,07,03...)), or 13/1300/1800)")
+			return normalise_number(raw_value, region)
 
 		# --- Source / External ID ---
 		if field in {"source", "external id"}:
@@ -0,0 +1,169 @@
+#!/usr/bin/python
+
+# Import Libraries
+import json
+import time
+import random
+import asyncio
+from urllib.parse import quote, urlsplit
+import logging
+logger = logging.getLogger(__name__)
+
+
+# Share of each request kind in the mix
+DEFAULT_MIX = {"lookup": 0.6, "search": 0.3, "validate": 0.1}
+
+
+class _Client:
+	'''
+	One keep-alive connection to the service.
+	'''
+	def __init__(self, host: str, port: int, token: str | None):
+		self.host = host
+		self.port = port
+		self.token = token
+		self.reader: asyncio.StreamReader | None = None
+		self.writer: asyncio.StreamWriter | None = None
+
+
+	async def request(self, method: str, path: str, payload: dict | None = None) -> tuple[int, dict]:
+		if self.writer is None:
+			self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+		body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+		head = f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Length: {len(body)}\r\n"
+		if self.token:
+			head += f"Authorization: Bearer {self.token}\r\n"
+		self.writer.write(head.encode("latin-1") + b"\r\n" + body)
+		await self.writer.drain()
+
+		status_line = await self.reader.readline()
+		if not status_line:
+			await self.close()
+			raise ConnectionError("Server closed the connection")
+		status = int(status_line.split()[1])
+		length, keep_alive = 0, True
+		while True:
+			line = await self.reader.readline()
+			if line in (b"\r\n", b"\n", b""):
+				break
+			key, _, value = line.decode("latin-1").partition(":")
+			key = key.strip().lower()
+			if key == "content-length":
+				length = int(value)
+			elif key == "connection":
+				keep_alive = value.strip().lower() != "close"
+		data = json.loads(await self.reader.readexactly(length)) if length else {}
+		if not keep_alive:
+			await self.close()
+		return status, data
+
+
+	async def close(self) -> None:
+		if self.writer is not None:
+			self.writer.close()
+			self.reader = self.writer = None
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+	if not ordered:
+		return 0.0
+	return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run_load_test(
+	url: str,
+	requests: int = 10_000,
+	concurrency: int = 32,
+	token: str | None = None,
+	mix: dict[str, float] | None = None,
+	seed: int | None = None,
+) -> dict:
+	'''
+	Fire requests at a running service (see service.ServiceServer) from
+	concurrency keep-alive connections and report requests/s and latency
+	percentiles. Lookups, searches and validations use numbers and names
+	sampled from the book itself (GET /rows), so most of them hit.
+	'''
+	parts = urlsplit(url)
+	if parts.scheme != "http" or not parts.hostname:
+		raise ValueError(f"Expected an http:// URL, got: {url}")
+	host, port = parts.hostname, parts.port or 80
+	rng = random.Random(seed)
+
+	sampler = _Client(host, port, token)
+	status, data = await sampler.request("GET", "/rows?limit=1000")
+	await sampler.close()
+	if status != 200:
+		raise ValueError(f"GET /rows failed ({status}): {data.get('error')}")
+	numbers, words, rows = [], [], []
+	for row in data["rows"]:
+		row = {k: v for k, v in row.items() if k != "row"}
+		rows.append(row)
+		for key, value in row.items():
+			if value and "number" in key.casefold():
+				numbers.append(value)
+			elif value and key.casefold() in ("first name", "surname", "company"):
+				words.append(value.split()[0][:3])
+	if not rows:
+		raise ValueError("The book is empty; nothing to sample requests from")
+	numbers = numbers or ["0000"]
+	words = words or ["a"]
+
+	mix = mix or DEFAULT_MIX
+	kinds = rng.choices(list(mix), weights=list(mix.values()), k=requests)
+	latencies: dict[str, list[float]] = {kind: [] for kind in mix}
+	statuses: dict[int, int] = {}
+	errors = 0
+	next_request = 0
+
+	def build(kind: str) -> tuple[str, str, dict | None]:
+		if kind == "lookup":
+			return "GET", "/lookup?number=" + quote(rng.choice(numbers)), None
+		if kind == "search":
+			return "GET", "/search?limit=20&q=" + quote(rng.choice(words)), None
+		return "POST", "/validate", {"row": rng.choice(rows)}
+
+	async def worker() -> None:
+		nonlocal next_request, errors
+		client = _Client(host, port, token)
+		try:
+			while next_request < requests:
+				kind = kinds[next_request]
+				next_request += 1
+				method, path, payload = build(kind)
+				started = time.perf_counter()
+				try:
+					status, _data = await client.request(method, path, payload)
+				except (ConnectionError, OSError, asyncio.IncompleteReadError, ValueError) as ex:
+					logger.debug("Load test request failed: %s", ex)
+					errors += 1
+					await client.close()
+					continue
+				latencies[kind].append(time.perf_counter() - started)
+				statuses[status] = statuses.get(status, 0) + 1
+		finally:
+			await client.close()
+
+	started = time.perf_counter()
+	await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+	elapsed = time.perf_counter() - started
+
+	def summary(values: list[float]) -> dict:
+		ordered = sorted(values)
+		return {
+			"count": len(ordered),
+			"p50_ms": round(_percentile(ordered, 50) * 1000, 2),
+			"p95_ms": round(_percentile(ordered, 95) * 1000, 2),
+			"p99_ms": round(_percentile(ordered, 99) * 1000, 2),
+		}
+
+	every = [v for values in latencies.values() for v in values]
+	return {
+		"requests": len(every),
+		"errors": errors,
+		"statuses": statuses,
+		"elapsed_s": round(elapsed, 3),
+		"requests_per_s": round(len(every) / elapsed, 1) if elapsed else 0.0,
+		"overall": summary(every),
+		**{kind: summary(values) for kind, values in latencies.items()},
+	}
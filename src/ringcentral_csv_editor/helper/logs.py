@@ -0,0 +1,142 @@
+#!/usr/bin/python
+
+# Import Libraries
+import atexit
+import queue
+import threading
+import logging
+import logging.handlers
+from pathlib import Path
+logger = logging.getLogger(__name__)
+
+
+LOG_PATH = Path.home() / "ringcentral-csv-editor" / "app.log"
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+
+# The app's own loggers; set_level() changes this one so DEBUG doesn't also
+# switch on third-party (e.g. Flet) debug output
+APP_LOGGER = __name__.split(".")[0]
+
+_listener: logging.handlers.QueueListener | None = None
+_queue_handler: logging.handlers.QueueHandler | None = None
+
+
+class RateLimitFilter(logging.Filter):
+	'''
+	Let through at most burst records per call site (logger + line) every
+	interval seconds. The rest are dropped before they are formatted or
+	queued, and the number dropped is added to the next record from that site
+	that gets through. Records above max_level always pass.
+
+	Keeps per-row messages (append_row, duplicate scans, ...) from turning a
+	large import at DEBUG into a flood of disk writes.
+	'''
+	def __init__(self, burst: int = 20, interval: float = 1.0, max_level: int = logging.INFO):
+		super().__init__()
+		self.burst = burst
+		self.interval = interval
+		self.max_level = max_level
+		# (logger, line) -> [window start, records let through, records dropped]
+		self._sites: dict[tuple[str, int], list] = {}
+		self._lock = threading.Lock()
+
+
+	def filter(self, record: logging.LogRecord) -> bool:
+		if record.levelno > self.max_level:
+			return True
+		key = (record.name, record.lineno)
+		with self._lock:
+			site = self._sites.get(key)
+			if site is None or record.created - site[0] >= self.interval:
+				dropped = site[2] if site else 0
+				self._sites[key] = [record.created, 1, 0]
+			elif site[1] < self.burst:
+				site[1] += 1
+				dropped = 0
+			else:
+				site[2] += 1
+				return False
+		if dropped:
+			record.msg = f"{record.msg} [{dropped} similar message(s) suppressed]"
+		return True
+
+
+def setup_logging(
+	level: int | str = logging.INFO,
+	path: str | Path | None = None,
+	max_bytes: int = 5 * 1024 * 1024,
+	backup_count: int = 3,
+	rate_limit: bool = True,
+) -> logging.handlers.QueueListener:
+	'''
+	Send all log records through a queue: the logging call only enqueues the
+	record and a background thread writes it to path, which is rotated once
+	it reaches max_bytes (backup_count old files are kept).
+	Calling it again only changes the level.
+	'''
+	global _listener, _queue_handler
+	if _listener is not None:
+		set_level(level)
+		return _listener
+
+	path = Path(path).expanduser() if path else LOG_PATH
+	path.parent.mkdir(parents=True, exist_ok=True)
+	file_handler = logging.handlers.RotatingFileHandler(
+		path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True,
+	)
+	file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+	log_queue: queue.SimpleQueue = queue.SimpleQueue()
+	_queue_handler = logging.handlers.QueueHandler(log_queue)
+	if rate_limit:
+		_queue_handler.addFilter(RateLimitFilter())
+
+	root = logging.getLogger()
+	root.addHandler(_queue_handler)
+	root.setLevel(logging.INFO)
+	logging.getLogger(APP_LOGGER).setLevel(level)
+
+	_listener = logging.handlers.QueueListener(log_queue, file_handler)
+	_listener.start()
+	atexit.register(stop_logging)
+	return _listener
+
+
+def stop_logging() -> None:
+	'''
+	Write out everything still queued and detach the handlers.
+	'''
+	global _listener, _queue_handler
+	if _listener is None:
+		return
+	logging.getLogger().removeHandler(_queue_handler)
+	_listener.stop()
+	for handler in _listener.handlers:
+		handler.close()
+	_listener = _queue_handler = None
+
+
+def get_level() -> str:
+	return logging.getLevelName(logging.getLogger(APP_LOGGER).getEffectiveLevel())
+
+
+def set_level(level: int | str) -> None:
+	'''
+	Change the app's log level while running (e.g. "DEBUG").
+	'''
+	if isinstance(level, str):
+		if level.upper() not in LOG_LEVELS:
+			raise ValueError(f"Unknown log level {level!r} (expected one of: {', '.join(LOG_LEVELS)})")
+		level = logging.getLevelName(level.upper())
+	app = logging.getLogger(APP_LOGGER)
+	old = logging.getLevelName(app.getEffectiveLevel())
+	if old == logging.getLevelName(level):
+		return
+	# Log the change while INFO is still (or already) enabled
+	if level > app.getEffectiveLevel():
+		logger.info("Log level changed from %s to %s", old, logging.getLevelName(level))
+		app.setLevel(level)
+	else:
+		app.setLevel(level)
+		logger.info("Log level changed from %s to %s", old, logging.getLevelName(level))
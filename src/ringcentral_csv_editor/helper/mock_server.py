@@ -0,0 +1,137 @@
+#!/usr/bin/python
+
+# Import Libraries
+import json
+import time
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import logging
+logger = logging.getLogger(__name__)
+
+
+class MockContactsServer(ThreadingHTTPServer):
+	'''
+	Local stand-in for a contacts upload endpoint, for testing and
+	benchmarking BulkUploader offline. Accepts POST {"batch", "contacts"} on
+	any path, keeps connections alive and stores each Idempotency-Key once.
+
+	rate_limit: requests per second before answering 429 + Retry-After (0 = off)
+	fail_rate:  fraction of requests answered with 503
+	latency:    seconds added to every response
+	token:      if set, requests must carry "Authorization: Bearer <token>"
+	'''
+	daemon_threads = True
+
+	def __init__(
+		self,
+		host: str = "127.0.0.1",
+		port: int = 8080,
+		rate_limit: float = 0,
+		fail_rate: float = 0.0,
+		latency: float = 0.0,
+		token: str | None = None,
+	):
+		super().__init__((host, port), _Handler)
+		self.rate_limit = rate_limit
+		self.fail_rate = fail_rate
+		self.latency = latency
+		self.token = token
+
+		self.lock = threading.Lock()
+		self.batches: dict[str, int] = {}
+		self.contacts = 0
+		self.stats = {"requests": 0, "accepted": 0, "duplicates": 0, "rate_limited": 0, "failed": 0}
+		self._window = (0, 0)
+
+
+	@property
+	def url(self) -> str:
+		host, port = self.server_address[:2]
+		return f"http://{host}:{port}/contacts"
+
+
+	def throttled(self) -> bool:
+		'''
+		Fixed one-second window counter.
+		'''
+		if not self.rate_limit:
+			return False
+		second = int(time.monotonic())
+		with self.lock:
+			start, count = self._window
+			if start != second:
+				start, count = second, 0
+			count += 1
+			self._window = (start, count)
+		return count > self.rate_limit
+
+
+class _Handler(BaseHTTPRequestHandler):
+	# HTTP/1.1 so clients can reuse connections
+	protocol_version = "HTTP/1.1"
+	server: MockContactsServer
+
+
+	def log_message(self, format: str, *args) -> None:
+		logger.debug("%s " + format, self.address_string(), *args)
+
+
+	def _reply(self, status: int, payload: dict, headers: dict | None = None) -> None:
+		body = json.dumps(payload).encode("utf-8")
+		self.send_response(status)
+		self.send_header("Content-Type", "application/json")
+		self.send_header("Content-Length", str(len(body)))
+		for key, value in (headers or {}).items():
+			self.send_header(key, value)
+		self.end_headers()
+		self.wfile.write(body)
+
+
+	def do_GET(self) -> None:
+		srv = self.server
+		with srv.lock:
+			self._reply(200, {"contacts": srv.contacts, "batches": len(srv.batches), **srv.stats})
+
+
+	def do_POST(self) -> None:
+		srv = self.server
+		length = int(self.headers.get("Content-Length") or 0)
+		raw = self.rfile.read(length)
+		with srv.lock:
+			srv.stats["requests"] += 1
+		if srv.latency:
+			time.sleep(srv.latency)
+
+		if srv.token and self.headers.get("Authorization") != f"Bearer {srv.token}":
+			self._reply(401, {"errorCode": "AGW-401", "message": "Authorization required"})
+			return
+		if srv.throttled():
+			with srv.lock:
+				srv.stats["rate_limited"] += 1
+			self._reply(429, {"errorCode": "CMN-301", "message": "Request rate exceeded"}, {"Retry-After": "1"})
+			return
+		if srv.fail_rate and random.random() < srv.fail_rate:
+			with srv.lock:
+				srv.stats["failed"] += 1
+			self._reply(503, {"errorCode": "CMN-211", "message": "Service temporarily unavailable"})
+			return
+
+		try:
+			payload = json.loads(raw)
+			contacts = payload["contacts"]
+			if not isinstance(contacts, list):
+				raise TypeError("contacts must be a list")
+		except (ValueError, KeyError, TypeError) as ex:
+			self._reply(400, {"errorCode": "CMN-101", "message": f"Bad request: {ex}"})
+			return
+
+		key = self.headers.get("Idempotency-Key") or f"batch-{payload.get('batch')}-{len(srv.batches)}"
+		with srv.lock:
+			if key in srv.batches:
+				srv.stats["duplicates"] += 1
+			else:
+				srv.batches[key] = len(contacts)
+				srv.contacts += len(contacts)
+				srv.stats["accepted"] += 1
+		self._reply(200, {"batch": payload.get("batch"), "accepted": len(contacts)})
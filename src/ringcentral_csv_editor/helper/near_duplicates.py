@@ -0,0 +1,251 @@
+#!/usr/bin/python
+
+# Import Libraries
+import re
+from functools import lru_cache
+from dataclasses import dataclass, field
+import logging
+
+from .union_find import UnionFind
+logger = logging.getLogger(__name__)
+
+
+# Fields the detector compares, with their weight in the pair score.
+# Weights of fields that are blank on either side are dropped, so a contact
+# missing an email is scored on name and company alone.
+SCORE_WEIGHTS = {"name": 0.55, "email": 0.35, "company": 0.10}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_SOUNDEX_CODES = {
+	**dict.fromkeys("bfpv", "1"),
+	**dict.fromkeys("cgjkqsxz", "2"),
+	**dict.fromkeys("dt", "3"),
+	"l": "4",
+	**dict.fromkeys("mn", "5"),
+	"r": "6",
+}
+
+
+@dataclass
+class NearDuplicateCluster:
+	'''
+	A group of rows that probably describe the same contact.
+
+	rows:  0-based indexes into csv_data, ascending.
+	pairs: (row_a, row_b, score) for every scored pair that linked the cluster.
+	score: best pair score in the cluster.
+	'''
+	rows: list[int]
+	pairs: list[tuple[int, int, float]] = field(default_factory=list)
+	score: float = 0.0
+
+
+@lru_cache(maxsize=65536)
+def soundex(text: str) -> str:
+	'''
+	American Soundex code of the first word-ish run of letters, e.g. "Robert" -> "R163".
+	Returns "" if the text has no letters.
+	'''
+	letters = [c for c in text.casefold() if "a" <= c <= "z"]
+	if not letters:
+		return ""
+	first = letters[0]
+	code = first.upper()
+	last = _SOUNDEX_CODES.get(first, "")
+	for c in letters[1:]:
+		digit = _SOUNDEX_CODES.get(c, "")
+		if digit and digit != last:
+			code += digit
+			if len(code) == 4:
+				break
+		# h and w do not separate letters with the same code; vowels do
+		if c not in "hw":
+			last = digit
+	return code.ljust(4, "0")
+
+
+def _get(row: dict, name: str) -> str:
+	'''
+	Case-insensitive column lookup so books with odd header casing still work.
+	'''
+	value = row.get(name)
+	if value is None:
+		for key, v in row.items():
+			if key.strip().casefold() == name.casefold():
+				value = v
+				break
+	return (value or "").strip()
+
+
+def _bigrams(text: str) -> frozenset[str]:
+	'''
+	Padded character bigrams of every token, e.g. "amy" -> {" a", "am", "my", "y "}.
+	Token order does not matter, so "Smith John" scores like "John Smith".
+	'''
+	grams: set[str] = set()
+	for token in text.split():
+		padded = f" {token} "
+		grams.update(map(str.__add__, padded, padded[1:]))
+	return frozenset(grams)
+
+
+def _dice(a: frozenset[str], b: frozenset[str]) -> float:
+	if a == b:
+		return 1.0
+	return 2 * len(a & b) / (len(a) + len(b))
+
+
+def _prepare(row: dict) -> tuple[str, str, str, str]:
+	'''
+	Returns (first, surname, email, company) folded for comparison.
+	'''
+	first = " ".join(_TOKEN_RE.findall(_get(row, "First Name").casefold()))
+	surname = " ".join(_TOKEN_RE.findall(_get(row, "Surname").casefold()))
+	email = _get(row, "Email").casefold()
+	company = " ".join(_TOKEN_RE.findall(_get(row, "Company").casefold()))
+	return first, surname, email, company
+
+
+def _grams(prepared: tuple[str, str, str, str]) -> tuple[str, frozenset[str], frozenset[str], frozenset[str]]:
+	'''
+	Returns (email, name_grams, email_local_grams, company_grams). Only rows that
+	share a blocking key are ever gram-ed, so singletons cost nothing here.
+	'''
+	first, surname, email, company = prepared
+	local = " ".join(_TOKEN_RE.findall(email.split("@", 1)[0]))
+	return email, _bigrams(f"{first} {surname}"), _bigrams(local), _bigrams(company)
+
+
+def blocking_keys(first: str, surname: str, email: str) -> set[str]:
+	'''
+	Cheap keys that near-duplicates are likely to share. Only rows sharing at
+	least one key are ever compared, which keeps the detector far from O(n²).
+	'''
+	keys: set[str] = set()
+	if email:
+		keys.add("e:" + email)
+		local = email.split("@", 1)[0].split("+", 1)[0]
+		if len(local) >= 3:
+			keys.add("l:" + local)
+	tokens = sorted(f"{first} {surname}".split())
+	if tokens:
+		# Sorted tokens catch first name / surname entered the wrong way round
+		keys.add("t:" + " ".join(tokens))
+	if surname:
+		# Phonetic surname + first initial catches misspelt names
+		keys.add("p:" + soundex(surname) + first[:1])
+	return keys
+
+
+def score_pair(a: tuple, b: tuple) -> float:
+	'''
+	Weighted similarity in [0, 1] of two gram-ed rows (see _grams).
+	'''
+	total = 0.0
+	weight = 0.0
+
+	if a[1] and b[1]:
+		total += SCORE_WEIGHTS["name"] * _dice(a[1], b[1])
+		weight += SCORE_WEIGHTS["name"]
+
+	if a[0] and b[0]:
+		if a[0] == b[0]:
+			email = 1.0
+		elif a[2] and b[2]:
+			# Same mailbox name at another domain is weaker evidence
+			email = _dice(a[2], b[2]) * 0.9
+		else:
+			email = 0.0
+		total += SCORE_WEIGHTS["email"] * email
+		weight += SCORE_WEIGHTS["email"]
+
+	if a[3] and b[3]:
+		total += SCORE_WEIGHTS["company"] * _dice(a[3], b[3])
+		weight += SCORE_WEIGHTS["company"]
+
+	# A single shared field (e.g. only a company) is not enough evidence
+	if weight < SCORE_WEIGHTS["name"]:
+		return 0.0
+	return total / weight
+
+
+def find_near_duplicates(rows: list[dict], threshold: float = 0.85, max_block: int = 200) -> list[NearDuplicateCluster]:
+	'''
+	Cluster rows that are probably the same contact entered more than once.
+
+	Rows are bucketed by blocking keys, every pair inside a bucket is scored
+	once, and pairs scoring >= threshold are joined with a union-find.
+	Buckets larger than max_block (e.g. a very common surname) are skipped,
+	since comparing inside them would be quadratic and mostly noise.
+	'''
+	logger.debug("Scanning %d rows for near-duplicates", len(rows))
+
+	prepared = [_prepare(row) for row in rows]
+	blocks: dict[str, list[int]] = {}
+	for i, (first, surname, email, _company) in enumerate(prepared):
+		for key in blocking_keys(first, surname, email):
+			blocks.setdefault(key, []).append(i)
+
+	uf = UnionFind(len(rows))
+	grams: dict[int, tuple] = {}
+	compared: set[tuple[int, int]] = set()
+	links: list[tuple[int, int, float]] = []
+	skipped = 0
+
+	for key, members in blocks.items():
+		if len(members) < 2:
+			continue
+		if len(members) > max_block:
+			skipped += 1
+			logger.debug("Skipping oversized block %s (%d rows)", key, len(members))
+			continue
+		for i in members:
+			if i not in grams:
+				grams[i] = _grams(prepared[i])
+		for x, i in enumerate(members):
+			for j in members[x + 1:]:
+				if (i, j) in compared:
+					continue
+				compared.add((i, j))
+				score = score_pair(grams[i], grams[j])
+				if score >= threshold:
+					uf.union(i, j)
+					links.append((i, j, round(score, 3)))
+
+	clusters: dict[int, NearDuplicateCluster] = {}
+	for members in uf.groups():
+		clusters[uf.find(members[0])] = NearDuplicateCluster(rows=members)
+	for i, j, score in links:
+		cluster = clusters[uf.find(i)]
+		cluster.pairs.append((i, j, score))
+		cluster.score = max(cluster.score, score)
+
+	result = sorted(clusters.values(), key=lambda c: c.rows[0])
+	logger.info(
+		"Near-duplicate scan complete: %d clusters from %d comparisons (%d oversized blocks skipped)",
+		len(result), len(compared), skipped,
+	)
+	return result
+
+
+def merge_rows(rows: list[dict], keep: int, others: list[int], phone_fields: set[str] | None = None) -> dict:
+	'''
+	Return a copy of rows[keep] with its blank fields filled from the other
+	rows, in order. Phone numbers already present in the merged row are not
+	copied again, so the merge never creates an intra-row duplicate.
+	'''
+	merged = dict(rows[keep])
+	phone_fields = phone_fields or set()
+	numbers = {(merged.get(k) or "").strip() for k in phone_fields} - {""}
+
+	for i in others:
+		for key, value in rows[i].items():
+			value = (value or "").strip()
+			if not value or (merged.get(key) or "").strip():
+				continue
+			if key in phone_fields:
+				if value in numbers:
+					continue
+				numbers.add(value)
+			merged[key] = value
+	return merged
@@ -0,0 +1,272 @@
+#!/usr/bin/python
+
+# Import Libraries
+import re
+import json
+from pathlib import Path
+import logging
+
+from .registry import book_key
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_REGION = "AU"
+
+# Per-book default region, keyed by registry book key
+REGIONS_PATH = Path.home() / "ringcentral-csv-editor" / "regions.json"
+
+# Numbering plans. Each range lists national significant number (NSN)
+# prefixes and the allowed NSN lengths. Ranges marked no_trunk are dialled
+# nationally without the trunk prefix (AU 13/1300/1800).
+# Every range is accepted as:
+#   national:       [trunk_prefix] + NSN            (region's own numbers)
+#   international:  country_code + NSN, with or without a leading "+"
+#   IDD:            idd_prefix + country_code + NSN (any country, from this region)
+NUMBERING_PLANS: dict[str, dict] = {
+	"AU": {
+		"name": "Australia",
+		"country_code": "61",
+		"trunk_prefix": "0",
+		"idd_prefix": "0011",
+		"ranges": [
+			{"kind": "mobile", "prefixes": ["4"], "lengths": [9]},
+			{"kind": "landline", "prefixes": ["2", "3", "7", "8"], "lengths": [9]},
+			{"kind": "service", "prefixes": ["13"], "lengths": [6], "no_trunk": True},
+			{"kind": "service", "prefixes": ["1300", "1800"], "lengths": [10], "no_trunk": True},
+		],
+		"error": "Not a valid AU phone number (mobile, landline(must include area code(08,07,03...)), or 13/1300/1800)",
+		"plus_error": "Expected Australian number in E.164 format (e.g. +614..., +612..., +611300...)",
+	},
+	"NZ": {
+		"name": "New Zealand",
+		"country_code": "64",
+		"trunk_prefix": "0",
+		"idd_prefix": "00",
+		"ranges": [
+			{"kind": "mobile", "prefixes": ["2"], "lengths": [8, 9, 10]},
+			{"kind": "landline", "prefixes": ["3", "4", "6", "7", "9"], "lengths": [8]},
+			{"kind": "freephone", "prefixes": ["800", "508"], "lengths": [9]},
+		],
+	},
+	"GB": {
+		"name": "United Kingdom",
+		"country_code": "44",
+		"trunk_prefix": "0",
+		"idd_prefix": "00",
+		"ranges": [
+			{"kind": "mobile", "prefixes": ["7"], "lengths": [10]},
+			{"kind": "landline", "prefixes": ["1"], "lengths": [9, 10]},
+			{"kind": "landline", "prefixes": ["2"], "lengths": [10]},
+			{"kind": "non-geographic", "prefixes": ["3"], "lengths": [10]},
+			{"kind": "freephone", "prefixes": ["800"], "lengths": [9, 10]},
+			{"kind": "service", "prefixes": ["808", "84", "87"], "lengths": [10]},
+		],
+	},
+	"IE": {
+		"name": "Ireland",
+		"country_code": "353",
+		"trunk_prefix": "0",
+		"idd_prefix": "00",
+		"ranges": [
+			{"kind": "mobile", "prefixes": ["8"], "lengths": [9]},
+			{"kind": "landline", "prefixes": ["1"], "lengths": [8]},
+			{"kind": "landline", "prefixes": ["2", "4", "5", "6", "7", "9"], "lengths": [8, 9]},
+		],
+	},
+	"US": {
+		"name": "United States / Canada",
+		"country_code": "1",
+		"trunk_prefix": "1",
+		"idd_prefix": "011",
+		"ranges": [
+			{"kind": "nanp", "prefixes": list("23456789"), "lengths": [10], "no_trunk": True},
+		],
+	},
+	"SG": {
+		"name": "Singapore",
+		"country_code": "65",
+		"trunk_prefix": "",
+		"idd_prefix": "000",
+		"ranges": [
+			{"kind": "landline", "prefixes": ["6"], "lengths": [8]},
+			{"kind": "mobile", "prefixes": ["8", "9"], "lengths": [8]},
+			{"kind": "freephone", "prefixes": ["800"], "lengths": [10]},
+		],
+	},
+}
+
+_NON_DIAL = re.compile(r"[^\d+]")
+_RULES = "$"
+
+
+def _insert(trie: dict, digits: str, length: int, rule: tuple[int, str]) -> None:
+	'''
+	Add a rule at the end of digits: an input of exactly length digits that
+	starts with digits becomes "+" + prepend + input[strip:].
+	The first rule inserted for a (prefix, length) wins.
+	'''
+	node = trie
+	for ch in digits:
+		node = node.setdefault(ch, {})
+	node.setdefault(_RULES, {}).setdefault(length, rule)
+
+
+def _walk(trie: dict, digits: str) -> tuple[int, str] | None:
+	'''
+	One pass over digits; the deepest prefix with a rule for this length wins.
+	'''
+	node, best, n = trie, None, len(digits)
+	for ch in digits:
+		node = node.get(ch)
+		if node is None:
+			break
+		rules = node.get(_RULES)
+		if rules is not None:
+			best = rules.get(n, best)
+	return best
+
+
+class PhoneNormaliser:
+	'''
+	Normalise phone numbers from any supported country to E.164.
+
+	plans is a NUMBERING_PLANS-shaped table. It is compiled into one prefix
+	trie for "+" numbers plus one per region for everything dialled without a
+	"+" (national, country-code and IDD forms), so each value is matched
+	with a single walk over its digits.
+	'''
+	def __init__(self, plans: dict[str, dict] | None = None):
+		self.plans = plans if plans is not None else NUMBERING_PLANS
+		self._international: dict = {}
+		self._by_code: dict[str, dict] = {}
+		for plan in self.plans.values():
+			code = plan["country_code"]
+			self._by_code.setdefault(code, plan)
+			for prefix, length, _no_trunk in self._ranges(plan):
+				_insert(self._international, code + prefix, len(code) + length, (0, ""))
+		self._national: dict[str, dict] = {}
+
+
+	@staticmethod
+	def _ranges(plan: dict):
+		for rng in plan["ranges"]:
+			for prefix in rng["prefixes"]:
+				for length in rng["lengths"]:
+					yield prefix, length, rng.get("no_trunk", False)
+
+
+	def regions(self) -> list[str]:
+		return list(self.plans)
+
+
+	def _region_trie(self, region: str) -> dict:
+		trie = self._national.get(region)
+		if trie is not None:
+			return trie
+		plan = self.plans.get(region)
+		if plan is None:
+			raise ValueError(f"Unknown region {region!r} (supported: {', '.join(self.plans)})")
+
+		trie = {}
+		code, trunk = plan["country_code"], plan.get("trunk_prefix", "")
+		# National forms first, so they win over any same-length overlap
+		for prefix, length, no_trunk in self._ranges(plan):
+			lead = "" if no_trunk else trunk
+			_insert(trie, lead + prefix, len(lead) + length, (len(lead), code))
+		for prefix, length, _no_trunk in self._ranges(plan):
+			_insert(trie, code + prefix, len(code) + length, (0, ""))
+		idd = plan.get("idd_prefix")
+		if idd:
+			for other in self.plans.values():
+				other_code = other["country_code"]
+				for prefix, length, _no_trunk in self._ranges(other):
+					_insert(trie, idd + other_code + prefix, len(idd) + len(other_code) + length, (len(idd), ""))
+
+		self._national[region] = trie
+		return trie
+
+
+	def _plan_for_code(self, digits: str) -> dict | None:
+		for size in (3, 2, 1):
+			plan = self._by_code.get(digits[:size])
+			if plan is not None:
+				return plan
+		return None
+
+
+	def normalise(self, value: str, region: str = DEFAULT_REGION) -> str:
+		'''
+		Return value as E.164 ("+<country code><NSN>"). Spaces, dashes,
+		brackets and other punctuation are ignored. Numbers without a "+" are
+		read as dialled from region. Raises ValueError if no plan matches.
+		'''
+		cleaned = _NON_DIAL.sub("", value)
+		if cleaned.startswith("+"):
+			digits = cleaned[1:]
+			if "+" not in digits:
+				rule = _walk(self._international, digits)
+				if rule is not None:
+					return "+" + digits
+			plan = self._plan_for_code(digits)
+			if plan is None:
+				own = self.plans.get(region, {}).get("plus_error")
+				codes = ", ".join(sorted({"+" + p["country_code"] for p in self.plans.values()}))
+				raise ValueError(own or f"Unsupported country code (supported: {codes})")
+			raise ValueError(plan.get("plus_error") or f"Expected {plan['name']} number in E.164 format (+{plan['country_code']}...)")
+
+		digits = cleaned.replace("+", "")
+		rule = _walk(self._region_trie(region), digits)
+		if rule is not None:
+			strip, prepend = rule
+			return "+" + prepend + digits[strip:]
+		plan = self.plans[region]
+		raise ValueError(plan.get("error") or f"Not a valid {plan['name']} phone number (or +<country code> number)")
+
+
+_default: PhoneNormaliser | None = None
+
+
+def get_normaliser() -> PhoneNormaliser:
+	global _default
+	if _default is None:
+		_default = PhoneNormaliser()
+	return _default
+
+
+def register_plan(region: str, plan: dict) -> None:
+	'''
+	Add or replace a numbering plan; the shared normaliser is recompiled on next use.
+	'''
+	global _default
+	NUMBERING_PLANS[region] = plan
+	_default = None
+
+
+def normalise_number(value: str, region: str = DEFAULT_REGION) -> str:
+	return get_normaliser().normalise(value, region)
+
+
+def _load_regions() -> dict[str, str]:
+	try:
+		return json.loads(REGIONS_PATH.read_text(encoding="utf-8"))
+	except FileNotFoundError:
+		return {}
+	except (OSError, ValueError):
+		logger.warning("Ignoring unreadable region settings: %s", REGIONS_PATH)
+		return {}
+
+
+def book_region(book_path: str | Path) -> str | None:
+	'''
+	The default region saved for a book, or None.
+	'''
+	return _load_regions().get(book_key(book_path))
+
+
+def set_book_region(book_path: str | Path, region: str) -> None:
+	if region not in NUMBERING_PLANS:
+		raise ValueError(f"Unknown region {region!r} (supported: {', '.join(NUMBERING_PLANS)})")
+	regions = _load_regions()
+	regions[book_key(book_path)] = region
+	REGIONS_PATH.parent.mkdir(parents=True, exist_ok=True)
+	REGIONS_PATH.write_text(json.dumps(regions, indent=2, sort_keys=True), encoding="utf-8")
@@ -0,0 +1,182 @@
+#!/usr/bin/python
+
+# Import Libraries
+import io
+import os
+import csv
+import mmap
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable
+import logging
+logger = logging.getLogger(__name__)
+
+
+UTF8_BOM = b"\xef\xbb\xbf"
+
+# Files smaller than this are parsed sequentially; process start-up costs
+# more than the parse itself.
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+MIN_CHUNK_BYTES = 1024 * 1024
+
+
+def find_header(mm: mmap.mmap, required: set[str], encoding: str = "utf-8", delimiter: str = ",") -> tuple[list[str], int]:
+	'''
+	Scan line by line for the first row containing every required header.
+	Returns (fieldnames, body_offset) where body_offset is the byte offset of
+	the first data record. Raises ValueError if no such row exists.
+	'''
+	pos = len(UTF8_BOM) if mm[:len(UTF8_BOM)] == UTF8_BOM else 0
+	size = len(mm)
+
+	while pos < size:
+		nl = mm.find(b"\n", pos)
+		end = size if nl == -1 else nl + 1
+		line = mm[pos:end].decode(encoding)
+		row = next(csv.reader([line], delimiter=delimiter), [])
+		row_set = {str(cell or "").strip().lstrip("\ufeff") for cell in row}
+
+		if required.issubset(row_set):
+			logger.info("Header found at byte offset %s", pos)
+			return row, end
+		pos = end
+
+	raise ValueError(f"Could not find header row containing {sorted(required)}")
+
+
+def split_records(mm: mmap.mmap, start: int, end: int, chunk_size: int) -> list[tuple[int, int]]:
+	'''
+	Split mm[start:end] into (start, end) byte ranges of roughly chunk_size that
+	each begin and end on a record boundary.
+
+	A newline only ends a record when it sits outside a quoted field, i.e. when
+	the number of '"' bytes since the last boundary is even ("" escapes count
+	twice, so they keep the parity). Quote and newline bytes never occur inside
+	a multi-byte UTF-8 sequence (or in any other character of a single-byte
+	encoding such as cp1252), so this is safe on the raw bytes. Not for UTF-16.
+
+	The parity is only a guess: csv treats a '"' inside an unquoted field
+	(5'10" desk) as a literal, which flips it. _parse_chunk checks every
+	boundary, and parse_parallel re-parses sequentially if one is wrong.
+	'''
+	chunks: list[tuple[int, int]] = []
+	chunk_start = start
+
+	while chunk_start < end:
+		pos = min(chunk_start + chunk_size, end)
+		quotes = mm[chunk_start:pos].count(b'"') if pos < end else 0
+
+		while pos < end:
+			nl = mm.find(b"\n", pos, end)
+			if nl == -1:
+				pos = end
+				break
+			quotes += mm[pos:nl].count(b'"')
+			pos = nl + 1
+			if quotes % 2 == 0:
+				break
+
+		chunks.append((chunk_start, pos))
+		chunk_start = pos
+	return chunks
+
+
+def _parse_chunk(
+	path: str, start: int, end: int, fieldnames: list[str], encoding: str, delimiter: str = ",", check_end: bool = False,
+) -> list[dict] | None:
+	'''
+	Worker: parse one byte range exactly as csv.DictReader would (blank lines
+	skipped, short rows padded with "", extra cells dropped).
+
+	With check_end, returns None unless the range parses strictly, which in
+	particular means it doesn't end inside a quoted field. Given that the
+	range starts on a record boundary, its end then is one too, so chained
+	over every chunk this proves split_records' guesses right.
+	'''
+	with open(path, "rb") as f:
+		f.seek(start)
+		text = f.read(end - start).decode(encoding)
+
+	n = len(fieldnames)
+	rows: list[dict] = []
+	reader = csv.reader(io.StringIO(text, newline=""), delimiter=delimiter, strict=check_end)
+	try:
+		records = list(reader)
+	except csv.Error as ex:
+		logger.debug("Chunk %d-%d of %s is not record-aligned: %s", start, end, path, ex)
+		return None
+	for row in records:
+		if not row:
+			continue
+		d = dict(zip(fieldnames, row))
+		if len(row) < n:
+			for key in fieldnames[len(row):]:
+				d[key] = ""
+		rows.append(d)
+	return rows
+
+
+def parse_parallel(
+	csv_in_path: str | Path,
+	required_headers: Iterable[str] = ("First Name", "Surname"),
+	workers: int | None = None,
+	chunk_size: int | None = None,
+	encoding: str = "utf-8",
+	delimiter: str = ",",
+) -> tuple[list[str], list[dict]]:
+	'''
+	Memory-map the file, find the header, split the body into record-aligned
+	chunks and parse them on a process pool. Rows come back in file order.
+	encoding must be byte-safe (see CsvFormat.byte_safe).
+	Returns (fieldnames, rows).
+	'''
+	path = Path(csv_in_path).expanduser()
+	required = {str(h or "").strip() for h in required_headers}
+	workers = workers or os.cpu_count() or 1
+
+	with path.open("rb") as f:
+		if os.fstat(f.fileno()).st_size == 0:
+			raise ValueError("CSV is empty (no headers).")
+		with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+			if not mm[:2048].strip(UTF8_BOM + b" \t\r\n"):
+				raise ValueError("CSV is empty (no headers).")
+			try:
+				fieldnames, body = find_header(mm, required, encoding, delimiter)
+			except ValueError:
+				raise ValueError(f"Could not find header row containing {sorted(required)} in file: {path}") from None
+			size = len(mm)
+			if chunk_size is None:
+				chunk_size = max(MIN_CHUNK_BYTES, (size - body) // (workers * 4) + 1)
+			chunks = split_records(mm, body, size, chunk_size)
+
+	logger.info("Parsing %s in %d chunks on %d workers", path, len(chunks), workers)
+	if len(chunks) <= 1:
+		return fieldnames, _parse_chunk(str(path), body, size, fieldnames, encoding, delimiter)
+
+	# Every chunk but the last must end on a record boundary
+	check = [True] * (len(chunks) - 1) + [False]
+	if workers == 1:
+		results = [
+			_parse_chunk(str(path), start, end, fieldnames, encoding, delimiter, check_end)
+			for (start, end), check_end in zip(chunks, check)
+		]
+	else:
+		with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+			results = list(pool.map(
+				_parse_chunk,
+				[str(path)] * len(chunks),
+				[c[0] for c in chunks],
+				[c[1] for c in chunks],
+				[fieldnames] * len(chunks),
+				[encoding] * len(chunks),
+				[delimiter] * len(chunks),
+				check,
+			))
+
+	if any(part is None for part in results):
+		logger.warning("Chunk boundaries of %s fell inside quoted fields; parsing it sequentially", path)
+		return fieldnames, _parse_chunk(str(path), body, size, fieldnames, encoding, delimiter)
+	rows: list[dict] = []
+	for part in results:
+		rows.extend(part)
+	return fieldnames, rows
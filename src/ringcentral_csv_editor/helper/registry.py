@@ -0,0 +1,263 @@
+#!/usr/bin/python
+
+# Import Libraries
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable
+import logging
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_REGISTRY_PATH = Path.home() / "ringcentral-csv-editor" / "registry.sqlite3"
+
+PHONE_FIELDS = {"home number", "business number", "mobile number", "company main number"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+	book     TEXT PRIMARY KEY,
+	size     INTEGER,
+	mtime_ns INTEGER,
+	rows     INTEGER NOT NULL,
+	updated  TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS numbers (
+	number      TEXT NOT NULL,
+	book        TEXT NOT NULL,
+	row         INTEGER NOT NULL,
+	field       TEXT NOT NULL,
+	external_id TEXT NOT NULL DEFAULT '',
+	PRIMARY KEY (book, field, number, external_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS numbers_by_number ON numbers (number);
+"""
+
+# PRAGMA user_version of the current schema. Version 0 keyed numbers on
+# (book, row, field), so inserting one row rewrote every later entry.
+SCHEMA_VERSION = 1
+
+
+def book_key(path: str | Path) -> str:
+	'''
+	Registry identity of a book: its absolute, resolved path.
+	'''
+	return str(Path(path).expanduser().resolve())
+
+
+def _entries(rows: list[dict]) -> dict[tuple[str, str, str], int]:
+	'''
+	(field, number, external_id) -> row for every phone cell in rows. The
+	row is payload, not identity: inserting or deleting a row moves the
+	later entries without changing them. A number repeated in one field
+	keeps its first row.
+	'''
+	entries = {}
+	for i, row in enumerate(rows):
+		external_id = ""
+		for key, value in row.items():
+			if key.strip().casefold() == "external id":
+				external_id = (value or "").strip()
+				break
+		for key, value in row.items():
+			if key.strip().casefold() not in PHONE_FIELDS:
+				continue
+			number = (value or "").strip()
+			if number:
+				entries.setdefault((key, number, external_id), i)
+	return entries
+
+
+class NumberRegistry:
+	'''
+	On-disk index of phone number -> (book, row, field, External Id) across
+	every saved address book, so a number can be checked against all known
+	books with one indexed lookup instead of reloading them.
+
+	Backed by SQLite; safe to share between the GUI's event threads.
+	'''
+	def __init__(self, path: str | Path | None = None):
+		self.path = Path(path).expanduser() if path else DEFAULT_REGISTRY_PATH
+		self.path.parent.mkdir(parents=True, exist_ok=True)
+		self._lock = threading.Lock()
+		self._db = sqlite3.connect(self.path, check_same_thread=False)
+		self._db.execute("PRAGMA journal_mode=WAL")
+		self._migrate()
+		self._db.executescript(_SCHEMA)
+		self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+	def _migrate(self) -> None:
+		'''
+		Re-key a version 0 numbers table in place (keeping the first row of
+		each entry), so registered books don't need re-adding.
+		'''
+		version = self._db.execute("PRAGMA user_version").fetchone()[0]
+		exists = self._db.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'numbers'").fetchone()
+		if version >= SCHEMA_VERSION or not exists:
+			return
+		with self._db:
+			self._db.execute("DROP INDEX IF EXISTS numbers_by_number")
+			self._db.execute("ALTER TABLE numbers RENAME TO numbers_v0")
+			self._db.executescript(_SCHEMA)
+			self._db.execute(
+				"INSERT OR IGNORE INTO numbers (number, book, row, field, external_id) "
+				"SELECT number, book, row, field, external_id FROM numbers_v0 ORDER BY book, row"
+			)
+			self._db.execute("DROP TABLE numbers_v0")
+		logger.info("Registry %s upgraded to schema version %d", self.path, SCHEMA_VERSION)
+
+
+	def close(self) -> None:
+		with self._lock:
+			self._db.close()
+
+
+	def update_book(
+		self,
+		book_path: str | Path,
+		rows: list[dict],
+		previous: str | Path | None = None,
+		replace_previous: bool = False,
+	) -> tuple[int, int]:
+		'''
+		Record the numbers of a book, replacing its previous entries.
+		Only the difference is written: entries added or removed, plus the
+		row of entries that moved (rows inserted or deleted above them).
+		previous is the path the book was last saved under. Its entries stay
+		while that file still exists, since it still holds those numbers;
+		they are dropped when it is gone or with replace_previous.
+		Returns (entries_added, entries_removed).
+		'''
+		book = book_key(book_path)
+		moved_from = book_key(previous) if previous else None
+		if moved_from == book or (moved_from is not None and not replace_previous and Path(moved_from).exists()):
+			moved_from = None
+		new = _entries(rows)
+		try:
+			stat = Path(book).stat()
+			size, mtime_ns = stat.st_size, stat.st_mtime_ns
+		except OSError:
+			size, mtime_ns = None, None
+
+		with self._lock, self._db:
+			if moved_from is not None:
+				self._db.execute("DELETE FROM numbers WHERE book = ?", (moved_from,))
+				self._db.execute("DELETE FROM books WHERE book = ?", (moved_from,))
+			old = {
+				(field, number, ext): row
+				for field, number, ext, row in self._db.execute(
+					"SELECT field, number, external_id, row FROM numbers WHERE book = ?", (book,)
+				)
+			}
+			removed = [key for key in old if key not in new]
+			added = [(key, row) for key, row in new.items() if key not in old]
+			moved = [(key, row) for key, row in new.items() if key in old and old[key] != row]
+			self._db.executemany(
+				"DELETE FROM numbers WHERE book = ? AND field = ? AND number = ? AND external_id = ?",
+				[(book, *key) for key in removed],
+			)
+			self._db.executemany(
+				"INSERT INTO numbers (book, field, number, external_id, row) VALUES (?, ?, ?, ?, ?)",
+				[(book, *key, row) for key, row in added],
+			)
+			self._db.executemany(
+				"UPDATE numbers SET row = ? WHERE book = ? AND field = ? AND number = ? AND external_id = ?",
+				[(row, book, *key) for key, row in moved],
+			)
+			self._db.execute(
+				"INSERT OR REPLACE INTO books (book, size, mtime_ns, rows, updated) VALUES (?, ?, ?, ?, ?)",
+				(book, size, mtime_ns, len(rows), datetime.now().isoformat(timespec="seconds")),
+			)
+		if moved_from is not None:
+			logger.info("Registry entry moved: %s -> %s", moved_from, book)
+		logger.info("Registry updated for %s: +%d / -%d entries (%d moved)", book, len(added), len(removed), len(moved))
+		return len(added), len(removed)
+
+
+	def remove_book(self, book_path: str | Path) -> None:
+		book = book_key(book_path)
+		with self._lock, self._db:
+			self._db.execute("DELETE FROM numbers WHERE book = ?", (book,))
+			self._db.execute("DELETE FROM books WHERE book = ?", (book,))
+		logger.info("Registry entry removed: %s", book)
+
+
+	def books(self) -> list[tuple[str, int, str]]:
+		'''
+		(book, rows, updated) for every registered book.
+		'''
+		with self._lock:
+			return list(self._db.execute("SELECT book, rows, updated FROM books ORDER BY book"))
+
+
+	def is_stale(self, book_path: str | Path) -> bool:
+		'''
+		True if the book is unregistered or its file changed since it was recorded.
+		'''
+		book = book_key(book_path)
+		with self._lock:
+			stamp = self._db.execute("SELECT size, mtime_ns FROM books WHERE book = ?", (book,)).fetchone()
+		if stamp is None:
+			return True
+		try:
+			stat = Path(book).stat()
+		except OSError:
+			return True
+		return stamp != (stat.st_size, stat.st_mtime_ns)
+
+
+	def stale_books(self) -> list[str]:
+		'''
+		Registered books whose file changed (or vanished) since they were recorded.
+		'''
+		return [book for book, _rows, _updated in self.books() if self.is_stale(book)]
+
+
+	def lookup(self, number: str, exclude_book: str | Path | None = None) -> list[tuple[str, int, str, str]]:
+		'''
+		Every (book, row, field, external_id) holding number, skipping
+		exclude_book. Row indexes are 0-based.
+		'''
+		exclude = book_key(exclude_book) if exclude_book else ""
+		with self._lock:
+			return list(self._db.execute(
+				"SELECT book, row, field, external_id FROM numbers WHERE number = ? AND book != ? ORDER BY book, row",
+				(number.strip(), exclude),
+			))
+
+
+	def conflicts(self, rows: Iterable[dict], exclude_book: str | Path | None = None) -> list[tuple[str, int, str, str, int, str]]:
+		'''
+		Numbers in rows that already exist in another registered book, as
+		(number, row_index, field, other_book, other_row, other_field).
+		One indexed lookup per phone cell.
+		'''
+		exclude = book_key(exclude_book) if exclude_book else ""
+		found = []
+		with self._lock:
+			for i, row in enumerate(rows):
+				for key, value in row.items():
+					if key.strip().casefold() not in PHONE_FIELDS:
+						continue
+					number = (value or "").strip()
+					if not number:
+						continue
+					for book, other_row, other_field in self._db.execute(
+						"SELECT book, row, field FROM numbers WHERE number = ? AND book != ? ORDER BY book, row",
+						(number, exclude),
+					):
+						found.append((number, i, key, book, other_row, other_field))
+		return found
+
+
+	@staticmethod
+	def format_conflicts(conflicts: list[tuple[str, int, str, str, int, str]], limit: int = 10, show_row: bool = True) -> str:
+		if not conflicts:
+			return ""
+		lines = [
+			f"{number}: {f'row {i+1} ' if show_row else ''}({field}) is also in {Path(book).name} row {other_row+1} ({other_field})"
+			for number, i, field, book, other_row, other_field in conflicts[:limit]
+		]
+		more = "" if len(conflicts) <= limit else f"\n…and {len(conflicts)-limit} more."
+		return "Numbers already used in other address books:\n" + "\n".join(lines) + more
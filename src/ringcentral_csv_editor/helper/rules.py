@@ -0,0 +1,239 @@
+#!/usr/bin/python
+
+# Import Libraries
+import re
+import json
+import hashlib
+import tomllib
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Iterable
+import logging
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_RULES_PATH = Path.home() / "ringcentral-csv-editor" / "rules.toml"
+
+# Keys accepted in a [columns."<header>"] table
+RULE_KEYS = {
+	"builtin",      # bool, default true: run field_formatter's built-in rule first
+	"required",     # bool: blank is an error
+	"min_length",   # int
+	"max_length",   # int
+	"pattern",      # regex the whole (normalised) value must match
+	"message",      # error shown when pattern fails
+	"allowed",      # list of permitted values
+	"ignore_case",  # bool: allowed values match case-insensitively (output uses the listed spelling)
+	"case",         # "title" | "upper" | "lower": applied before the other checks
+	"unique",       # bool: no two rows may share a non-blank value
+}
+
+_CASES: dict[str, Callable[[str], str]] = {"title": str.title, "upper": str.upper, "lower": str.lower}
+
+
+def compile_column(field: str, spec: dict, builtin: Callable[[str], str]) -> Callable[[str], str]:
+	'''
+	Build the validator for one column: a closure taking the raw cell text
+	and returning the cleaned value, or raising ValueError.
+	builtin is the column's field_formatter rule.
+	'''
+	use_builtin = spec.get("builtin", True)
+	required = spec.get("required", False)
+	min_length = spec.get("min_length")
+	max_length = spec.get("max_length")
+	regex = re.compile(spec["pattern"]) if "pattern" in spec else None
+	message = spec.get("message") or f"Doesn't match the pattern for {field}: {spec.get('pattern')}"
+	ignore_case = spec.get("ignore_case", False)
+	allowed = None
+	if "allowed" in spec:
+		allowed = {(v.casefold() if ignore_case else v): v for v in spec["allowed"]}
+		allowed_text = ", ".join(spec["allowed"])
+	recase = _CASES[spec["case"]] if "case" in spec else None
+
+	def validate(value: str) -> str:
+		value = value.strip()
+		if not value:
+			if required:
+				raise ValueError("Required")
+			return ""
+		if use_builtin:
+			value = builtin(value)
+		if recase is not None:
+			value = recase(value)
+		if min_length is not None and len(value) < min_length:
+			raise ValueError(f"Must be at least {min_length} characters")
+		if max_length is not None and len(value) > max_length:
+			raise ValueError(f"Must be at most {max_length} characters")
+		if regex is not None and regex.fullmatch(value) is None:
+			raise ValueError(message)
+		if allowed is not None:
+			value = allowed.get(value.casefold() if ignore_case else value)
+			if value is None:
+				raise ValueError(f"Must be one of: {allowed_text}")
+		return value
+
+	return validate
+
+
+def _check_spec(field: str, spec: object, source: str) -> dict:
+	where = f"{source}: columns.{field!r}"
+	if not isinstance(spec, dict):
+		raise ValueError(f"{where} must be a table")
+	unknown = set(spec) - RULE_KEYS
+	if unknown:
+		raise ValueError(f"{where}: unknown key(s) {', '.join(sorted(unknown))} (allowed: {', '.join(sorted(RULE_KEYS))})")
+	for key in ("builtin", "required", "ignore_case", "unique"):
+		if key in spec and not isinstance(spec[key], bool):
+			raise ValueError(f"{where}.{key} must be true or false")
+	for key in ("min_length", "max_length"):
+		if key in spec and (not isinstance(spec[key], int) or isinstance(spec[key], bool) or spec[key] < 0):
+			raise ValueError(f"{where}.{key} must be a whole number >= 0")
+	for key in ("pattern", "message"):
+		if key in spec and not isinstance(spec[key], str):
+			raise ValueError(f"{where}.{key} must be a string")
+	if "pattern" in spec:
+		try:
+			re.compile(spec["pattern"])
+		except re.error as ex:
+			raise ValueError(f"{where}.pattern is not a valid regex: {ex}") from None
+	if "allowed" in spec and not (isinstance(spec["allowed"], list) and all(isinstance(v, str) for v in spec["allowed"])):
+		raise ValueError(f"{where}.allowed must be a list of strings")
+	if "case" in spec and spec["case"] not in _CASES:
+		raise ValueError(f"{where}.case must be one of: {', '.join(_CASES)}")
+	return spec
+
+
+class RuleSet:
+	'''
+	User-defined validation rules per column, e.g. from rules.toml:
+
+	  [columns."External Id"]
+	  pattern = "[A-Z0-9-]{1,20}"
+	  unique = true
+
+	  [columns."First Name"]
+	  builtin = false                       # allow accents and digits
+	  pattern = "[\\w' .-]+"
+	  case = "title"
+
+	Column names match headers case-insensitively. Rules are checked when
+	loaded and compiled into closures by compile() (see RingCentralCSV).
+	'''
+	def __init__(self, columns: dict[str, dict] | None = None, source: str = "<rules>"):
+		self.source = source
+		self.columns: dict[str, dict] = {}
+		for field, spec in (columns or {}).items():
+			self.columns[field.strip().casefold()] = _check_spec(field, spec, source)
+
+
+	@classmethod
+	def load(cls, path: str | Path | None = None) -> "RuleSet | None":
+		'''
+		Read a rules file. With no path, the default rules file is used if it
+		exists (None otherwise). Raises ValueError for a malformed file.
+		'''
+		if path is None:
+			if not DEFAULT_RULES_PATH.exists():
+				return None
+			path = DEFAULT_RULES_PATH
+		path = Path(path).expanduser()
+		try:
+			with path.open("rb") as f:
+				data = tomllib.load(f)
+		except FileNotFoundError:
+			raise FileNotFoundError(f"Rules file not found: {path}") from None
+		except tomllib.TOMLDecodeError as ex:
+			raise ValueError(f"{path}: {ex}") from None
+
+		unknown = set(data) - {"columns"}
+		if unknown:
+			raise ValueError(f"{path}: unknown section(s) {', '.join(sorted(unknown))} (expected [columns.\"<header>\"])")
+		rules = cls(data.get("columns", {}), source=str(path))
+		logger.info("Loaded %d column rule(s) from %s", len(rules.columns), path)
+		return rules
+
+
+	def compile(self, fieldnames: Iterable[str], builtin: Callable[[str, str], str]) -> dict[str, Callable[[str], str]]:
+		'''
+		One validator per column in fieldnames. builtin(field, value) is the
+		default rule, used as-is for columns without user rules.
+		'''
+		compiled = {}
+		for field in fieldnames:
+			default = (lambda f: lambda value: builtin(f, value))(field)
+			spec = self.columns.get(field.strip().casefold())
+			compiled[field] = compile_column(field, spec, default) if spec else default
+		return compiled
+
+
+	def digest(self) -> str:
+		'''
+		Hash of the checked rules (not the file bytes), so comments and key
+		order don't count as a change but any edited rule does.
+		'''
+		canonical = json.dumps(self.columns, sort_keys=True, separators=(",", ":"))
+		return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+	def unique_fields(self, fieldnames: Iterable[str]) -> list[str]:
+		return [f for f in fieldnames if self.columns.get(f.strip().casefold(), {}).get("unique")]
+
+
+class UniqueIndex:
+	'''
+	Value counts for a book's unique columns. Callers keep it in step with
+	the rows (add / remove / replace), so a uniqueness check is one dict
+	lookup per column instead of a rescan. Blank values are never counted.
+	'''
+	def __init__(self, fields: Iterable[str], rows: Iterable[dict] = ()):
+		self.fields = list(fields)
+		self.counts: dict[str, Counter] = {field: Counter() for field in self.fields}
+		if self.fields:
+			for row in rows:
+				self.add(row)
+
+
+	def add(self, row: dict) -> None:
+		for field in self.fields:
+			value = (row.get(field) or "").strip()
+			if value:
+				self.counts[field][value] += 1
+
+
+	def remove(self, row: dict) -> None:
+		for field in self.fields:
+			value = (row.get(field) or "").strip()
+			if value:
+				counter = self.counts[field]
+				counter[value] -= 1
+				if counter[value] <= 0:
+					del counter[value]
+
+
+	def replace(self, old: dict, new: dict) -> None:
+		self.remove(old)
+		self.add(new)
+
+
+	def conflicts(self, row: dict, replacing: dict | None = None) -> list[str]:
+		'''
+		Messages for every unique column where row's value is already taken.
+		replacing is the row being edited, whose own values don't count.
+		'''
+		found = []
+		for field in self.fields:
+			value = (row.get(field) or "").strip()
+			if not value:
+				continue
+			taken = self.counts[field][value]
+			if replacing is not None and (replacing.get(field) or "").strip() == value:
+				taken -= 1
+			if taken > 0:
+				found.append(f"{field}: {value!r} is already used by another row (must be unique)")
+		return found
+
+
+	def check(self, row: dict, replacing: dict | None = None) -> None:
+		found = self.conflicts(row, replacing=replacing)
+		if found:
+			raise ValueError("; ".join(found))
@@ -0,0 +1,492 @@
+#!/usr/bin/python
+
+# Import Libraries
+import os
+import re
+import json
+import time
+import asyncio
+from bisect import bisect_left
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+import logging
+
+from .columnar import is_columnar
+from .csv_helper import BulkAppendError, RingCentralCSV
+from .numbering import DEFAULT_REGION, normalise_number
+from .rules import RuleSet
+logger = logging.getLogger(__name__)
+
+
+# Columns whose words can be searched
+SEARCH_FIELDS = {"first name", "surname", "company", "email", "job title"}
+MAX_BODY_BYTES = 16 * 1024 * 1024
+MAX_LIMIT = 1000
+
+_WORDS = re.compile(r"\w+")
+
+
+class ServiceError(Exception):
+	'''
+	A request the service refuses; becomes an HTTP error response.
+	'''
+	def __init__(self, status: int, message: str, **extra):
+		self.status = status
+		self.extra = extra
+		super().__init__(message)
+
+
+def _whole_number(query: dict, name: str, default: int) -> int:
+	value = query.get(name)
+	if not value:
+		return default
+	try:
+		number = int(value)
+	except ValueError:
+		number = -1
+	if number < 0:
+		raise ServiceError(400, f"{name} must be a whole number, got {value!r}")
+	return number
+
+
+class BookService:
+	'''
+	One book loaded into memory with warm indexes, for serve():
+
+	- rows:     every row, normalised where valid (invalid rows are kept as
+	            read, so an export never drops contacts, and listed in stats)
+	- numbers:  phone number -> first (row, column), as number_index(),
+	            plus shared for numbers already duplicated in the file
+	- words:    search word -> row indexes, plus a sorted word list for
+	            prefix search
+	- unique:   counts for the rules' unique columns (UniqueIndex)
+
+	Reads run on the event loop between awaits, so they always see a
+	consistent book. append() and export() take write_lock, so writes are
+	applied one at a time and an export never sees half an append.
+	'''
+	def __init__(
+		self,
+		book_path: str | Path,
+		region: str = DEFAULT_REGION,
+		rules: RuleSet | None = None,
+		out_path: str | Path | None = None,
+	):
+		self.book_path = Path(book_path).expanduser()
+		self.out_path = Path(out_path).expanduser() if out_path else self.book_path.with_name(
+			f"{self.book_path.stem}.served{self.book_path.suffix}"
+		)
+		self.rc = RingCentralCSV(region=region, rules=rules)
+		self.rows: list[dict] = []
+		self.invalid: list[dict] = []
+		self.numbers: dict[str, tuple[int, str]] = {}
+		# Every (row, column) of numbers the book already holds more than once
+		self.shared: dict[str, list[tuple[int, str]]] = {}
+		self.words: dict[str, set[int]] = {}
+		self._sorted_words: list[str] = []
+		self.duplicates = 0
+		self.appended = 0
+		self.exports = 0
+		self.loaded_s = 0.0
+		self.write_lock: asyncio.Lock | None = None
+
+
+	def load(self) -> None:
+		'''
+		Read and normalise the book and build every index. Blocking.
+		'''
+		started = time.perf_counter()
+		rc = self.rc
+		if is_columnar(self.book_path):
+			raw_rows = rc.columnar_checker(str(self.book_path))
+		else:
+			raw_rows = rc.parallel_checker(str(self.book_path))
+
+		rows, invalid = [], []
+		if rc.normalised:
+			# Cleaned under this region and these rules already
+			rows = raw_rows
+		else:
+			for n, raw in enumerate(raw_rows, start=1):
+				try:
+					rows.append(rc.normalise_row(raw))
+				except ValueError as ex:
+					rows.append(raw)
+					invalid.append({"row": n, "error": str(ex)})
+		self.rows, self.invalid = rows, invalid
+
+		self.numbers = rc.number_index(rows)
+		dups = rc.find_duplicate_numbers(rows)
+		self.duplicates = len(dups)
+		self.shared = {}
+		for number, first_i, first_field, dup_i, dup_field in dups:
+			self.shared.setdefault(number, [(first_i, first_field)]).append((dup_i, dup_field))
+		rc.unique = None
+		rc.unique_index(rows)
+		self.words = {}
+		for i, row in enumerate(rows):
+			self._index_words(i, row)
+		self._sorted_words = sorted(self.words)
+		self.loaded_s = round(time.perf_counter() - started, 3)
+		logger.info(
+			"Service loaded %s: %d rows (%d invalid, %d duplicate numbers) in %.2fs",
+			self.book_path, len(rows), len(invalid), self.duplicates, self.loaded_s,
+		)
+
+
+	def _index_words(self, i: int, row: dict) -> list[str]:
+		new = []
+		for key, value in row.items():
+			if (key or "").strip().casefold() not in SEARCH_FIELDS or not value:
+				continue
+			for word in _WORDS.findall(value.casefold()):
+				postings = self.words.get(word)
+				if postings is None:
+					self.words[word] = postings = set()
+					new.append(word)
+				postings.add(i)
+		return new
+
+
+	def _contact(self, i: int) -> dict:
+		return {"row": i + 1, **self.rows[i]}
+
+
+	# ---- reads
+
+	def stats(self) -> dict:
+		return {
+			"book": str(self.book_path),
+			"format": self.rc.csv_format.describe() if self.rc.csv_format else None,
+			"region": self.rc.region,
+			"fieldnames": self.rc.fieldnames,
+			"rows": len(self.rows),
+			"invalid_rows": len(self.invalid),
+			"invalid": self.invalid[:100],
+			"duplicate_numbers": self.duplicates,
+			"indexed_numbers": len(self.numbers),
+			"indexed_words": len(self.words),
+			"appended": self.appended,
+			"exports": self.exports,
+			"export_path": str(self.out_path),
+			"load_s": self.loaded_s,
+		}
+
+
+	def validate(self, raw: dict) -> dict:
+		'''
+		Check a contact against the field rules and the book (duplicate
+		numbers, unique columns) without adding it.
+		'''
+		if not isinstance(raw, dict):
+			raise ServiceError(400, "Each row must be a JSON object of column: value")
+		try:
+			cleaned = self.rc.normalise_row(raw)
+		except ValueError as ex:
+			return {"valid": False, "errors": [str(ex)]}
+
+		errors, seen = [], {}
+		for key, value in cleaned.items():
+			if not value or not self.rc._is_phone_field(key):
+				continue
+			if value in seen:
+				errors.append(f"Duplicate number inside row: {value} in {seen[value]} and {key}")
+			elif value in self.numbers:
+				other_i, other_field = self.numbers[value]
+				errors.append(f"{value} ({key}) already in row {other_i+1} ({other_field})")
+			seen[value] = key
+		errors.extend(self.rc.unique_index(self.rows).conflicts(cleaned))
+		return {"valid": not errors, "row": cleaned, "errors": errors}
+
+
+	def lookup(self, number: str) -> dict:
+		'''
+		Rows holding number, which is normalised with the book's region first.
+		'''
+		try:
+			normalised = normalise_number(number, self.rc.region)
+		except ValueError as ex:
+			raise ServiceError(400, f"{number!r}: {ex}") from None
+		holders = self.shared.get(normalised)
+		if holders is None:
+			holders = [self.numbers[normalised]] if normalised in self.numbers else []
+		matches = [{"field": field, **self._contact(i)} for i, field in holders]
+		return {"number": normalised, "found": bool(matches), "matches": matches}
+
+
+	def search(self, query: str, limit: int = 20) -> dict:
+		'''
+		Rows where every word of query starts a word in a name, company,
+		email or job title column, in book order.
+		'''
+		terms = _WORDS.findall(query.casefold())
+		if not terms:
+			raise ServiceError(400, "q must contain at least one letter or digit")
+		found: set[int] | None = None
+		for term in terms:
+			matches: set[int] = set()
+			pos = bisect_left(self._sorted_words, term)
+			while pos < len(self._sorted_words) and self._sorted_words[pos].startswith(term):
+				matches |= self.words[self._sorted_words[pos]]
+				pos += 1
+			found = matches if found is None else found & matches
+			if not found:
+				break
+		hits = sorted(found or ())
+		return {"query": query, "total": len(hits), "matches": [self._contact(i) for i in hits[:limit]]}
+
+
+	def page(self, offset: int, limit: int) -> dict:
+		return {
+			"total": len(self.rows),
+			"offset": offset,
+			"rows": [self._contact(i) for i in range(offset, min(offset + limit, len(self.rows)))],
+		}
+
+
+	# ---- writes
+
+	async def append(self, raw_rows: list) -> dict:
+		'''
+		All-or-nothing append (see RingCentralCSV.append_rows); the indexes
+		are updated in place rather than rebuilt.
+		'''
+		if not isinstance(raw_rows, list) or not all(isinstance(r, dict) for r in raw_rows):
+			raise ServiceError(400, "rows must be a list of JSON objects")
+		async with self.write_lock:
+			base = len(self.rows)
+			try:
+				added = self.rc.append_rows(self.rows, raw_rows, index=self.numbers)
+			except BulkAppendError as ex:
+				raise ServiceError(
+					422, str(BulkAppendError(ex.errors, limit=20)),
+					errors=[{"row": n, "error": msg} for n, msg in ex.errors],
+				) from None
+			new_words = []
+			for i in range(base, len(self.rows)):
+				new_words.extend(self._index_words(i, self.rows[i]))
+			if new_words:
+				self._sorted_words = sorted(self._sorted_words + new_words)
+			self.appended += len(added)
+		logger.info("Service appended %d rows (now %d)", len(added), len(self.rows))
+		return {"added": len(added), "rows": [self._contact(i) for i in range(base, base + len(added))]}
+
+
+	def export_target(self, path: str | None = None) -> Path:
+		'''
+		Where an export goes: out_path, or path taken relative to out_path's
+		folder. Anything resolving outside that folder (absolute paths, "..",
+		symlinks) is refused, so a client can't overwrite other files; so is
+		the book itself.
+		'''
+		if not path:
+			return self.out_path
+		base = self.out_path.parent.resolve()
+		out = (base / path).resolve()
+		if out == base or not out.is_relative_to(base):
+			raise ServiceError(400, f"Export path must be a file inside {base}")
+		if out == self.book_path.resolve():
+			raise ServiceError(400, "Export path can't be the served book itself")
+		return out
+
+
+	async def export(self, path: str | None = None, keep_format: bool = False) -> dict:
+		'''
+		Write the book to export_target(path) via a temporary file, so
+		readers of it never see a partial file. The write runs in a thread;
+		lookups keep being answered meanwhile, appends wait for it.
+		'''
+		out = self.export_target(path)
+		async with self.write_lock:
+			rows = list(self.rows)
+			# Same suffix, so the writers pick the same format
+			tmp = out.with_name(f".{out.stem}.tmp{out.suffix}")
+
+			def write() -> None:
+				if is_columnar(out):
+					self.rc.columnar_writer(self.rc.fieldnames, rows, tmp, normalise=False)
+				else:
+					fmt = self.rc.csv_format if keep_format else None
+					self.rc.writer(self.rc.fieldnames, rows, out_path=tmp, csv_format=fmt)
+				os.replace(tmp, out)
+
+			try:
+				await asyncio.to_thread(write)
+			except (OSError, ImportError, ValueError) as ex:
+				raise ServiceError(500, f"Export failed: {ex}") from None
+			self.exports += 1
+		logger.info("Service exported %d rows to %s", len(rows), out)
+		return {"path": str(out), "rows": len(rows)}
+
+
+class ServiceServer:
+	'''
+	Minimal HTTP/1.1 + JSON front end for a BookService on asyncio streams
+	(keep-alive, Content-Length bodies). Routes:
+
+	  GET  /stats
+	  GET  /lookup?number=0412 345 678
+	  GET  /search?q=smi&limit=20
+	  GET  /rows?offset=0&limit=100
+	  POST /validate   {"row": {...}} or {"rows": [{...}, ...]}
+	  POST /append     {"rows": [{...}, ...]}
+	  POST /export     {"path": "...", "keep_format": false}  (both optional;
+	                   path is relative to the export folder)
+
+	Errors come back as {"error": "..."} with a 4xx/5xx status. If token is
+	set, every request needs "Authorization: Bearer <token>".
+	'''
+	def __init__(self, service: BookService, host: str = "127.0.0.1", port: int = 8765, token: str | None = None):
+		self.service = service
+		self.host = host
+		self.port = port
+		self.token = token
+		self.requests = 0
+		self._server: asyncio.AbstractServer | None = None
+		self._routes = {
+			("GET", "/stats"): self._stats,
+			("GET", "/lookup"): self._lookup,
+			("GET", "/search"): self._search,
+			("GET", "/rows"): self._rows,
+			("POST", "/validate"): self._validate,
+			("POST", "/append"): self._append,
+			("POST", "/export"): self._export,
+		}
+
+
+	@property
+	def url(self) -> str:
+		return f"http://{self.host}:{self.port}"
+
+
+	async def start(self) -> None:
+		self.service.write_lock = asyncio.Lock()
+		self._server = await asyncio.start_server(self._handle, self.host, self.port)
+		# Port 0 picks a free port
+		self.port = self._server.sockets[0].getsockname()[1]
+		logger.info("Service listening on %s", self.url)
+
+
+	async def serve_forever(self) -> None:
+		if self._server is None:
+			await self.start()
+		async with self._server:
+			await self._server.serve_forever()
+
+
+	async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+		try:
+			while True:
+				request_line = await reader.readline()
+				if not request_line.strip():
+					break
+				headers: dict[str, str] = {}
+				while True:
+					line = await reader.readline()
+					if line in (b"\r\n", b"\n", b""):
+						break
+					key, _, value = line.decode("latin-1").partition(":")
+					headers[key.strip().lower()] = value.strip()
+
+				try:
+					method, target, version = request_line.decode("latin-1").split()
+					length = int(headers.get("content-length") or 0)
+					if length < 0:
+						raise ValueError(length)
+				except ValueError:
+					await self._reply(writer, 400, {"error": "Malformed request"}, keep_alive=False)
+					break
+				if length > MAX_BODY_BYTES:
+					await self._reply(writer, 413, {"error": f"Body over {MAX_BODY_BYTES} bytes"}, keep_alive=False)
+					break
+				body = await reader.readexactly(length) if length else b""
+
+				keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+				status, payload = await self._dispatch(method, target, headers, body)
+				await self._reply(writer, status, payload, keep_alive)
+				if not keep_alive:
+					break
+		except (ConnectionError, asyncio.IncompleteReadError):
+			pass
+		finally:
+			writer.close()
+
+
+	async def _reply(self, writer: asyncio.StreamWriter, status: int, payload: dict, keep_alive: bool) -> None:
+		body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+		reason = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found", 405: "Method Not Allowed",
+			413: "Payload Too Large", 422: "Unprocessable Entity", 500: "Internal Server Error"}.get(status, "")
+		head = (
+			f"HTTP/1.1 {status} {reason}\r\n"
+			"Content-Type: application/json; charset=utf-8\r\n"
+			f"Content-Length: {len(body)}\r\n"
+			f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+		)
+		writer.write(head.encode("latin-1") + body)
+		await writer.drain()
+
+
+	async def _dispatch(self, method: str, target: str, headers: dict, body: bytes) -> tuple[int, dict]:
+		self.requests += 1
+		parts = urlsplit(target)
+		route = self._routes.get((method, parts.path.rstrip("/") or "/"))
+		try:
+			if self.token and headers.get("authorization") != f"Bearer {self.token}":
+				raise ServiceError(401, "Authorization required")
+			if route is None:
+				if any(path == parts.path.rstrip("/") for _method, path in self._routes):
+					raise ServiceError(405, f"{method} not allowed on {parts.path}")
+				raise ServiceError(404, f"No such endpoint: {parts.path}")
+			query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+			data = {}
+			if body:
+				try:
+					data = json.loads(body)
+				except ValueError as ex:
+					raise ServiceError(400, f"Body is not valid JSON: {ex}") from None
+				if not isinstance(data, dict):
+					raise ServiceError(400, "Body must be a JSON object")
+			return 200, await route(query, data)
+		except ServiceError as ex:
+			return ex.status, {"error": str(ex), **ex.extra}
+		except Exception as ex:  # noqa: BLE001 - keep serving
+			logger.exception("Service error on %s %s", method, target)
+			return 500, {"error": f"{type(ex).__name__}: {ex}"}
+
+
+	async def _stats(self, query: dict, data: dict) -> dict:
+		return {**self.service.stats(), "requests": self.requests}
+
+
+	async def _lookup(self, query: dict, data: dict) -> dict:
+		if not query.get("number"):
+			raise ServiceError(400, "number is required")
+		return self.service.lookup(query["number"])
+
+
+	async def _search(self, query: dict, data: dict) -> dict:
+		limit = min(_whole_number(query, "limit", 20), MAX_LIMIT)
+		return self.service.search(query.get("q", ""), limit)
+
+
+	async def _rows(self, query: dict, data: dict) -> dict:
+		limit = min(_whole_number(query, "limit", 100), MAX_LIMIT)
+		return self.service.page(_whole_number(query, "offset", 0), limit)
+
+
+	async def _validate(self, query: dict, data: dict) -> dict:
+		if "rows" in data:
+			if not isinstance(data["rows"], list):
+				raise ServiceError(400, "rows must be a list of JSON objects")
+			return {"results": [self.service.validate(row) for row in data["rows"]]}
+		if "row" in data:
+			return self.service.validate(data["row"])
+		raise ServiceError(400, 'Expected {"row": {...}} or {"rows": [...]}')
+
+
+	async def _append(self, query: dict, data: dict) -> dict:
+		return await self.service.append(data.get("rows"))
+
+
+	async def _export(self, query: dict, data: dict) -> dict:
+		return await self.service.export(data.get("path"), bool(data.get("keep_format")))
@@ -0,0 +1,203 @@
+#!/usr/bin/python
+
+# Import Libraries
+import io
+import re
+import csv
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+import logging
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_TEMPLATE = "AddressBook-{index:03d}.csv"
+DEFAULT_ROUTED_TEMPLATE = "AddressBook-{key}-{part:03d}.csv"
+MANIFEST_NAME = "manifest.json"
+
+
+def _safe_key(value: str) -> str:
+	'''
+	Make a routing value usable in a filename ("Acme Pty/Ltd" -> "Acme-Pty-Ltd").
+	'''
+	key = re.sub(r"[^A-Za-z0-9._-]+", "-", value.strip()).strip("-.")
+	return key or "blank"
+
+
+def _file_keys(values: list[str]) -> dict[str, str]:
+	'''
+	A filename-safe key per distinct routing value. Keys are compared
+	case-insensitively, as Windows and macOS filenames are: when two values
+	map to the same key ("Acme/Ltd" and "Acme Ltd", or "Acme" and "acme"),
+	the later ones get a short hash of the raw value appended.
+	'''
+	keys: dict[str, str] = {}
+	taken: set[str] = set()
+	for value in values:
+		key = _safe_key(value)
+		if key.casefold() in taken:
+			key = f"{key}-{hashlib.sha1(value.encode('utf-8')).hexdigest()[:8]}"
+		taken.add(key.casefold())
+		keys[value] = key
+	return keys
+
+
+def _unique_name(name: str, taken: set[str]) -> str:
+	'''
+	name, or name with "-2", "-3", ... before its suffix if a file with the
+	same name (ignoring case) is already planned.
+	'''
+	path = Path(name)
+	n = 1
+	while name.casefold() in taken:
+		n += 1
+		name = f"{path.stem}-{n}{path.suffix}"
+	taken.add(name.casefold())
+	return name
+
+
+def plan_shards(
+	fieldnames: list[str],
+	rows: list[dict],
+	max_rows: int | None = None,
+	max_bytes: int | None = None,
+	route_by: str | None = None,
+) -> tuple[str, list[tuple[str, list[str]]]]:
+	'''
+	Render every row once and cut the output into shards.
+	Returns (header_line, [(route_key, row_lines), ...]) in output order.
+	A shard closes when adding the next row would pass max_rows or max_bytes
+	(header included). A single row bigger than max_bytes gets a shard of its own.
+	'''
+	buf = io.StringIO()
+	writer = csv.DictWriter(buf, fieldnames=fieldnames, extrasaction="ignore")
+	writer.writeheader()
+	header = buf.getvalue()
+	header_bytes = len(header.encode("utf-8"))
+
+	groups: dict[str, list[dict]] = {}
+	if route_by:
+		for row in rows:
+			groups.setdefault((row.get(route_by) or "").strip(), []).append(row)
+	else:
+		groups[""] = rows
+
+	shards: list[tuple[str, list[str]]] = []
+	for key, group in groups.items():
+		lines: list[str] = []
+		size = header_bytes
+		for row in group:
+			buf.seek(0)
+			buf.truncate()
+			writer.writerow(row)
+			line = buf.getvalue()
+			line_bytes = len(line.encode("utf-8"))
+
+			full = lines and (
+				(max_rows is not None and len(lines) >= max_rows)
+				or (max_bytes is not None and size + line_bytes > max_bytes)
+			)
+			if full:
+				shards.append((key, lines))
+				lines, size = [], header_bytes
+			if max_bytes is not None and header_bytes + line_bytes > max_bytes:
+				logger.warning("Row larger than max_bytes (%d bytes); writing it to its own shard", line_bytes)
+			lines.append(line)
+			size += line_bytes
+		if lines:
+			shards.append((key, lines))
+	if not shards:
+		# An empty book still produces one header-only file
+		shards.append(("", []))
+	return header, shards
+
+
+def _write_shard(path: Path, header: str, lines: list[str]) -> tuple[int, str]:
+	'''
+	Worker: write one shard and return (bytes, sha256 hex digest).
+	'''
+	data = (header + "".join(lines)).encode("utf-8")
+	path.write_bytes(data)
+	return len(data), hashlib.sha256(data).hexdigest()
+
+
+def write_shards(
+	fieldnames: list[str],
+	rows: list[dict],
+	out_dir: str | Path,
+	max_rows: int | None = None,
+	max_bytes: int | None = None,
+	name_template: str | None = None,
+	route_by: str | None = None,
+	workers: int = 4,
+) -> Path:
+	'''
+	Split rows into several import files, each carrying the full header, and
+	write them concurrently. Returns the path of manifest.json, which lists
+	every shard with its row count, byte size and SHA-256.
+
+	name_template fields: {index} (1-based, across all shards), {key} (the
+	route_by value, filename-safe) and {part} (1-based within that key).
+	Names that would clash, ignoring case, get a counter ("-2") added.
+	Every shard goes directly into out_dir: a template with a path
+	separator raises ValueError.
+	'''
+	if max_rows is not None and max_rows < 1:
+		raise ValueError("max_rows must be at least 1")
+	if name_template is not None and ("/" in name_template or "\\" in name_template):
+		raise ValueError(f"Shard name template {name_template!r} must be a file name, not a path (use out_dir for the folder)")
+	if route_by and route_by not in fieldnames:
+		raise ValueError(f"Unknown routing column: {route_by}")
+	template = name_template or (DEFAULT_ROUTED_TEMPLATE if route_by else DEFAULT_TEMPLATE)
+
+	out_dir = Path(out_dir).expanduser()
+	out_dir.mkdir(parents=True, exist_ok=True)
+
+	header, shards = plan_shards(fieldnames, rows, max_rows=max_rows, max_bytes=max_bytes, route_by=route_by)
+
+	file_keys = _file_keys(list(dict.fromkeys(key for key, _lines in shards)))
+	parts: dict[str, int] = {}
+	names: list[str] = []
+	taken: set[str] = {MANIFEST_NAME}
+	for index, (key, _lines) in enumerate(shards, start=1):
+		parts[key] = parts.get(key, 0) + 1
+		try:
+			name = template.format(index=index, key=file_keys[key], part=parts[key])
+		except (KeyError, IndexError, ValueError) as ex:
+			raise ValueError(f"Bad shard name template {template!r}: {ex}") from None
+		if name.strip(".") == "":
+			raise ValueError(f"Shard name template {template!r} gives no file name")
+		# e.g. a template without {index} / {part}: never overwrite a shard
+		names.append(_unique_name(name, taken))
+
+	logger.info("Writing %d rows into %d shards in %s", len(rows), len(shards), out_dir)
+	with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+		results = list(pool.map(
+			lambda job: _write_shard(out_dir / job[0], header, job[1][1]),
+			zip(names, shards),
+		))
+
+	manifest = {
+		"created": datetime.now().isoformat(timespec="seconds"),
+		"fieldnames": fieldnames,
+		"route_by": route_by,
+		"max_rows": max_rows,
+		"max_bytes": max_bytes,
+		"total_rows": len(rows),
+		"shards": [
+			{
+				"file": name,
+				"key": key if route_by else None,
+				"rows": len(lines),
+				"bytes": size,
+				"sha256": digest,
+			}
+			for name, (key, lines), (size, digest) in zip(names, shards, results)
+		],
+	}
+	manifest_path = out_dir / MANIFEST_NAME
+	manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+	logger.info("Shard manifest written: %s", manifest_path)
+	return manifest_path
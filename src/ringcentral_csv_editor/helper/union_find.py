@@ -0,0 +1,49 @@
+#!/usr/bin/python
+
+# Import Libraries
+import logging
+logger = logging.getLogger(__name__)
+
+
+class UnionFind:
+	'''
+	Disjoint-set forest over the integers 0..size-1.
+	Union by size with path halving, so a run of unions/finds is near-linear.
+	'''
+	def __init__(self, size: int):
+		self.parent = list(range(size))
+		self.size = [1] * size
+
+
+	def find(self, i: int) -> int:
+		parent = self.parent
+		while parent[i] != i:
+			parent[i] = parent[parent[i]]
+			i = parent[i]
+		return i
+
+
+	def union(self, a: int, b: int) -> int:
+		'''
+		Merge the sets holding a and b. Returns the root of the merged set.
+		'''
+		ra, rb = self.find(a), self.find(b)
+		if ra == rb:
+			return ra
+		if self.size[ra] < self.size[rb]:
+			ra, rb = rb, ra
+		self.parent[rb] = ra
+		self.size[ra] += self.size[rb]
+		return ra
+
+
+	def groups(self, min_size: int = 2) -> list[list[int]]:
+		'''
+		Return every set with at least min_size members as a sorted list of
+		members, ordered by their smallest member.
+		'''
+		by_root: dict[int, list[int]] = {}
+		for i in range(len(self.parent)):
+			if self.size[self.find(i)] >= min_size:
+				by_root.setdefault(self.find(i), []).append(i)
+		return sorted(by_root.values(), key=lambda members: members[0])
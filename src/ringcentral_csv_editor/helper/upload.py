@@ -0,0 +1,360 @@
+#!/usr/bin/python
+
+# Import Libraries
+import os
+import json
+import time
+import queue
+import random
+import asyncio
+import hashlib
+import threading
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+from urllib.parse import urlsplit
+import logging
+logger = logging.getLogger(__name__)
+
+
+# CSV header -> RingCentral personal contact field
+CONTACT_FIELDS = {
+	"first name": "firstName",
+	"surname": "lastName",
+	"job title": "jobTitle",
+	"company": "company",
+	"email": "email",
+	"home number": "homePhone",
+	"business number": "businessPhone",
+	"mobile number": "mobilePhone",
+	"company main number": "companyPhone",
+	"external id": "externalId",
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class UploadError(RuntimeError):
+	'''
+	A batch was rejected for good (4xx other than 429), or retries ran out.
+	'''
+	def __init__(self, batch: int, status: int | None, detail: str):
+		self.batch = batch
+		self.status = status
+		super().__init__(f"Batch {batch + 1} failed ({status or 'no response'}): {detail}")
+
+
+def target_key(url: str, token: str | None = None) -> str:
+	'''
+	Short hash of the endpoint URL and token, so resume state kept for one
+	target (URL or account) is never applied to another. The token itself is
+	never written anywhere.
+	'''
+	parts = urlsplit(url)
+	normalised = f"{parts.scheme}://{(parts.netloc or '').lower()}{parts.path.rstrip('/')}"
+	return hashlib.sha256(f"{normalised}\n{token or ''}".encode("utf-8")).hexdigest()[:12]
+
+
+def row_to_contact(row: dict) -> dict:
+	'''
+	Map one CSV row to a contact payload, skipping blank cells and columns
+	the API has no field for.
+	'''
+	contact = {}
+	for key, value in row.items():
+		name = CONTACT_FIELDS.get((key or "").strip().casefold())
+		value = (value or "").strip()
+		if name and value:
+			contact[name] = value
+	return contact
+
+
+class ConnectionPool:
+	'''
+	Fixed-size pool of keep-alive HTTP(S) connections to one host.
+	Connections are created lazily and replaced when the server drops them.
+	'''
+	def __init__(self, base_url: str, size: int = 4, timeout: float = 30.0):
+		parts = urlsplit(base_url)
+		if parts.scheme not in ("http", "https") or not parts.hostname:
+			raise ValueError(f"Expected an http(s):// URL, got: {base_url}")
+		self.scheme = parts.scheme
+		self.host = parts.hostname
+		self.port = parts.port
+		self.base_path = parts.path.rstrip("/")
+		self.timeout = timeout
+		self._idle: queue.LifoQueue = queue.LifoQueue()
+		self._slots = threading.BoundedSemaphore(max(1, size))
+		self.opened = 0
+
+
+	def _connect(self) -> http.client.HTTPConnection:
+		self.opened += 1
+		if self.scheme == "https":
+			return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+		return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+
+	def request(self, method: str, path: str, body: bytes, headers: dict) -> tuple[int, dict, bytes]:
+		'''
+		Blocking request on a pooled connection. Returns (status, headers, body).
+		Headers are returned with lower-case names.
+		'''
+		with self._slots:
+			try:
+				conn, reused = self._idle.get_nowait(), True
+			except queue.Empty:
+				conn, reused = self._connect(), False
+			while True:
+				try:
+					conn.request(method, self.base_path + path, body=body, headers=headers)
+					resp = conn.getresponse()
+					data = resp.read()
+					break
+				except (OSError, http.client.HTTPException):
+					conn.close()
+					if not reused:
+						raise
+					# The server closed an idle keep-alive connection; retry once on a fresh one
+					conn, reused = self._connect(), False
+			if resp.will_close:
+				conn.close()
+			else:
+				self._idle.put(conn)
+			return resp.status, {k.lower(): v for k, v in resp.getheaders()}, data
+
+
+	def close(self) -> None:
+		while True:
+			try:
+				self._idle.get_nowait().close()
+			except queue.Empty:
+				return
+
+
+class BulkUploader:
+	'''
+	Push rows to a contacts endpoint in batches of batch_size, with at most
+	concurrency requests in flight over a pool of keep-alive connections.
+
+	- 429 and 5xx responses (and dropped connections) are retried with
+	  exponential backoff and jitter; a 429's Retry-After pauses every worker,
+	  not just the one that hit it.
+	- Each batch carries an Idempotency-Key derived from its contents, so a
+	  batch sent twice (e.g. after a resume) is only stored once.
+	- If state_path is given, the number of batches acknowledged in order is
+	  saved there after every batch; upload() resumes from it and deletes it
+	  once everything is sent. The state is tied to the rows, batch size and
+	  target (URL and token, see target_key); state for another target is
+	  ignored and the upload starts from batch 0.
+
+	Request body: {"batch": <0-based index>, "contacts": [<contact>, ...]}
+	'''
+	def __init__(
+		self,
+		url: str,
+		token: str | None = None,
+		batch_size: int = 100,
+		concurrency: int = 4,
+		max_retries: int = 5,
+		backoff: float = 0.5,
+		timeout: float = 30.0,
+		state_path: str | Path | None = None,
+	):
+		if batch_size < 1:
+			raise ValueError("batch_size must be at least 1")
+		self.pool = ConnectionPool(url, size=concurrency, timeout=timeout)
+		self.token = token
+		self.target = target_key(url, token)
+		self.batch_size = batch_size
+		self.concurrency = max(1, concurrency)
+		self.max_retries = max(0, max_retries)
+		self.backoff = backoff
+		self.state_path = Path(state_path).expanduser() if state_path else None
+		self._resume_at = 0.0
+		self._executor: ThreadPoolExecutor | None = None
+
+
+	def _batches(self, rows: list[dict]) -> list[bytes]:
+		return [
+			json.dumps(
+				{"batch": n, "contacts": [row_to_contact(r) for r in rows[i:i + self.batch_size]]},
+				separators=(",", ":"),
+			).encode("utf-8")
+			for n, i in enumerate(range(0, len(rows), self.batch_size))
+		]
+
+
+	def _fingerprint(self, bodies: list[bytes]) -> str:
+		digest = hashlib.sha256(self.target.encode("ascii"))
+		for body in bodies:
+			digest.update(hashlib.sha256(body).digest())
+		return digest.hexdigest()
+
+
+	def load_state(self, fingerprint: str) -> int:
+		'''
+		Number of batches already acknowledged for these rows (0 if none).
+		State saved for another target counts as none. Raises ValueError if the
+		state file belongs to different rows/batch size.
+		'''
+		if not self.state_path or not self.state_path.exists():
+			return 0
+		state = json.loads(self.state_path.read_text(encoding="utf-8"))
+		if state.get("target") != self.target:
+			logger.info("Upload state %s is for another target; starting from batch 1", self.state_path)
+			return 0
+		if state.get("fingerprint") != fingerprint or state.get("batch_size") != self.batch_size:
+			raise ValueError(
+				f"Upload state {self.state_path} is for different rows or batch size; delete it (or use restart) to start over."
+			)
+		return int(state.get("acked", 0))
+
+
+	def _save_state(self, fingerprint: str, acked: int, total: int) -> None:
+		tmp = self.state_path.with_name(self.state_path.name + ".tmp")
+		tmp.write_text(
+			json.dumps({"target": self.target, "fingerprint": fingerprint, "batch_size": self.batch_size, "acked": acked, "batches": total}),
+			encoding="utf-8",
+		)
+		os.replace(tmp, self.state_path)
+
+
+	def _headers(self, body: bytes) -> dict:
+		headers = {
+			"Content-Type": "application/json",
+			"Accept": "application/json",
+			"Idempotency-Key": hashlib.sha256(body).hexdigest(),
+		}
+		if self.token:
+			headers["Authorization"] = f"Bearer {self.token}"
+		return headers
+
+
+	def _delay(self, attempt: int, retry_after: str | None) -> float:
+		if retry_after:
+			try:
+				return max(0.0, float(retry_after))
+			except ValueError:
+				pass
+		return self.backoff * (2 ** attempt) * (0.5 + random.random())
+
+
+	async def _send(self, n: int, body: bytes, stats: dict) -> None:
+		headers = self._headers(body)
+		loop = asyncio.get_running_loop()
+		status, detail = None, ""
+		for attempt in range(self.max_retries + 1):
+			# Honour a Retry-After another worker received
+			wait = self._resume_at - time.monotonic()
+			if wait > 0:
+				await asyncio.sleep(wait)
+
+			retry_after = None
+			try:
+				status, resp_headers, data = await loop.run_in_executor(
+					self._executor, self.pool.request, "POST", "", body, headers,
+				)
+				detail = data[:200].decode("utf-8", "replace")
+				retry_after = resp_headers.get("retry-after")
+			except (OSError, http.client.HTTPException) as ex:
+				status, detail = None, f"{type(ex).__name__}: {ex}"
+
+			if status is not None and 200 <= status < 300:
+				return
+			if status is not None and status not in RETRY_STATUSES:
+				raise UploadError(n, status, detail)
+			if attempt == self.max_retries:
+				break
+
+			delay = self._delay(attempt, retry_after)
+			stats["retries"] += 1
+			if status == 429:
+				stats["rate_limited"] += 1
+				self._resume_at = max(self._resume_at, time.monotonic() + delay)
+			logger.debug("Batch %d: %s, retrying in %.2fs", n + 1, status or detail, delay)
+			await asyncio.sleep(delay)
+		raise UploadError(n, status, detail)
+
+
+	async def _upload(self, bodies: list[bytes], start: int, fingerprint: str, stats: dict, progress) -> None:
+		semaphore = asyncio.Semaphore(self.concurrency)
+		done: set[int] = set()
+		acked = start
+		failed = False
+
+		async def worker(n: int, body: bytes) -> None:
+			nonlocal acked, failed
+			async with semaphore:
+				# A batch queued behind one that just failed for good is not sent
+				if failed:
+					return
+				try:
+					await self._send(n, body, stats)
+				except BaseException:
+					failed = True
+					raise
+			done.add(n)
+			stats["batches_sent"] += 1
+			# Advance the in-order watermark; only that is safe to resume from
+			while acked in done:
+				done.discard(acked)
+				acked += 1
+			if self.state_path:
+				self._save_state(fingerprint, acked, len(bodies))
+			if progress:
+				progress(acked, len(bodies))
+
+		tasks = [asyncio.create_task(worker(n, bodies[n])) for n in range(start, len(bodies))]
+		try:
+			await asyncio.gather(*tasks)
+		except BaseException:
+			for task in tasks:
+				task.cancel()
+			await asyncio.gather(*tasks, return_exceptions=True)
+			raise
+		finally:
+			stats["acked"] = acked
+
+
+	def upload(self, rows: list[dict], restart: bool = False, progress: Callable[[int, int], None] | None = None) -> dict:
+		'''
+		Upload rows, resuming from the saved state unless restart is set.
+		progress(acked_batches, total_batches) is called after every batch.
+		Returns throughput stats. Raises UploadError when a batch fails; the
+		state file then holds the last in-order acknowledged batch.
+		'''
+		bodies = self._batches(rows)
+		fingerprint = self._fingerprint(bodies)
+		start = 0 if restart else self.load_state(fingerprint)
+		if start:
+			logger.info("Resuming upload at batch %d of %d", start + 1, len(bodies))
+
+		stats = {
+			"rows": len(rows),
+			"batches": len(bodies),
+			"skipped_batches": start,
+			"batches_sent": 0,
+			"acked": start,
+			"retries": 0,
+			"rate_limited": 0,
+		}
+		started = time.perf_counter()
+		# One thread per in-flight request; http.client is blocking
+		self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="upload")
+		try:
+			asyncio.run(self._upload(bodies, start, fingerprint, stats, progress))
+		finally:
+			self._executor.shutdown(wait=True)
+			self.pool.close()
+			elapsed = time.perf_counter() - started
+			sent_rows = min(len(rows), stats["acked"] * self.batch_size) - start * self.batch_size
+			stats["connections"] = self.pool.opened
+			stats["elapsed_s"] = round(elapsed, 3)
+			stats["rows_per_s"] = round(sent_rows / elapsed, 1) if elapsed > 0 else 0.0
+			logger.info("Upload stats: %s", stats)
+
+		if self.state_path and self.state_path.exists():
+			self.state_path.unlink()
+		return stats
@@ -0,0 +1,245 @@
+#!/usr/bin/python
+
+# Import Libraries
+import json
+import time
+import shutil
+import signal
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+import logging
+
+from .csv_helper import RingCentralCSV
+from .numbering import DEFAULT_REGION
+from .rules import RuleSet
+logger = logging.getLogger(__name__)
+
+
+PROCESSED_DIR = "processed"
+FAILED_DIR = "failed"
+
+
+def process_file(in_path: str, out_dir: str, region: str = DEFAULT_REGION, rules_path: str | None = None) -> dict:
+	'''
+	Worker: read one dropped CSV, normalise every row, report duplicates and
+	write <stem>.cleaned.csv + <stem>.report.json into out_dir.
+	Rows that fail validation are left out of the cleaned file and listed in
+	the report. Every row number in the report is the row's 1-based position
+	among the input's data rows. Phone numbers without a "+" are read as dialled from region.
+	Validation rules come from rules_path (default: the user's rules.toml, if any).
+	Returns the report dict (also written as JSON).
+	'''
+	path = Path(in_path)
+	out = Path(out_dir)
+	report: dict = {"input": str(path), "started": datetime.now().isoformat(timespec="seconds")}
+	timings: dict[str, float] = {}
+	t0 = t = time.perf_counter()
+
+	def lap(name: str) -> None:
+		nonlocal t
+		now = time.perf_counter()
+		timings[name] = round(now - t, 4)
+		t = now
+
+	try:
+		rc = RingCentralCSV(region=region, rules=RuleSet.load(rules_path))
+		raw_rows = rc.checker(str(path))
+		lap("read_s")
+
+		cleaned, invalid = [], []
+		# cleaned index -> input row number, for the duplicate report
+		source_rows: list[int] = []
+		unique = rc.unique_index(cleaned)
+		for n, raw in enumerate(raw_rows, start=1):
+			try:
+				row = rc.normalise_row(raw)
+				unique.check(row)
+			except ValueError as ex:
+				invalid.append({"row": n, "error": str(ex)})
+			else:
+				cleaned.append(row)
+				source_rows.append(n)
+				unique.add(row)
+		lap("normalise_s")
+
+		dups = rc.find_duplicate_numbers(cleaned)
+		lap("duplicates_s")
+
+		out_csv = rc.writer(rc.fieldnames, cleaned, out_path=out / f"{path.stem}.cleaned.csv")
+		lap("write_s")
+
+		report.update({
+			"status": "ok",
+			"output": str(out_csv),
+			"input_format": rc.csv_format.describe(),
+			"rows_read": len(raw_rows),
+			"rows_written": len(cleaned),
+			"invalid": invalid,
+			"duplicates": [
+				{
+					"number": number,
+					"row": source_rows[first_i], "field": first_field,
+					"duplicate_row": source_rows[dup_i], "duplicate_field": dup_field,
+				}
+				for number, first_i, first_field, dup_i, dup_field in dups
+			],
+		})
+	except Exception as ex:  # noqa: BLE001 - recorded in the report
+		report.update({"status": "failed", "error": f"{type(ex).__name__}: {ex}"})
+
+	timings["total_s"] = round(time.perf_counter() - t0, 4)
+	report["timings"] = timings
+	out.mkdir(parents=True, exist_ok=True)
+	(out / f"{path.stem}.report.json").write_text(json.dumps(report, indent=2), encoding="utf-8")
+	return report
+
+
+def _ignore_sigint() -> None:
+	# Ctrl+C reaches the whole process group; let the parent decide when to stop.
+	signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+class FolderWatcher:
+	'''
+	Headless daemon: poll in_dir for new *.csv files and clean each one on a
+	bounded process pool.
+
+	- A file is picked up once its size and mtime are unchanged for one poll
+	  (so half-copied exports are left alone).
+	- At most max_pending files are queued or running; the poller blocks
+	  when the pool is full (backpressure) instead of queueing the whole folder.
+	- Finished inputs move to in_dir/processed (or in_dir/failed), so a
+	  restart never reprocesses them.
+	- stop() (or SIGINT/SIGTERM via the CLI) stops polling, lets in-flight
+	  files finish and returns.
+	'''
+	def __init__(
+		self,
+		in_dir: str | Path,
+		out_dir: str | Path,
+		workers: int = 2,
+		max_pending: int | None = None,
+		poll_interval: float = 2.0,
+		region: str = DEFAULT_REGION,
+		rules_path: str | None = None,
+	):
+		self.in_dir = Path(in_dir).expanduser()
+		self.out_dir = Path(out_dir).expanduser()
+		self.workers = max(1, workers)
+		self.max_pending = max(self.workers, max_pending or self.workers * 2)
+		self.poll_interval = poll_interval
+		self.region = region
+		self.rules_path = rules_path
+
+		self._stop = threading.Event()
+		self._slots = threading.BoundedSemaphore(self.max_pending)
+		self._in_flight: set[str] = set()
+		self._sizes: dict[str, tuple[int, int]] = {}
+		self._lock = threading.Lock()
+		self.stats = {"processed": 0, "failed": 0, "rows": 0, "busy_s": 0.0}
+
+
+	def stop(self) -> None:
+		self._stop.set()
+
+
+	def _ready_files(self) -> list[Path]:
+		'''
+		CSV files whose size and mtime did not change since the previous poll.
+		'''
+		ready = []
+		current: dict[str, tuple[int, int]] = {}
+		for path in sorted(self.in_dir.glob("*.csv")):
+			try:
+				stat = path.stat()
+			except OSError:
+				continue
+			stamp = (stat.st_size, stat.st_mtime_ns)
+			current[str(path)] = stamp
+			with self._lock:
+				busy = str(path) in self._in_flight
+			if not busy and self._sizes.get(str(path)) == stamp:
+				ready.append(path)
+		self._sizes = current
+		return ready
+
+
+	def _archive(self, path: Path, folder: str) -> None:
+		dest_dir = self.in_dir / folder
+		dest_dir.mkdir(exist_ok=True)
+		dest = dest_dir / path.name
+		if dest.exists():
+			dest = dest_dir / f"{path.stem}-{datetime.now().strftime('%Y%m%d-%H%M%S')}{path.suffix}"
+		shutil.move(str(path), dest)
+
+
+	def _done(self, path: Path, future: Future) -> None:
+		try:
+			report = future.result()
+		except Exception as ex:  # noqa: BLE001 - worker crashed; keep the daemon alive
+			report = {"status": "failed", "error": f"{type(ex).__name__}: {ex}", "timings": {}}
+
+		ok = report.get("status") == "ok"
+		try:
+			self._archive(path, PROCESSED_DIR if ok else FAILED_DIR)
+		except OSError:
+			logger.exception("Could not move %s out of the watch folder", path)
+
+		timings = report.get("timings", {})
+		with self._lock:
+			self._in_flight.discard(str(path))
+			self.stats["processed" if ok else "failed"] += 1
+			self.stats["rows"] += report.get("rows_read", 0)
+			self.stats["busy_s"] += timings.get("total_s", 0.0)
+		if ok:
+			logger.info(
+				"Processed %s: %d rows, %d invalid, %d duplicates in %.2fs (read %.2fs, normalise %.2fs, write %.2fs)",
+				path.name, report["rows_read"], len(report["invalid"]), len(report["duplicates"]),
+				timings.get("total_s", 0), timings.get("read_s", 0), timings.get("normalise_s", 0), timings.get("write_s", 0),
+			)
+		else:
+			logger.error("Failed %s: %s", path.name, report.get("error"))
+		self._slots.release()
+
+
+	def _acquire_slot(self) -> bool:
+		'''
+		Backpressure: block until fewer than max_pending files are queued or
+		running. Returns False if stop() was called while waiting.
+		'''
+		while not self._slots.acquire(timeout=0.5):
+			if self._stop.is_set():
+				return False
+		return True
+
+
+	def run(self) -> dict:
+		'''
+		Watch until stop() is called. Returns the run statistics.
+		'''
+		self.in_dir.mkdir(parents=True, exist_ok=True)
+		self.out_dir.mkdir(parents=True, exist_ok=True)
+		logger.info(
+			"Watching %s -> %s (%d workers, %d pending max)",
+			self.in_dir, self.out_dir, self.workers, self.max_pending,
+		)
+		started = time.perf_counter()
+
+		with ProcessPoolExecutor(max_workers=self.workers, initializer=_ignore_sigint) as pool:
+			while not self._stop.is_set():
+				for path in self._ready_files():
+					if not self._acquire_slot():
+						break
+					with self._lock:
+						self._in_flight.add(str(path))
+					future = pool.submit(process_file, str(path), str(self.out_dir), self.region, self.rules_path)
+					future.add_done_callback(lambda f, p=path: self._done(p, f))
+				self._stop.wait(self.poll_interval)
+
+			logger.info("Stopping: waiting for %d in-flight file(s)", len(self._in_flight))
+
+		self.stats["elapsed_s"] = round(time.perf_counter() - started, 2)
+		logger.info("Watcher stopped: %s", self.stats)
+		return self.stats
@@ -7,12 +7,20 @@ __github__ = "https://github.com/Ripped-Kanga/RingCentral-CSV-Editor\n"
 __disclaimer__ = ""
 
 import logging
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 
 import flet as ft
 
-from .helper.csv_helper import RingCentralCSV
+from .helper.columnar import COLUMNAR_SUFFIXES, is_columnar
+from .helper.csv_format import CsvFormat
+from .helper.csv_helper import BulkAppendError, RingCentralCSV, intern_rows
+from .helper.logs import LOG_LEVELS, get_level, set_level, setup_logging
+from .helper.numbering import DEFAULT_REGION, NUMBERING_PLANS, book_region, set_book_region
+from .helper.registry import NumberRegistry, book_key
+from .helper.rules import DEFAULT_RULES_PATH, RuleSet, UniqueIndex
 
 logger = logging.getLogger(__name__)
 
@@ -38,13 +46,22 @@ A desktop tool for importing, validating, editing and exporting RingCentral
 *Global Shared Address Book* CSV files.
 
 ### Toolbar
-- **New** — start a blank address book with the standard headers.
-- **Open** — load a `.csv` (the real header row is detected automatically).
+- **New** — start a blank address book with the standard headers, in a new tab.
+- **Open** — load a `.csv` (the real header row is detected automatically), or a
+  `.parquet` / `.arrow` book saved earlier, in a new tab.
 - **Append** — add a new contact (every field is validated).
+- **Import rows** — add many contacts at once from another CSV or pasted rows.
+  The whole batch is validated first; if any row is rejected nothing is added
+  and every problem is listed.
 - **Edit** — edit the selected row.
 - **Delete** — remove the selected row.
 - **Duplicates** — show only rows that share a phone number.
-- **Write** — save a cleaned CSV (you choose the folder and filename).
+- **Similar** — review contacts that look like the same person entered twice
+  (similar name, email or company) and merge them.
+- **Write** — save a cleaned CSV (you choose the folder and filename). Name the
+  file `.parquet` or `.arrow` to save in a columnar format instead.
+- **Region** (next to Write) — the country used for phone numbers typed
+  without `+`. Remembered per address book.
 
 ### Keyboard shortcuts
 | Key | Action |
@@ -52,58 +69,263 @@ A desktop tool for importing, validating, editing and exporting RingCentral
 | `n` | New address book |
 | `o` | Open CSV |
 | `a` | Append row |
+| `i` | Import rows into current book |
 | `e` | Edit selected row |
 | `d` | Delete selected row |
 | `f` | Toggle duplicates-only view |
+| `s` | Review similar contacts |
 | `w` | Write CSV |
 | `h` | Help |
 | `q` | Quit |
 
 ### Notes
+- Each open book has its own tab; every action applies to the selected tab.
+  Close a tab with its **×** (unsaved changes are discarded).
 - Click a row to select it before editing or deleting.
 - Duplicate numbers are **allowed on import** (you are warned) but **blocked**
-  when appending or editing.
-- Australian numbers are normalised to E.164 (`04…` → `+614…`, etc.).
+  when appending or editing — including numbers already used in any other
+  address book you have saved.
+- Phone numbers are normalised to E.164 (`04…` → `+614…` for AU, `07…` → `+447…`
+  for GB, etc.). Numbers starting with `+` or an international prefix (`0011 44…`)
+  are accepted from any supported country.
+- CSVs in Windows-1252 or UTF-16, or separated by `;` or tabs, open as-is; the
+  detected format is shown in the status bar. Tick **Keep format on write** to
+  save in the same format (otherwise UTF-8 with commas).
+- Extra per-column rules (patterns, allowed values, unique columns) are read
+  from `~/ringcentral-csv-editor/rules.toml` at startup.
+- The app logs to `~/ringcentral-csv-editor/app.log` (rotated at 5 MB). Change
+  the **Log level** at the bottom of this dialog, e.g. to `DEBUG` while
+  investigating a problem.
 """
 
 
-def setup_logging() -> None:
-    log_dir = Path.home() / "ringcentral-csv-editor"
-    log_dir.mkdir(parents=True, exist_ok=True)
-    log_path = log_dir / "app.log"
+class UpdateScheduler:
+    """Coalesce page updates into at most one send per tick.
 
-    logging.basicConfig(
-        level=logging.INFO,  # change to DEBUG when needed
-        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
-        handlers=[logging.FileHandler(log_path, encoding="utf-8")],
+    update(*controls) queues controls whose properties changed; with no
+    arguments the whole page is queued (needed for page-level properties such
+    as the theme). After an idle tick the update is sent at once, so a single
+    click still feels instant; anything queued within the next `interval`
+    seconds is merged and sent by a timer as one page.update(*controls), which
+    only diffs those controls' subtrees instead of the entire page.
+    """
+
+    def __init__(self, page: ft.Page, interval: float = 1 / 30) -> None:
+        self.page = page
+        self.interval = interval
+        self._controls: dict[int, ft.Control] = {}
+        self._whole_page = False
+        self._timer: threading.Timer | None = None
+        self._last_flush = 0.0
+        self._lock = threading.Lock()
+        self.requested = 0
+        self.sent = 0
+
+    def update(self, *controls: ft.Control) -> None:
+        with self._lock:
+            self.requested += 1
+            if controls:
+                for control in controls:
+                    if control is not None:
+                        self._controls[id(control)] = control
+            else:
+                self._whole_page = True
+            if self._timer is not None:
+                return
+            wait = self._last_flush + self.interval - time.monotonic()
+            if wait > 0:
+                self._timer = threading.Timer(wait, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+                return
+        self.flush()
+
+    def _on_page(self, control: ft.Control) -> bool:
+        # Replaced controls (e.g. rows of a rebuilt table) keep their uid but
+        # are no longer in the page's index.
+        return control.uid is not None and self.page.index.get(control.uid) is control
+
+    def flush(self) -> None:
+        with self._lock:
+            self._timer = None
+            whole_page, self._whole_page = self._whole_page, False
+            controls, self._controls = list(self._controls.values()), {}
+            self._last_flush = time.monotonic()
+        try:
+            if whole_page:
+                self.page.update()
+            else:
+                controls = [c for c in controls if self._on_page(c)]
+                if not controls:
+                    return
+                self.page.update(*controls)
+            self.sent += 1
+        except Exception:  # noqa: BLE001 - e.g. the window closed mid-tick
+            logger.exception("UI update failed")
+
+
+class BookView(ft.Container):
+    """Tab content holding one book's table.
+
+    Isolated, so updating the tab bar (opening or closing a tab) doesn't
+    re-diff the tables of every other open book; the book's own table host
+    is updated directly.
+    """
+
+    def is_isolated(self) -> bool:
+        return True
+
+
+class Book:
+    """One open address book: its rows, view state, table and indexes.
+
+    The indexes (unique-column counts and the groups of rows sharing phone
+    numbers) are built by build_indexes(), in a background thread after the
+    book is loaded and after every change. unique_index and clusters() wait
+    for a build in progress instead of starting a second one.
+    """
+
+    def __init__(
+        self,
+        fieldnames: list[str] | tuple[str, ...] = (),
+        csv_data: list[dict] | None = None,
+        path: Path | None = None,
+        region: str = DEFAULT_REGION,
+        csv_format: CsvFormat | None = None,
+        rules: RuleSet | None = None,
+    ) -> None:
+        self.fieldnames: list[str] = list(fieldnames)
+        self.csv_data: list[dict] = csv_data if csv_data is not None else []
+        self.selected_path: Path | None = path
+        self.region: str = region  # numbering plan for numbers typed without "+"
+        self.csv_format: CsvFormat | None = csv_format  # encoding / delimiter of the loaded CSV
+        self.keep_format: bool = False
+        self.rules = rules
+        self.show_dupes_only: bool = False
+        self.selected_index: int | None = None  # source index into csv_data
+        self._rows_by_index: dict[int, ft.DataRow] = {}
+
+        self.table_host = ft.Column(expand=True, scroll=ft.ScrollMode.AUTO)
+        self.view = BookView(
+            content=self.table_host,
+            expand=True,
+            padding=ft.padding.symmetric(horizontal=16, vertical=8),
+        )
+        self.label = ft.Text(self.title)
+        self.tab: ft.Tab | None = None
+
+        self._unique: UniqueIndex | None = None
+        self._unique_lock = threading.Lock()
+        self._clusters: list[tuple[list[int], list[str]]] = []
+        self._clusters_lock = threading.Lock()
+        self._version = 0  # bumped by changed()
+        self._indexed = -1  # the _version _clusters was built for
+
+    @property
+    def title(self) -> str:
+        return self.selected_path.name if self.selected_path else "New Address Book"
+
+    @property
+    def indexed(self) -> bool:
+        return self._indexed == self._version
+
+    @property
+    def unique_index(self) -> UniqueIndex:
+        """Counts for the rules' unique columns; kept in step with csv_data by the editor."""
+        with self._unique_lock:
+            if self._unique is None:
+                fields = self.rules.unique_fields(self.fieldnames) if self.rules else []
+                self._unique = UniqueIndex(fields, self.csv_data)
+            return self._unique
+
+    @property
+    def duplicate_numbers(self) -> int:
+        """Distinct numbers used more than once, as of the last index build."""
+        return sum(len(numbers) for _rows, numbers in self._clusters)
+
+    def changed(self) -> None:
+        """Call after csv_data changed: the duplicate groups are stale."""
+        self._version += 1
+
+    def clusters(self) -> list[tuple[list[int], list[str]]]:
+        """find_duplicate_clusters() of csv_data, rebuilt only after a change."""
+        with self._clusters_lock:
+            while self._indexed != self._version:
+                version = self._version
+                self._clusters = RingCentralCSV().find_duplicate_clusters(list(self.csv_data))
+                self._indexed = version
+            return self._clusters
+
+    def build_indexes(self) -> None:
+        self.unique_index  # built on first access
+        self.clusters()
+
+
+def _book_state(name: str) -> property:
+    """Forward self.<name> to the active book (see AddressBookGUI)."""
+    return property(
+        lambda self: getattr(self.book, name),
+        lambda self, value: setattr(self.book, name, value),
     )
 
 
 class AddressBookGUI:
-    """Flet GUI wrapper around the RingCentralCSV helper."""
+    """Flet GUI wrapper around the RingCentralCSV helper.
+
+    Each open book has its own tab and Book; the attributes below read and
+    write the active one, so the actions always work on the selected tab.
+    """
+
+    csv_data = _book_state("csv_data")
+    fieldnames = _book_state("fieldnames")
+    selected_path = _book_state("selected_path")
+    show_dupes_only = _book_state("show_dupes_only")
+    selected_index = _book_state("selected_index")
+    region = _book_state("region")
+    csv_format = _book_state("csv_format")
+    table_host = _book_state("table_host")
+    _rows_by_index = _book_state("_rows_by_index")
 
     def __init__(self, page: ft.Page) -> None:
         self.page = page
 
         # ---- state ----
-        self.csv_data: list[dict] = []
-        self.fieldnames: list[str] = []
-        self.selected_path: Path | None = None
-        self.show_dupes_only: bool = False
-        self.selected_index: int | None = None  # source index into csv_data
-        self._rows_by_index: dict[int, ft.DataRow] = {}
+        # Open books in tab order; with none open, self.book is a blank
+        # placeholder that shows the "No address book loaded" message.
+        self.books: list[Book] = []
+        self._no_book = Book()
+        self.book: Book = self._no_book
         self._dialog_open: bool = False  # suppress shortcuts while typing in a dialog
+        self.ui = UpdateScheduler(page)
+
+        # Cross-book phone-number registry (updated on every save)
+        try:
+            self.registry: NumberRegistry | None = NumberRegistry()
+        except Exception:  # noqa: BLE001 - the editor still works without it
+            logger.exception("Number registry unavailable")
+            self.registry = None
+
+        # User validation rules (~/ringcentral-csv-editor/rules.toml, optional)
+        rules_error = None
+        try:
+            self.rules: RuleSet | None = RuleSet.load()
+        except (OSError, ValueError) as ex:
+            logger.exception("Could not load %s", DEFAULT_RULES_PATH)
+            self.rules, rules_error = None, f"Validation rules not loaded: {ex}"
 
         # ---- file pickers (native dialogs) ----
         self.open_picker = ft.FilePicker(on_result=self._on_open_result)
         self.save_picker = ft.FilePicker(on_result=self._on_save_result)
-        page.overlay.extend([self.open_picker, self.save_picker])
+        self.import_picker = ft.FilePicker()  # on_result set by the import dialog
+        page.overlay.extend([self.open_picker, self.save_picker, self.import_picker])
 
         self._build()
         self.refresh_controls()
         self.refresh_status()
         self.refresh_table()
-        self.page.update()
+        self.ui.update()
+        if rules_error:
+            self.notify(rules_error, error=True)
 
     # ------------------------------------------------------------------ UI
 
@@ -159,6 +381,10 @@ class AddressBookGUI:
             "Append", icon=ft.Icons.PERSON_ADD, tooltip="Append a row (a)",
             on_click=lambda e: self.do_append_row(),
         )
+        self.btn_import = ft.OutlinedButton(
+            "Import rows", icon=ft.Icons.PLAYLIST_ADD, tooltip="Import rows into current book (i)",
+            on_click=lambda e: self.do_import_rows(),
+        )
         self.btn_edit = ft.OutlinedButton(
             "Edit", icon=ft.Icons.EDIT, tooltip="Edit selected row (e)",
             on_click=lambda e: self.do_edit_row(),
@@ -171,23 +397,41 @@ class AddressBookGUI:
             "Duplicates", icon=ft.Icons.FILTER_ALT, tooltip="Show duplicates only (f)",
             on_click=lambda e: self.do_toggle_dupes(),
         )
+        self.btn_similar = ft.OutlinedButton(
+            "Similar", icon=ft.Icons.MERGE_TYPE, tooltip="Review similar contacts (s)",
+            on_click=lambda e: self.do_review_similar(),
+        )
+        self.region_dropdown = ft.Dropdown(
+            value=self.region,
+            options=[
+                ft.dropdown.Option(key=code, text=f"{code} (+{plan['country_code']})")
+                for code, plan in NUMBERING_PLANS.items()
+            ],
+            width=130,
+            dense=True,
+            tooltip="Region for phone numbers entered without +<country code>",
+            on_change=self._on_region_change,
+        )
         self.btn_write = ft.FilledButton(
             "Write", icon=ft.Icons.SAVE, tooltip="Write CSV (w)",
             on_click=lambda e: self.do_write_csv(),
         )
 
-        toolbar = ft.Container(
+        self.toolbar = ft.Container(
             content=ft.Row(
                 [
                     self.btn_new,
                     self.btn_open,
                     ft.VerticalDivider(width=1),
                     self.btn_append,
+                    self.btn_import,
                     self.btn_edit,
                     self.btn_delete,
                     ft.VerticalDivider(width=1),
                     self.btn_dupes,
+                    self.btn_similar,
                     ft.Container(expand=True),
+                    self.region_dropdown,
                     self.btn_write,
                 ],
                 spacing=8,
@@ -199,26 +443,37 @@ class AddressBookGUI:
         # ---- status bar ----
         self.status_text = ft.Text("No address book loaded", weight=ft.FontWeight.W_500)
         self.dupe_text = ft.Text("", color=ft.Colors.AMBER)
-        status_bar = ft.Container(
+        self.format_text = ft.Text("", color=ft.Colors.OUTLINE,
+                                   tooltip="Encoding · delimiter · line endings of the loaded file")
+        self.keep_format = ft.Checkbox(
+            label="Keep format on write", value=False, visible=False,
+            tooltip="Write with this file's encoding and delimiter instead of UTF-8 with commas",
+            on_change=lambda e: setattr(self.book, "keep_format", bool(e.control.value)),
+        )
+        self.status_bar = ft.Container(
             content=ft.Row(
-                [self.status_text, ft.Container(expand=True), self.dupe_text],
+                [self.status_text, self.format_text, self.keep_format,
+                 ft.Container(expand=True), self.dupe_text],
                 vertical_alignment=ft.CrossAxisAlignment.CENTER,
             ),
             padding=ft.padding.symmetric(horizontal=16, vertical=6),
             bgcolor=ft.Colors.with_opacity(0.04, ft.Colors.ON_SURFACE),
         )
 
-        # ---- table host ----
-        self.table_host = ft.Column(expand=True, scroll=ft.ScrollMode.AUTO)
-        table_area = ft.Container(
-            content=self.table_host,
+        # ---- workspace: one tab per open book ----
+        self.tabs = ft.Tabs(
+            tabs=[],
             expand=True,
-            padding=ft.padding.symmetric(horizontal=16, vertical=8),
+            scrollable=True,
+            animation_duration=0,
+            visible=False,
+            on_change=self._on_tab_change,
         )
+        self.workspace = ft.Column([self.tabs, self._no_book.view], expand=True, spacing=0)
 
         page.add(
             ft.Column(
-                [toolbar, ft.Divider(height=1), status_bar, table_area],
+                [self.toolbar, ft.Divider(height=1), self.status_bar, self.workspace],
                 spacing=0,
                 expand=True,
             )
@@ -241,7 +496,30 @@ class AddressBookGUI:
         else:
             self.page.theme_mode = ft.ThemeMode.DARK
             self.theme_button.icon = ft.Icons.LIGHT_MODE
-        self.page.update()
+        self.ui.update()
+
+    def _engine(self) -> RingCentralCSV:
+        """A RingCentralCSV bound to the current book and the number registry."""
+        rc = RingCentralCSV(registry=self.registry, region=self.region, rules=self.rules)
+        rc.fieldnames = self.fieldnames
+        rc.book = book_key(self.selected_path) if self.selected_path else None
+        rc.unique = self.unique_index
+        return rc
+
+    @property
+    def unique_index(self) -> UniqueIndex:
+        return self.book.unique_index
+
+    def _on_region_change(self, e=None) -> None:
+        self.region = self.region_dropdown.value or DEFAULT_REGION
+        if self.selected_path is not None:
+            try:
+                set_book_region(self.selected_path, self.region)
+            except (OSError, ValueError):
+                logger.exception("Could not save region for %s", self.selected_path)
+        self.notify(
+            f"Numbers without +<country code> are now read as {NUMBERING_PLANS[self.region]['name']}"
+        )
 
     # --------------------------------------------------------------- rules
 
@@ -259,10 +537,12 @@ class AddressBookGUI:
 
     def refresh_controls(self) -> None:
         self.btn_append.disabled = not self.can_append()
+        self.btn_import.disabled = not self.can_append()
         self.btn_write.disabled = not self.can_write()
         self.btn_edit.disabled = not self._has_selection()
         self.btn_delete.disabled = not self._has_selection()
         self.btn_dupes.disabled = not bool(self.csv_data)
+        self.btn_similar.disabled = len(self.csv_data) < 2
 
     def refresh_status(self) -> None:
         if not self.fieldnames:
@@ -270,56 +550,39 @@ class AddressBookGUI:
         else:
             where = self.selected_path.name if self.selected_path else "New Address Book"
             self.status_text.value = f"{where}  ·  {len(self.csv_data)} rows"
+        self.format_text.value = self.csv_format.describe() if self.csv_format else ""
+        self.keep_format.visible = self.csv_format not in (None, CsvFormat())
 
-        dups = RingCentralCSV().find_duplicate_numbers(self.csv_data) if self.csv_data else []
-        if dups:
-            n = len({d[0] for d in dups})
+        # Counted by the background index build; never computed here
+        n = self.book.duplicate_numbers
+        if not self.csv_data:
+            self.dupe_text.value = ""
+        elif not self.book.indexed:
+            self.dupe_text.value = "Checking for duplicates…"
+        elif n:
             self.dupe_text.value = f"⚠ {n} duplicate number{'s' if n != 1 else ''}"
         else:
             self.dupe_text.value = ""
 
     # ------------------------------------------------------------- the table
 
-    def _current_view(self) -> tuple[list[dict], list[int]]:
+    def _current_view(self) -> list[tuple[list[int], list[str]]]:
+        """Row groups to display: one group of every row, or the duplicate clusters."""
         if self.show_dupes_only:
-            dup_rows = sorted(self.get_duplicate_row_indexes())
-            return [self.csv_data[i] for i in dup_rows], dup_rows
-        return self.csv_data, list(range(len(self.csv_data)))
-
-    def refresh_table(self) -> None:
-        self._rows_by_index = {}
-
-        if not self.fieldnames:
-            self.table_host.controls = [
-                ft.Container(
-                    content=ft.Column(
-                        [
-                            ft.Icon(ft.Icons.TABLE_VIEW, size=48,
-                                    color=ft.Colors.OUTLINE),
-                            ft.Text("No address book loaded",
-                                    size=18, color=ft.Colors.OUTLINE),
-                            ft.Text("Open a CSV or create a New Address Book to begin.",
-                                    color=ft.Colors.OUTLINE),
-                        ],
-                        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                        spacing=6,
-                    ),
-                    alignment=ft.alignment.center,
-                    expand=True,
-                    padding=40,
-                )
-            ]
-            return
-
-        rows, source_indexes = self._current_view()
+            return self.book.clusters()
+        return [(list(range(len(self.csv_data))), [])]
 
+    def _build_table(self, source_indexes: list[int], group: list[int] | None = None) -> ft.DataTable:
         columns = [
             ft.DataColumn(ft.Text(c, weight=ft.FontWeight.BOLD))
             for c in self.fieldnames
         ]
+        if group is not None:
+            columns.insert(0, ft.DataColumn(ft.Text("Keep", weight=ft.FontWeight.BOLD)))
 
         data_rows: list[ft.DataRow] = []
-        for src_i, r in zip(source_indexes, rows):
+        for src_i in source_indexes:
+            r = self.csv_data[src_i]
             cells = [
                 ft.DataCell(
                     ft.Text(str(r.get(c, "") or "")),
@@ -327,6 +590,14 @@ class AddressBookGUI:
                 )
                 for c in self.fieldnames
             ]
+            if group is not None:
+                cells.insert(0, ft.DataCell(
+                    ft.IconButton(
+                        icon=ft.Icons.CHECK_CIRCLE_OUTLINE,
+                        tooltip="Keep this row and delete the rows sharing a number with it",
+                        on_click=lambda e, i=src_i: self.do_keep_row(i, group),
+                    )
+                ))
             row = ft.DataRow(
                 cells=cells,
                 selected=(src_i == self.selected_index),
@@ -335,7 +606,7 @@ class AddressBookGUI:
             self._rows_by_index[src_i] = row
             data_rows.append(row)
 
-        table = ft.DataTable(
+        return ft.DataTable(
             columns=columns,
             rows=data_rows,
             show_checkbox_column=False,
@@ -350,7 +621,34 @@ class AddressBookGUI:
             horizontal_lines=ft.border.BorderSide(1, ft.Colors.with_opacity(0.4, ft.Colors.OUTLINE_VARIANT)),
         )
 
-        if not data_rows:
+    def refresh_table(self) -> None:
+        self._rows_by_index = {}
+
+        if not self.fieldnames:
+            self.table_host.controls = [
+                ft.Container(
+                    content=ft.Column(
+                        [
+                            ft.Icon(ft.Icons.TABLE_VIEW, size=48,
+                                    color=ft.Colors.OUTLINE),
+                            ft.Text("No address book loaded",
+                                    size=18, color=ft.Colors.OUTLINE),
+                            ft.Text("Open a CSV or create a New Address Book to begin.",
+                                    color=ft.Colors.OUTLINE),
+                        ],
+                        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                        spacing=6,
+                    ),
+                    alignment=ft.alignment.center,
+                    expand=True,
+                    padding=40,
+                )
+            ]
+            return
+
+        groups = self._current_view()
+
+        if not any(rows for rows, _numbers in groups):
             self.table_host.controls = [
                 ft.Container(
                     content=ft.Text("No rows yet — use Append to add a contact.",
@@ -360,52 +658,170 @@ class AddressBookGUI:
                     padding=40,
                 )
             ]
-        else:
+        elif not self.show_dupes_only:
             # Row wrapper allows horizontal scrolling for the wide table.
+            table = self._build_table(groups[0][0])
             self.table_host.controls = [ft.Row([table], scroll=ft.ScrollMode.AUTO)]
+        else:
+            # One collapsible tile per group of rows connected by shared numbers.
+            self.table_host.controls = [
+                ft.ExpansionTile(
+                    title=ft.Text(
+                        f"Group {n}  ·  {len(rows)} row{'s' if len(rows) != 1 else ''}",
+                        weight=ft.FontWeight.BOLD,
+                    ),
+                    subtitle=ft.Text("Shared: " + ", ".join(numbers), color=ft.Colors.AMBER),
+                    initially_expanded=True,
+                    maintain_state=True,
+                    controls=[
+                        ft.Row([self._build_table(rows, group=rows)], scroll=ft.ScrollMode.AUTO)
+                    ],
+                )
+                for n, (rows, numbers) in enumerate(groups, start=1)
+            ]
 
     def select_row(self, i: int) -> None:
         if i == self.selected_index:
             return
         prev = self.selected_index
         self.selected_index = i
-        if prev is not None and prev in self._rows_by_index:
-            self._rows_by_index[prev].selected = False
-        if i in self._rows_by_index:
-            self._rows_by_index[i].selected = True
+        prev_row = self._rows_by_index.get(prev) if prev is not None else None
+        row = self._rows_by_index.get(i)
+        if prev_row is not None:
+            prev_row.selected = False
+        if row is not None:
+            row.selected = True
         self.refresh_controls()
-        self.page.update()
+        # Only the two rows and the toolbar changed; don't diff the whole table
+        self.ui.update(prev_row, row, self.toolbar)
+
+    def _exit_dupes_view_if_resolved(self) -> bool:
+        """Fall back to the full view once no duplicates are left. Returns True if it did."""
+        if not self.show_dupes_only or self.get_duplicate_row_indexes():
+            return False
+        self.show_dupes_only = False
+        self._sync_dupes_button()
+        return True
+
+    def _sync_dupes_button(self) -> None:
+        if self.show_dupes_only:
+            self.btn_dupes.icon = ft.Icons.FILTER_ALT_OFF
+            self.btn_dupes.text = "Show all"
+        else:
+            self.btn_dupes.icon = ft.Icons.FILTER_ALT
+            self.btn_dupes.text = "Duplicates"
 
     def get_duplicate_row_indexes(self) -> set[int]:
-        rc = RingCentralCSV()
-        dups = rc.find_duplicate_numbers(self.csv_data)
         dup_rows: set[int] = set()
-        for _number, first_i, _first_field, dup_i, _dup_field in dups:
-            dup_rows.add(first_i)
-            dup_rows.add(dup_i)
+        for rows, _numbers in self.book.clusters():
+            dup_rows.update(rows)
         return dup_rows
 
     def _after_data_change(self) -> None:
         self.refresh_controls()
+        self.refresh_table()
         self.refresh_status()
+        self.ui.update(self.toolbar, self.status_bar, self.table_host)
+        self._index_in_background(self.book)
+
+    def _index_in_background(self, book: Book, report: bool = False) -> None:
+        """Build book's indexes off the UI thread, then refresh the status bar.
+        report: also tell the user about duplicate numbers (after loading)."""
+        if book.indexed and not report:
+            return
+
+        def build() -> None:
+            try:
+                book.build_indexes()
+                if report:
+                    self._report_duplicates(book)
+            except Exception:  # noqa: BLE001 - the status just stays "checking"
+                logger.exception("Indexing %s failed", book.title)
+                return
+            if book is self.book:
+                self.refresh_status()
+                self.ui.update(self.status_bar)
+
+        threading.Thread(target=build, name=f"index-{book.title}", daemon=True).start()
+
+    def _report_duplicates(self, book: Book) -> None:
+        rows = list(book.csv_data)
+        dups_msg = RingCentralCSV().format_duplicate_report(rows, limit=10)
+        if self.registry is not None and book.selected_path is not None:
+            cross_msg = self.registry.format_conflicts(
+                self.registry.conflicts(rows, exclude_book=book_key(book.selected_path)), limit=10
+            )
+            dups_msg = "\n\n".join(m for m in (dups_msg, cross_msg) if m)
+        if dups_msg:
+            self.notify(f"{book.title}: {dups_msg}" if book is not self.book else dups_msg)
+
+    # ---------------------------------------------------------------- tabs
+
+    def _open_book(self, book: Book) -> None:
+        """Show book in a new tab and switch to it."""
+        book.tab = ft.Tab(
+            tab_content=ft.Row(
+                [
+                    book.label,
+                    ft.IconButton(
+                        icon=ft.Icons.CLOSE, icon_size=16, tooltip="Close",
+                        on_click=lambda e, b=book: self.close_book(b),
+                    ),
+                ],
+                spacing=2,
+                tight=True,
+            ),
+            content=book.view,
+        )
+        self.books.append(book)
+        # New lists rather than append / pop: a flush may be diffing the old one
+        self.tabs.tabs = [*self.tabs.tabs, book.tab]
+        self.book = book
         self.refresh_table()
-        self.page.update()
+        self._switch_to(book)
+
+    def close_book(self, book: Book) -> None:
+        i = self.books.index(book)
+        del self.books[i]
+        self.tabs.tabs = [tab for tab in self.tabs.tabs if tab is not book.tab]
+        if book is self.book:
+            self.book = self.books[min(i, len(self.books) - 1)] if self.books else self._no_book
+        self._switch_to(self.book)
+
+    def _switch_to(self, book: Book) -> None:
+        self.book = book
+        self.tabs.visible = bool(self.books)
+        self._no_book.view.visible = not self.books
+        if self.books:
+            self.tabs.selected_index = self.books.index(book)
+        self._show_book()
+        # Other books' views are isolated: only the tab bar is diffed
+        self.ui.update(self.workspace)
+
+    def _on_tab_change(self, e: ft.ControlEvent) -> None:
+        # The tab's table is already on the page: nothing to rebuild
+        self.book = self.books[int(e.data)]
+        self._show_book()
+
+    def _show_book(self) -> None:
+        """Point the toolbar and status bar at the active book."""
+        self.region_dropdown.value = self.region
+        self.keep_format.value = self.book.keep_format
+        self._sync_dupes_button()
+        self.refresh_controls()
+        self.refresh_status()
+        self.ui.update(self.toolbar, self.status_bar)
 
     # ------------------------------------------------------------- actions
 
     def do_new_address_book(self) -> None:
-        self.fieldnames = list(RINGCENTRAL_FIELDNAMES)
-        self.csv_data = []
-        self.show_dupes_only = False
-        self.selected_path = None
-        self.selected_index = None
-        self._after_data_change()
+        self._open_book(Book(RINGCENTRAL_FIELDNAMES, region=self.region, rules=self.rules))
         self.notify("New address book ready — append rows then write to save")
 
     def do_open_file(self) -> None:
         self.open_picker.pick_files(
             dialog_title="Open RingCentral CSV",
-            allowed_extensions=["csv"],
+            allowed_extensions=["csv", *(ext.lstrip(".") for ext in COLUMNAR_SUFFIXES)],
             allow_multiple=False,
         )
 
@@ -415,26 +831,32 @@ class AddressBookGUI:
         self._read_csv(Path(e.files[0].path))
 
     def _read_csv(self, path: Path) -> None:
+        for book in self.books:
+            if book.selected_path is not None and book.selected_path.resolve() == path.resolve():
+                self._switch_to(book)
+                self.notify(f"{path.name} is already open")
+                return
         try:
-            rc_csv = RingCentralCSV()
-            csv_data = rc_csv.checker(str(path), required_headers=("First Name", "Surname"))
-
-            self.fieldnames = rc_csv.fieldnames
-            self.csv_data = csv_data
-            self.selected_path = path
-            self.show_dupes_only = False
-            self.selected_index = None
-
-            dups_msg = rc_csv.format_duplicate_report(self.csv_data, limit=10)
-
-            self._after_data_change()
-
-            if dups_msg:
-                self.notify(dups_msg)
+            rc_csv = RingCentralCSV(registry=self.registry)
+            if is_columnar(path):
+                csv_data = rc_csv.columnar_checker(str(path), required_headers=("First Name", "Surname"))
             else:
-                self.notify(
-                    "Import complete!" if self.csv_data else "Imported headers only."
-                )
+                csv_data = rc_csv.parallel_checker(str(path), required_headers=("First Name", "Surname"))
+
+            # Before the table is built, so its cells share the pooled strings too
+            intern_rows(csv_data)
+            book = Book(
+                rc_csv.fieldnames, csv_data, path,
+                region=book_region(path) or DEFAULT_REGION,
+                csv_format=rc_csv.csv_format,
+                rules=self.rules,
+            )
+            self._open_book(book)
+            # Duplicate report and registry conflicts follow once indexed
+            self._index_in_background(book, report=True)
+            self.notify(
+                "Import complete!" if self.csv_data else "Imported headers only."
+            )
         except ValueError as ex:
             self.notify(str(ex), error=True)
         except Exception as ex:  # noqa: BLE001 - surface to user
@@ -446,6 +868,12 @@ class AddressBookGUI:
             return
         self._open_row_dialog(title="Append Row", edit_index=None)
 
+    def do_import_rows(self) -> None:
+        if not self.can_append():
+            self.notify("Open a CSV or start a New Address Book first")
+            return
+        self._open_import_dialog()
+
     def do_edit_row(self) -> None:
         if not self._has_selection():
             self.notify("Select a row first")
@@ -458,12 +886,13 @@ class AddressBookGUI:
             return
 
         idx = self.selected_index
+        self.unique_index.remove(self.csv_data[idx])
         del self.csv_data[idx]
+        self.book.changed()
         self.selected_index = None
 
         # If the duplicates-only view is empty now, fall back to the full view.
-        if self.show_dupes_only and not self.get_duplicate_row_indexes():
-            self.show_dupes_only = False
+        if self._exit_dupes_view_if_resolved():
             self._after_data_change()
             self.notify("Row deleted (no duplicates left)")
             return
@@ -471,6 +900,27 @@ class AddressBookGUI:
         self._after_data_change()
         self.notify("Row deleted")
 
+    def do_keep_row(self, keep: int, group: list[int]) -> None:
+        """
+        Resolve duplicates by keeping one row and deleting the rows of its
+        group that share a number with it. Rows only chained in through
+        another row (A-B share one number, B-C another) are left alone.
+        """
+        doomed = RingCentralCSV().rows_sharing_numbers(self.csv_data, keep, group)
+        for i in sorted(doomed, reverse=True):
+            self.unique_index.remove(self.csv_data[i])
+            del self.csv_data[i]
+        self.book.changed()
+        self.selected_index = None
+
+        resolved = self._exit_dupes_view_if_resolved()
+        self._after_data_change()
+        removed = len(doomed)
+        self.notify(
+            f"Kept row, deleted {removed} duplicate{'s' if removed != 1 else ''}"
+            + (" (no duplicates left)" if resolved else "")
+        )
+
     def do_toggle_dupes(self) -> None:
         if not self.csv_data:
             self.notify("Open a CSV first")
@@ -481,20 +931,28 @@ class AddressBookGUI:
                 self.notify("No duplicate numbers found")
                 return
             self.show_dupes_only = True
-            self.btn_dupes.icon = ft.Icons.FILTER_ALT_OFF
-            self.btn_dupes.text = "Show all"
+            self._sync_dupes_button()
             self.selected_index = None
             self._after_data_change()
             self.notify("Showing duplicates only")
             return
 
         self.show_dupes_only = False
-        self.btn_dupes.icon = ft.Icons.FILTER_ALT
-        self.btn_dupes.text = "Duplicates"
+        self._sync_dupes_button()
         self.selected_index = None
         self._after_data_change()
         self.notify("Showing all rows")
 
+    def do_review_similar(self) -> None:
+        if len(self.csv_data) < 2:
+            self.notify("Open a CSV with at least two rows first")
+            return
+        clusters = RingCentralCSV().find_near_duplicates(self.csv_data)
+        if not clusters:
+            self.notify("No similar contacts found")
+            return
+        self._open_similar_dialog(clusters)
+
     def do_write_csv(self) -> None:
         if not self.can_write():
             self.notify("Nothing to write")
@@ -503,17 +961,36 @@ class AddressBookGUI:
         self.save_picker.save_file(
             dialog_title="Write RingCentral CSV",
             file_name=default_name,
-            allowed_extensions=["csv"],
+            allowed_extensions=["csv", "parquet", "arrow"],
         )
 
     def _on_save_result(self, e: ft.FilePickerResultEvent) -> None:
         if not e.path:
             return
         out_path = Path(e.path)
-        if out_path.suffix.lower() != ".csv":
+        if out_path.suffix.lower() != ".csv" and not is_columnar(out_path):
             out_path = out_path.with_suffix(".csv")
         try:
-            saved = RingCentralCSV().writer(self.fieldnames, self.csv_data, out_path=out_path)
+            rc = self._engine()
+            if is_columnar(out_path):
+                # Written exactly as shown, like the CSV writer.
+                saved = rc.columnar_writer(
+                    self.fieldnames, self.csv_data, out_path, normalise=False
+                )
+                self.csv_format = None
+            else:
+                fmt = self.csv_format if self.keep_format.value and self.csv_format else CsvFormat()
+                saved = rc.writer(self.fieldnames, self.csv_data, out_path=out_path, csv_format=fmt)
+                self.csv_format = fmt
+            # The saved file is now the current book (and its registry entry).
+            self.selected_path = Path(saved)
+            self.book.label.value = self.book.title
+            try:
+                set_book_region(self.selected_path, self.region)
+            except OSError:
+                logger.exception("Could not save region for %s", self.selected_path)
+            self.refresh_status()
+            self.ui.update(self.status_bar, self.book.label)
             self.notify(f"Saved: {saved}")
         except Exception as ex:  # noqa: BLE001 - surface to user
             self.notify(f"Write failed: {type(ex).__name__}: {ex}", error=True)
@@ -543,47 +1020,53 @@ class AddressBookGUI:
                 tf.error_text = None
             error_banner.value = ""
 
+            rc = self._engine()
             cleaned: dict[str, str] = {}
             first_bad: ft.TextField | None = None
             for field, tf in inputs.items():
                 try:
-                    cleaned[field] = RingCentralCSV.field_formatter(field, (tf.value or "").strip())
+                    cleaned[field] = rc.format_field(field, (tf.value or "").strip())
                 except ValueError as ex:
                     tf.error_text = str(ex)
                     if first_bad is None:
                         first_bad = tf
             if first_bad is not None:
-                self.page.update()
+                self.ui.update(dlg)
                 first_bad.focus()
                 return
 
-            # Duplicate-number check (intra-row and against other rows).
-            rc = RingCentralCSV()
-            rc.fieldnames = self.fieldnames
+            # Duplicate-number check (intra-row, other rows, other books)
+            # and unique-column rules.
             try:
                 if is_edit:
                     others = [r for i, r in enumerate(self.csv_data) if i != edit_index]
                     rc.assert_no_duplicate_numbers(others + [cleaned])
+                    # Only numbers new to this row count against other books;
+                    # the ones it already had are this book's own entries
+                    kept = {str(v).strip() for v in current.values() if v}
+                    rc.assert_not_in_other_books([{k: v for k, v in cleaned.items() if v not in kept}])
                 else:
                     rc.assert_no_duplicate_numbers(self.csv_data + [cleaned])
+                    rc.assert_not_in_other_books([cleaned])
+                self.unique_index.check(cleaned, replacing=current if is_edit else None)
             except ValueError as ex:
                 error_banner.value = str(ex)
-                self.page.update()
+                self.ui.update(dlg)
                 return
 
             if is_edit:
+                self.unique_index.replace(self.csv_data[edit_index], cleaned)
                 self.csv_data[edit_index] = cleaned
             else:
                 self.csv_data.append(cleaned)
+                self.unique_index.add(cleaned)
+            self.book.changed()
 
             self._dialog_open = False
             self.page.close(dlg)
 
             # Editing may make a row stop being a duplicate; recompute the view.
-            if self.show_dupes_only and not self.get_duplicate_row_indexes():
-                self.show_dupes_only = False
-                self.btn_dupes.icon = ft.Icons.FILTER_ALT
-                self.btn_dupes.text = "Duplicates"
+            self._exit_dupes_view_if_resolved()
             self._after_data_change()
             self.notify("Row updated" if is_edit else "Row appended")
 
@@ -616,6 +1099,191 @@ class AddressBookGUI:
         self._dialog_open = True
         self.page.open(dlg)
 
+    # ------------------------------------------------------ import dialog
+
+    def _open_import_dialog(self) -> None:
+        pending: dict[str, object] = {"rows": None, "source": ""}
+
+        paste = ft.TextField(
+            label="Paste rows (CSV)",
+            hint_text="One contact per line. Start with a header line, or give "
+                      "values in column order: " + ", ".join(self.fieldnames),
+            multiline=True,
+            min_lines=8,
+            max_lines=12,
+            dense=True,
+        )
+        source_text = ft.Text("", color=ft.Colors.OUTLINE)
+        error_banner = ft.Text("", color=ft.Colors.ERROR, selectable=True)
+
+        def on_file(e: ft.FilePickerResultEvent) -> None:
+            if not e.files:
+                return
+            path = Path(e.files[0].path)
+            try:
+                rc = RingCentralCSV()
+                if is_columnar(path):
+                    rows = rc.columnar_checker(str(path))
+                else:
+                    rows = rc.parallel_checker(str(path))
+            except Exception as ex:  # noqa: BLE001 - surface to user
+                error_banner.value = f"Could not read {path.name}: {ex}"
+                self.ui.update(dlg)
+                return
+            pending["rows"] = rows
+            pending["source"] = path.name
+            source_text.value = f"{len(rows)} rows loaded from {path.name} (pasted text is ignored)"
+            error_banner.value = ""
+            self.ui.update(dlg)
+
+        def do_import(e=None) -> None:
+            rc = self._engine()
+            try:
+                rows = pending["rows"]
+                if rows is None:
+                    rows = rc.rows_from_text(paste.value or "")
+                if not rows:
+                    error_banner.value = "Nothing to import — paste rows or choose a file."
+                    self.ui.update(dlg)
+                    return
+                added = rc.append_rows(self.csv_data, rows)
+                self.book.changed()
+            except BulkAppendError as ex:
+                error_banner.value = str(BulkAppendError(ex.errors, limit=50))
+                self.ui.update(dlg)
+                return
+            except ValueError as ex:
+                error_banner.value = str(ex)
+                self.ui.update(dlg)
+                return
+
+            do_close()
+            self._after_data_change()
+            self.notify(f"Imported {len(added)} row{'s' if len(added) != 1 else ''}")
+
+        def do_close(e=None) -> None:
+            self._dialog_open = False
+            self.page.close(dlg)
+
+        self.import_picker.on_result = on_file
+        dlg = ft.AlertDialog(
+            modal=True,
+            title=ft.Text("Import rows into current book"),
+            content=ft.Container(
+                width=640,
+                height=460,
+                content=ft.Column(
+                    [
+                        error_banner,
+                        ft.Row(
+                            [
+                                ft.OutlinedButton(
+                                    "From file…", icon=ft.Icons.FOLDER_OPEN,
+                                    on_click=lambda e: self.import_picker.pick_files(
+                                        dialog_title="Import rows from",
+                                        allowed_extensions=["csv", *(x.lstrip(".") for x in COLUMNAR_SUFFIXES)],
+                                        allow_multiple=False,
+                                    ),
+                                ),
+                                source_text,
+                            ],
+                            vertical_alignment=ft.CrossAxisAlignment.CENTER,
+                        ),
+                        paste,
+                    ],
+                    spacing=10,
+                    scroll=ft.ScrollMode.AUTO,
+                    tight=True,
+                ),
+            ),
+            actions=[
+                ft.TextButton("Cancel", on_click=do_close),
+                ft.FilledButton("Import", icon=ft.Icons.CHECK, on_click=do_import),
+            ],
+            actions_alignment=ft.MainAxisAlignment.END,
+            on_dismiss=lambda e: setattr(self, "_dialog_open", False),
+        )
+        self._dialog_open = True
+        self.page.open(dlg)
+
+    # ----------------------------------------------------- similar dialog
+
+    def _open_similar_dialog(self, clusters: list, limit: int = 100) -> None:
+        rc = self._engine()
+        body = ft.Column(spacing=10, scroll=ft.ScrollMode.AUTO, tight=True)
+
+        def summary(i: int) -> str:
+            r = self.csv_data[i]
+            name = f"{r.get('First Name', '')} {r.get('Surname', '')}".strip()
+            numbers = [
+                str(v) for k, v in r.items()
+                if v and rc._is_phone_field(k)
+            ]
+            parts = [name or "(no name)", r.get("Email", ""), r.get("Company", ""), *numbers]
+            return f"Row {i + 1}: " + "  ·  ".join(p for p in parts if p)
+
+        def populate(clusters: list) -> bool:
+            controls: list[ft.Control] = []
+            for n, cluster in enumerate(clusters[:limit], start=1):
+                lines: list[ft.Control] = [
+                    ft.Text(
+                        f"Group {n}  ·  {len(cluster.rows)} rows  ·  score {cluster.score:.2f}",
+                        weight=ft.FontWeight.BOLD,
+                    )
+                ]
+                for i in cluster.rows:
+                    lines.append(
+                        ft.Row(
+                            [
+                                ft.Text(summary(i), expand=True, selectable=True),
+                                ft.TextButton(
+                                    "Keep & merge",
+                                    icon=ft.Icons.CALL_MERGE,
+                                    tooltip="Keep this row, fill its blanks from the others and delete them",
+                                    on_click=lambda e, keep=i, rows=cluster.rows: do_merge(keep, rows),
+                                ),
+                            ],
+                            vertical_alignment=ft.CrossAxisAlignment.CENTER,
+                        )
+                    )
+                controls.append(
+                    ft.Card(content=ft.Container(ft.Column(lines, spacing=4), padding=10))
+                )
+            if len(clusters) > limit:
+                controls.append(
+                    ft.Text(f"…and {len(clusters) - limit} more groups.", color=ft.Colors.OUTLINE)
+                )
+            body.controls = controls
+            return bool(clusters)
+
+        def do_merge(keep: int, rows: list[int]) -> None:
+            rc.merge_near_duplicates(self.csv_data, keep, [i for i in rows if i != keep])
+            self.book.changed()
+            self.selected_index = None
+            self._exit_dupes_view_if_resolved()
+            self._after_data_change()
+            if not populate(rc.find_near_duplicates(self.csv_data)):
+                do_close()
+                self.notify("All similar contacts merged")
+                return
+            self.ui.update(dlg)
+
+        def do_close(e=None) -> None:
+            self._dialog_open = False
+            self.page.close(dlg)
+
+        populate(clusters)
+        dlg = ft.AlertDialog(
+            modal=True,
+            title=ft.Text("Similar contacts"),
+            content=ft.Container(width=760, height=520, content=body),
+            actions=[ft.FilledButton("Close", on_click=do_close)],
+            actions_alignment=ft.MainAxisAlignment.END,
+            on_dismiss=lambda e: setattr(self, "_dialog_open", False),
+        )
+        self._dialog_open = True
+        self.page.open(dlg)
+
     # ------------------------------------------------------------- help
 
     def _close_help(self, dlg: ft.AlertDialog) -> None:
@@ -634,13 +1302,27 @@ class AddressBookGUI:
                     scroll=ft.ScrollMode.AUTO,
                 ),
             ),
-            actions=[ft.FilledButton("Close", on_click=lambda e: self._close_help(dlg))],
-            actions_alignment=ft.MainAxisAlignment.END,
+            actions=[
+                ft.Dropdown(
+                    label="Log level",
+                    value=get_level(),
+                    options=[ft.dropdown.Option(level) for level in LOG_LEVELS],
+                    width=150,
+                    dense=True,
+                    on_change=self._on_log_level_change,
+                ),
+                ft.FilledButton("Close", on_click=lambda e: self._close_help(dlg)),
+            ],
+            actions_alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
             on_dismiss=lambda e: setattr(self, "_dialog_open", False),
         )
         self._dialog_open = True
         self.page.open(dlg)
 
+    def _on_log_level_change(self, e: ft.ControlEvent) -> None:
+        set_level(e.control.value)
+        self.notify(f"Log level: {e.control.value}")
+
     # ------------------------------------------------------------- keyboard
 
     def _quit(self) -> None:
@@ -665,9 +1347,11 @@ class AddressBookGUI:
             "n": self.do_new_address_book,
             "o": self.do_open_file,
             "a": self.do_append_row,
+            "i": self.do_import_rows,
             "e": self.do_edit_row,
             "d": self.do_delete_row,
             "f": self.do_toggle_dupes,
+            "s": self.do_review_similar,
             "w": self.do_write_csv,
             "h": self._open_help,
             "q": self._quit,
@@ -0,0 +1,111 @@
+import copy
+
+import pytest
+
+from ringcentral_csv_editor.helper.csv_helper import BulkAppendError, RingCentralCSV
+from ringcentral_csv_editor.helper.registry import NumberRegistry
+from ringcentral_csv_editor.helper.rules import RuleSet
+
+FIELDS = ["First Name", "Surname", "Mobile Number", "Business Number", "External Id"]
+
+
+def _row(first, mobile="", business="", ext=""):
+    return {"First Name": first, "Surname": "Lee", "Mobile Number": mobile, "Business Number": business, "External Id": ext}
+
+
+def _book(rules=None, registry=None):
+    rc = RingCentralCSV(rules=rules or RuleSet({"External Id": {"unique": True}}), registry=registry)
+    rc.fieldnames = FIELDS
+    data = [rc.normalise_row(_row("Ann", "0412 000 001", ext="E1")), rc.normalise_row(_row("Bob", "0412 000 002"))]
+    return rc, data
+
+
+def test_appends_cleaned_rows_and_updates_indexes():
+    rc, data = _book()
+    index = rc.number_index(data)
+
+    added = rc.append_rows(data, [_row("Cat", "0412 000 003", ext="E3"), _row("Dan", business="02 9000 0004")], index=index)
+
+    assert [r["First Name"] for r in data] == ["Ann", "Bob", "Cat", "Dan"]
+    assert added == data[2:]
+    assert added[0]["Mobile Number"] == "+61412000003"
+    assert index["+61412000003"] == (2, "Mobile Number")
+    assert index["+61290000004"] == (3, "Business Number")
+    assert rc.unique_index(data).counts["External Id"]["E3"] == 1
+
+
+def test_one_bad_row_rejects_the_whole_batch():
+    rc, data = _book()
+    index = rc.number_index(data)
+    before, index_before = copy.deepcopy(data), dict(index)
+    unique_before = copy.deepcopy(rc.unique_index(data).counts)
+
+    batch = [
+        _row("Cat", "0412 000 003"),           # fine
+        _row("Dan9"),                          # invalid name
+        _row("Eve", "0412 000 001"),           # already in the book
+        _row("Fay", "0412 000 003"),           # already earlier in the batch
+        _row("Gus", "0412 000 005", "0412 000 005"),  # twice in one row
+        _row("Hal", ext="E1"),                 # unique column taken in the book
+        _row("Ivy", ext="E9"),                 # fine
+        _row("Jo", ext="E9"),                  # unique column taken earlier in the batch
+    ]
+    with pytest.raises(BulkAppendError) as ex:
+        rc.append_rows(data, batch, index=index)
+
+    errors = dict(ex.value.errors)
+    assert sorted(errors) == [2, 3, 4, 5, 6, 8]
+    assert errors[2].startswith("First Name:")
+    assert "already in row 1" in errors[3]
+    assert "already in import row 1" in errors[4]
+    assert "inside row" in errors[5]
+    assert "External Id" in errors[6] and "import row 7" in errors[8]
+    assert str(ex.value).startswith("6 row(s) rejected, nothing imported:")
+    assert data == before
+    assert index == index_before
+    assert rc.unique_index(data).counts == unique_before
+
+
+def test_existing_duplicates_are_not_re_reported():
+    rc, data = _book()
+    data.append(dict(data[0], **{"First Name": "Ann2"}))  # book already holds a duplicate
+
+    rc.append_rows(data, [_row("Cat", "0412 000 003")])
+
+    assert len(data) == 4
+
+
+def test_numbers_in_other_books_are_rejected(tmp_path):
+    registry = NumberRegistry(tmp_path / "registry.sqlite3")
+    try:
+        registry.update_book(tmp_path / "other.csv", [_row("Zed", "+61412000009")])
+        rc, data = _book(registry=registry)
+        rc.book = str(tmp_path / "mine.csv")
+
+        with pytest.raises(BulkAppendError) as ex:
+            rc.append_rows(data, [_row("Cat", "0412 000 009")])
+        assert "other.csv row 1" in ex.value.errors[0][1]
+        assert len(data) == 2
+    finally:
+        registry.close()
+
+
+def test_error_message_is_capped():
+    rc, data = _book()
+
+    with pytest.raises(BulkAppendError) as ex:
+        rc.append_rows(data, [_row(f"Bad{i}") for i in range(25)])
+
+    assert len(ex.value.errors) == 25
+    assert str(ex.value).endswith("…and 15 more.")
+
+
+def test_rows_from_text():
+    rc, _data = _book()
+
+    with_header = rc.rows_from_text("Surname,First Name\nLee,Cat\n\n,\nNg,Dan\n")
+    positional = rc.rows_from_text("Cat,Lee,0412 000 003\n")
+
+    assert with_header == [{"Surname": "Lee", "First Name": "Cat"}, {"Surname": "Ng", "First Name": "Dan"}]
+    assert positional == [{"First Name": "Cat", "Surname": "Lee", "Mobile Number": "0412 000 003"}]
+    assert rc.rows_from_text("  \n") == []
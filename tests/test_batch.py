@@ -0,0 +1,113 @@
+import csv
+
+import pytest
+
+from ringcentral_csv_editor.helper.batch import BatchJob
+from ringcentral_csv_editor.helper.rules import RuleSet
+
+FIELDS = ["First Name", "Surname", "Mobile Number", "External Id"]
+RULES = {"External Id": {"unique": True}}
+
+
+class Interrupted(Exception):
+    pass
+
+
+def _write_input(path, n=60):
+    with path.open("w", newline="", encoding="utf-8") as f:
+        f.write("Exported by some tool\r\n")
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        for i in range(n):
+            first = "Ann2" if i % 11 == 5 else "Ann"  # invalid: digit in a name
+            number = f"+6141234{i % 40:04d}"  # repeats after 40 rows: duplicates
+            ext = f"E{i % 50}"  # repeats after 50 rows: unique-rule clashes
+            writer.writerow([first, "Lee" + "abcdefghij"[i % 10], number, ext])
+
+
+def _job(src, out, rules=RULES):
+    return BatchJob(src, out, checkpoint_every=7, rules=RuleSet(rules))
+
+
+def _run(job, **kwargs):
+    # The index is removed when the run completes; keep its final contents
+    final = {}
+
+    def progress(state):
+        final["index"] = job.index_path.read_bytes()
+
+    state = job.run(progress=progress, **kwargs)
+    return state, final["index"]
+
+
+def _outputs(job):
+    return job.out_path.read_bytes(), job.issues_path.read_bytes()
+
+
+def test_resume_matches_uninterrupted_run(tmp_path):
+    src = tmp_path / "in.csv"
+    _write_input(src)
+    whole = _job(src, tmp_path / "whole" / "out.csv")
+    whole_state, whole_index = _run(whole)
+
+    job = _job(src, tmp_path / "resumed" / "out.csv")
+    calls = []
+
+    def die(state):
+        calls.append(state["rows_read"])
+        if len(calls) == 3:
+            raise Interrupted
+
+    with pytest.raises(Interrupted):
+        job.run(progress=die)
+    assert job.checkpoint_path.exists()
+    # A crash part-way through the next checkpoint leaves unrecorded bytes
+    for path in (job.out_path, job.issues_path, job.index_path):
+        with path.open("ab") as f:
+            f.write(b"half-written,row\r\n")
+
+    state, index = _run(job)
+
+    assert _outputs(job) == _outputs(whole)
+    assert index == whole_index
+    assert state["rows_read"] == whole_state["rows_read"] == 60
+    assert state["rows_emitted"] == whole_state["rows_emitted"] > 0
+    assert state["invalid"] == whole_state["invalid"] > 0
+    assert state["duplicates"] == whole_state["duplicates"] > 0
+    assert not job.checkpoint_path.exists() and not job.index_path.exists()
+
+
+def test_resume_refused_when_rules_change(tmp_path):
+    src = tmp_path / "in.csv"
+    _write_input(src)
+    out = tmp_path / "out.csv"
+
+    def die(state):
+        raise Interrupted
+
+    with pytest.raises(Interrupted):
+        _job(src, out).run(progress=die)
+
+    edited = _job(src, out, rules={"External Id": {"unique": True, "max_length": 2}})
+    with pytest.raises(ValueError, match="Rules changed"):
+        edited.run()
+    # Same rules written in another order still resume
+    same = BatchJob(src, out, checkpoint_every=7, rules=RuleSet({"external id": {"unique": True}}))
+    assert same.load_checkpoint() is not None
+    assert edited.run(restart=True)["rows_read"] == 60
+
+
+def test_resume_refused_when_input_changes(tmp_path):
+    src = tmp_path / "in.csv"
+    _write_input(src)
+    out = tmp_path / "out.csv"
+
+    def die(state):
+        raise Interrupted
+
+    with pytest.raises(Interrupted):
+        _job(src, out).run(progress=die)
+    _write_input(src, n=61)
+
+    with pytest.raises(ValueError, match="Input changed"):
+        _job(src, out).run()
@@ -0,0 +1,109 @@
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.parquet  # noqa: E402
+
+from ringcentral_csv_editor.helper.columnar import read_columnar, write_columnar  # noqa: E402
+from ringcentral_csv_editor.helper.csv_helper import RingCentralCSV  # noqa: E402
+from ringcentral_csv_editor.helper.rules import RuleSet  # noqa: E402
+from ringcentral_csv_editor.helper.service import BookService  # noqa: E402
+
+# Deliberately not alphabetical: the stored order must win over the schema's
+FIELDS = ["Surname", "First Name", "Mobile Number", "Notes"]
+ROWS = [
+    {"Surname": "Lee", "First Name": "Ann", "Mobile Number": "0412 345 678", "Notes": "héllo, \"quoted\"\nline"},
+    {"Surname": "Ng", "First Name": "Bob", "Mobile Number": "", "Notes": None},
+]
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".arrow", ".feather"])
+def test_round_trip(tmp_path, suffix):
+    path = write_columnar(FIELDS, ROWS, tmp_path / f"book{suffix}")
+
+    fieldnames, rows, stamp = read_columnar(path)
+
+    assert fieldnames == FIELDS
+    assert rows == [{**r, "Notes": r["Notes"] or ""} for r in ROWS]
+    assert stamp is None
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".arrow"])
+def test_column_projection(tmp_path, suffix):
+    path = write_columnar(FIELDS, ROWS, tmp_path / f"book{suffix}", columns=["Mobile Number", "First Name"])
+
+    assert read_columnar(path)[0] == ["Mobile Number", "First Name"]
+    fieldnames, rows, _stamp = read_columnar(path, columns=["First Name"])
+    assert fieldnames == ["First Name"]
+    assert rows == [{"First Name": "Ann"}, {"First Name": "Bob"}]
+
+    with pytest.raises(ValueError, match="Unknown column"):
+        write_columnar(FIELDS, ROWS, tmp_path / f"bad{suffix}", columns=["Fax"])
+
+
+def test_foreign_file_columns_are_cast_to_strings(tmp_path):
+    path = tmp_path / "foreign.parquet"
+    table = pa.table({
+        "First Name": pa.array(["Ann", None]),
+        "Surname": pa.array(["Lee", "Ng"]),
+        "Extension": pa.array([101, None], type=pa.int64()),
+    })
+    pa.parquet.write_table(table, path)
+
+    fieldnames, rows, stamp = read_columnar(path)
+
+    assert fieldnames == ["First Name", "Surname", "Extension"]
+    assert rows == [
+        {"First Name": "Ann", "Surname": "Lee", "Extension": "101"},
+        {"First Name": "", "Surname": "Ng", "Extension": ""},
+    ]
+    assert stamp is None
+
+
+def test_unknown_suffix_is_refused(tmp_path):
+    with pytest.raises(ValueError, match="Not a Parquet/Arrow file"):
+        write_columnar(FIELDS, ROWS, tmp_path / "book.csv")
+
+
+def test_cleaned_flag_only_trusted_under_same_region_and_rules(tmp_path):
+    rows = [{k: v or "" for k, v in r.items() if k != "Notes"} for r in ROWS]
+    rules = RuleSet({"Notes": {"max_length": 5}})
+    writer = RingCentralCSV(rules=rules)
+    path = writer.columnar_writer(FIELDS[:3], rows, tmp_path / "clean.parquet")
+
+    same = RingCentralCSV(rules=RuleSet({"notes": {"max_length": 5}}))
+    loaded = same.columnar_checker(str(path))
+    assert same.normalised is True
+    assert loaded[0]["Mobile Number"] == "+61412345678"
+
+    for other in (RingCentralCSV(rules=rules, region="GB"), RingCentralCSV(), RingCentralCSV(rules=RuleSet({"Notes": {"max_length": 6}}))):
+        other.columnar_checker(str(path))
+        assert other.normalised is False
+
+    raw = RingCentralCSV(rules=rules).columnar_writer(FIELDS[:3], rows, tmp_path / "raw.parquet", normalise=False)
+    check = RingCentralCSV(rules=rules)
+    check.columnar_checker(str(raw))
+    assert check.normalised is False
+    # Reading a CSV afterwards clears it
+    same.checker(str(_csv(tmp_path)))
+    assert same.normalised is False
+
+
+def _csv(tmp_path):
+    path = tmp_path / "book.csv"
+    path.write_text("First Name,Surname\nAnn,Lee\n", encoding="utf-8")
+    return path
+
+
+def test_service_skips_normalising_a_cleaned_file(tmp_path, monkeypatch):
+    rows = [{k: v or "" for k, v in r.items() if k != "Notes"} for r in ROWS]
+    path = RingCentralCSV().columnar_writer(FIELDS[:3], rows, tmp_path / "clean.parquet")
+
+    def fail(self, row):
+        raise AssertionError("normalise_row called")
+
+    monkeypatch.setattr(RingCentralCSV, "normalise_row", fail)
+    service = BookService(path)
+    service.load()
+
+    assert len(service.rows) == 2 and service.invalid == []
+    assert service.lookup("0412 345 678")["found"]
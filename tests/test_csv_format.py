@@ -0,0 +1,88 @@
+import codecs
+
+import pytest
+
+from ringcentral_csv_editor.helper.csv_format import CsvFormat, sniff_bytes, sniff_delimiter, sniff_format
+from ringcentral_csv_editor.helper.csv_helper import RingCentralCSV
+
+TEXT = "First Name;Surname;Company\r\nZoë;Ng;\"Smith, Jones; Co\"\r\nRené;Lee;Acme\r\n"
+
+
+def _file(tmp_path, data, name="book.csv"):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return path
+
+
+@pytest.mark.parametrize("data, expected", [
+    (TEXT.encode("utf-8"), CsvFormat("utf-8", ";", "\r\n")),
+    (TEXT.encode("cp1252"), CsvFormat("cp1252", ";", "\r\n")),
+    (codecs.BOM_UTF8 + TEXT.encode("utf-8"), CsvFormat("utf-8-sig", ";", "\r\n")),
+    (TEXT.encode("utf-16"), CsvFormat("utf-16", ";", "\r\n")),
+    (TEXT.encode("utf-16-le"), CsvFormat("utf-16-le", ";", "\r\n")),
+    (TEXT.encode("utf-16-be"), CsvFormat("utf-16-be", ";", "\r\n")),
+    (TEXT.encode("utf-32"), CsvFormat("utf-32", ";", "\r\n")),
+    (TEXT.replace(";", "\t").replace("\r\n", "\n").encode("utf-8"), CsvFormat("utf-8", "\t", "\n")),
+    # 0x81 is undefined in cp1252
+    ("First Name,Surname\nAnn,Le\x81e\n".encode("latin-1"), CsvFormat("latin-1", ",", "\n")),
+])
+def test_sniff_format(tmp_path, data, expected):
+    assert sniff_format(_file(tmp_path, data)) == expected
+
+
+def test_sniff_delimiter():
+    assert sniff_delimiter('a,b,c\n"x;y;z",2,3\n') == ","
+    assert sniff_delimiter("a|b\nc|d\n") == "|"
+    assert sniff_delimiter("just one column\n") == ","
+
+
+def test_cut_sample_ignores_partial_character():
+    data = ("First Name,Surname\n" + "Zoë,Lee\n" * 10).encode("utf-8")
+    cut = data.index("ë".encode("utf-8")) + 1  # halfway through the ë
+
+    assert sniff_bytes(data[:cut], complete=False).encoding == "utf-8"
+    assert sniff_bytes(data[:cut], complete=True).encoding == "cp1252"
+
+
+def test_describe_and_fallback():
+    assert CsvFormat("cp1252", ";", "\n").describe() == "Windows-1252 · semicolon · LF"
+    assert CsvFormat().describe() == "UTF-8 · comma · CRLF"
+    assert CsvFormat().fallback() == CsvFormat("cp1252")
+    assert CsvFormat("cp1252").fallback() == CsvFormat("latin-1")
+    assert CsvFormat("latin-1").fallback() is None
+    assert CsvFormat("utf-8-sig").byte_safe and not CsvFormat("utf-16").byte_safe
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "cp1252", "utf-8-sig", "utf-16"])
+def test_checker_reads_and_writer_keeps_format(tmp_path, encoding):
+    path = _file(tmp_path, TEXT.encode(encoding))
+    rc = RingCentralCSV()
+
+    rows = rc.checker(str(path))
+
+    assert rc.csv_format == CsvFormat(encoding, ";", "\r\n")
+    assert [r["First Name"] for r in rows] == ["Zoë", "René"]
+    assert rows[0]["Company"] == "Smith, Jones; Co"
+    out = rc.writer(rc.fieldnames, rows, out_path=tmp_path / "out.csv", csv_format=rc.csv_format)
+    assert out.read_bytes() == path.read_bytes()
+
+
+def test_late_cp1252_byte_falls_back(tmp_path):
+    # Past both the head and the tail the sniffer reads
+    middle = "Zoë,Lee,Acme\r\n".encode("cp1252")
+    filler = b"Ann,Lee,Acme\r\n" * 10000
+    path = _file(tmp_path, b"First Name,Surname,Company\r\n" + filler + middle + filler)
+    assert sniff_format(path).encoding == "utf-8"
+
+    rc = RingCentralCSV()
+    rows = rc.checker(str(path))
+
+    assert rc.csv_format.encoding == "cp1252"
+    assert len(rows) == 20001 and rows[10000]["First Name"] == "Zoë"
+
+
+def test_undecodable_file_is_refused(tmp_path):
+    path = _file(tmp_path, "First Name,Surname\nAnn,Lee\n".encode("utf-16-le")[:-1])
+
+    with pytest.raises(ValueError, match="Could not decode book.csv as utf-16-le"):
+        RingCentralCSV().checker(str(path))
@@ -0,0 +1,73 @@
+from ringcentral_csv_editor.helper.csv_helper import RingCentralCSV
+from ringcentral_csv_editor.helper.union_find import UnionFind
+
+
+def _row(name, mobile="", business=""):
+    return {"First Name": name, "Surname": "Lee", "Mobile Number": mobile, "Business Number": business}
+
+
+def test_union_find_groups():
+    uf = UnionFind(7)
+    uf.union(5, 1)
+    uf.union(1, 3)
+    uf.union(4, 6)
+
+    assert uf.find(5) == uf.find(3)
+    assert uf.find(0) != uf.find(1)
+    assert uf.groups() == [[1, 3, 5], [4, 6]]
+    assert uf.groups(min_size=1) == [[0], [1, 3, 5], [2], [4, 6]]
+    assert uf.groups(min_size=3) == [[1, 3, 5]]
+
+
+def test_union_find_long_chain_stays_shallow():
+    n = 10000
+    uf = UnionFind(n)
+    for i in range(1, n):
+        uf.union(i - 1, i)
+
+    assert uf.groups() == [list(range(n))]
+    assert uf.size[uf.find(0)] == n
+
+
+def test_clusters_follow_chains():
+    rows = [
+        _row("Ann", mobile="+61400000001"),
+        _row("Bob", mobile="+61400000002", business="+61400000001"),
+        _row("Dan", mobile="+61400000009"),
+        _row("Cat", mobile="+61400000002"),
+        _row("Eve", business="+61400000009"),
+        _row("Fay", mobile="+61400000005"),
+    ]
+
+    clusters = RingCentralCSV().find_duplicate_clusters(rows)
+
+    assert clusters == [
+        ([0, 1, 3], ["+61400000001", "+61400000002"]),
+        ([2, 4], ["+61400000009"]),
+    ]
+
+
+def test_keep_only_removes_rows_sharing_a_number():
+    # Ann and Bob share X, Bob and Cat share Y: one cluster, but Cat shares
+    # nothing with Ann, so keeping Ann must not delete Cat.
+    rows = [
+        _row("Ann", mobile="+61400000001"),
+        _row("Bob", mobile="+61400000002", business="+61400000001"),
+        _row("Cat", mobile="+61400000002"),
+    ]
+    rc = RingCentralCSV()
+    group = rc.find_duplicate_clusters(rows)[0][0]
+
+    assert group == [0, 1, 2]
+    assert rc.rows_sharing_numbers(rows, 0, group) == [1]
+    assert rc.rows_sharing_numbers(rows, 1, group) == [0, 2]
+    assert rc.rows_sharing_numbers(rows, 2, group) == [1]
+
+
+def test_keep_ignores_blank_and_non_phone_fields():
+    rows = [
+        {"First Name": "Ann", "Surname": "Lee", "Mobile Number": "", "Notes": "+61400000001"},
+        {"First Name": "Bob", "Surname": "Lee", "Mobile Number": "", "Notes": "+61400000001"},
+    ]
+
+    assert RingCentralCSV().rows_sharing_numbers(rows, 0, [0, 1]) == []
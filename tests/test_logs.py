@@ -0,0 +1,89 @@
+import logging
+
+import pytest
+
+from ringcentral_csv_editor.helper import logs
+from ringcentral_csv_editor.helper.logs import RateLimitFilter
+
+
+def _record(created, line=10, level=logging.INFO, name="ringcentral_csv_editor.x", msg="row %d"):
+    record = logging.LogRecord(name, level, __file__, line, msg, (1,), None)
+    record.created = created
+    return record
+
+
+def test_rate_limit_burst_then_drop():
+    limit = RateLimitFilter(burst=3, interval=1.0)
+
+    passed = [limit.filter(_record(100.0 + i / 100)) for i in range(10)]
+
+    assert passed == [True] * 3 + [False] * 7
+
+
+def test_rate_limit_reports_dropped_count_in_next_window():
+    limit = RateLimitFilter(burst=2, interval=1.0)
+    for i in range(5):
+        limit.filter(_record(100.0 + i / 100))
+
+    record = _record(101.5)
+    assert limit.filter(record)
+    assert record.getMessage() == "row 1 [3 similar message(s) suppressed]"
+    follow_up = _record(101.6)
+    assert limit.filter(follow_up) and follow_up.getMessage() == "row 1"
+
+
+def test_rate_limit_is_per_call_site_and_level():
+    limit = RateLimitFilter(burst=1, interval=1.0)
+
+    assert limit.filter(_record(100.0, line=10))
+    assert not limit.filter(_record(100.1, line=10))
+    assert limit.filter(_record(100.1, line=11))
+    assert limit.filter(_record(100.1, line=10, name="other"))
+    assert all(limit.filter(_record(100.2, line=10, level=logging.WARNING)) for _ in range(5))
+
+
+@pytest.fixture
+def logged(tmp_path):
+    path = tmp_path / "app.log"
+    logs.setup_logging(logging.INFO, path=path, max_bytes=2000, backup_count=2)
+    yield path
+    logs.stop_logging()
+    logging.getLogger(logs.APP_LOGGER).setLevel(logging.NOTSET)
+
+
+def test_setup_logging_writes_through_the_queue(logged):
+    log = logging.getLogger("ringcentral_csv_editor.test")
+    log.info("hello %s", "there")
+    log.debug("not at INFO")
+    logs.stop_logging()
+
+    text = logged.read_text(encoding="utf-8")
+    assert "INFO ringcentral_csv_editor.test: hello there" in text
+    assert "not at INFO" not in text
+
+
+def test_setup_logging_leaves_record_attributes_alone(logged):
+    assert logging.logThreads and logging.logProcesses and logging.logMultiprocessing
+    record = logging.getLogger("x").makeRecord("x", logging.INFO, __file__, 1, "m", (), None)
+    assert record.threadName and record.process
+
+
+def test_rotation(logged):
+    log = logging.getLogger("ringcentral_csv_editor.test")
+    for i in range(200):
+        log.warning("line %03d %s", i, "x" * 40)
+    logs.stop_logging()
+
+    rotated = sorted(p.name for p in logged.parent.glob("app.log*"))
+    assert rotated == ["app.log", "app.log.1", "app.log.2"]
+    assert all(p.stat().st_size <= 2000 for p in logged.parent.glob("app.log*"))
+
+
+def test_set_level(logged):
+    logs.set_level("DEBUG")
+    assert logs.get_level() == "DEBUG"
+    # Calling setup again only changes the level
+    logs.setup_logging("WARNING")
+    assert logs.get_level() == "WARNING"
+    with pytest.raises(ValueError, match="Unknown log level"):
+        logs.set_level("LOUD")
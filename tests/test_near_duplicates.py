@@ -0,0 +1,123 @@
+import random
+
+import pytest
+
+from ringcentral_csv_editor.helper import near_duplicates
+from ringcentral_csv_editor.helper.csv_helper import RingCentralCSV
+from ringcentral_csv_editor.helper.near_duplicates import (
+    _grams,
+    _prepare,
+    blocking_keys,
+    find_near_duplicates,
+    merge_rows,
+    score_pair,
+    soundex,
+)
+
+
+def _row(first, surname, email="", company="", mobile=""):
+    return {"First Name": first, "Surname": surname, "Email": email, "Company": company, "Mobile Number": mobile}
+
+
+def _score(a, b):
+    return score_pair(_grams(_prepare(a)), _grams(_prepare(b)))
+
+
+@pytest.mark.parametrize("name, code", [
+    ("Robert", "R163"), ("Rupert", "R163"), ("Ashcraft", "A261"),
+    ("Tymczak", "T522"), ("Pfister", "P236"), ("Lee", "L000"), ("O'Brien", "O165"), ("42", ""),
+])
+def test_soundex(name, code):
+    assert soundex(name) == code
+
+
+def test_blocking_keys():
+    keys = blocking_keys("jon", "smith", "jon.smith+crm@example.com")
+
+    assert keys == {"e:jon.smith+crm@example.com", "l:jon.smith", "t:jon smith", "p:S530j"}
+    # Names the wrong way round share the sorted-token key
+    assert "t:jon smith" in blocking_keys("smith", "jon", "")
+    assert blocking_keys("", "", "") == set()
+
+
+def test_scores():
+    ann = _row("Ann", "Lee", "ann@acme.com", "Acme")
+
+    assert _score(ann, dict(ann)) == 1.0
+    assert _score(ann, _row("Lee", "Ann", "ann@acme.com", "Acme")) == 1.0
+    assert _score(ann, _row("Anne", "Lee", "ANN@acme.com", "Acme Pty")) > 0.85
+    assert _score(ann, _row("Bob", "Stone", "bob@other.com", "Acme")) < 0.5
+    # Company alone is not enough evidence
+    assert _score(_row("", "", company="Acme"), _row("", "", company="Acme")) == 0.0
+    # Blank fields don't count against a pair
+    assert _score(ann, _row("Ann", "Lee")) == 1.0
+
+
+def test_clusters():
+    rows = [
+        _row("Jon", "Smith", "jon@acme.com", "Acme"),
+        _row("Ann", "Lee", "ann@acme.com"),
+        _row("John", "Smith", "jon@acme.com", "Acme Pty"),
+        _row("Smith", "Jon", "", "Acme"),
+        _row("Bob", "Stone"),
+        _row("Anne", "Lee", "ann@acme.com"),
+    ]
+
+    clusters = find_near_duplicates(rows)
+
+    assert [c.rows for c in clusters] == [[0, 2, 3], [1, 5]]
+    assert all(0.85 <= c.score <= 1.0 for c in clusters)
+    assert {(i, j) for i, j, _s in clusters[0].pairs} <= {(0, 2), (0, 3), (2, 3)}
+    assert find_near_duplicates(rows, threshold=1.01) == []
+
+
+def test_blocking_avoids_comparing_every_pair(monkeypatch):
+    calls = []
+
+    def counting(a, b):
+        calls.append(1)
+        return score_pair(a, b)
+
+    monkeypatch.setattr(near_duplicates, "score_pair", counting)
+    rng = random.Random(1)
+    syllables = ["ka", "lo", "mi", "ne", "po", "ru", "sa", "te", "vi", "zo", "ba", "de", "fu", "gi", "ho", "ja"]
+
+    def word():
+        return "".join(rng.choice(syllables) for _ in range(3)).title()
+
+    rows = [_row(word(), word(), f"user{i}@example.com") for i in range(2000)]
+    rows.append(dict(rows[10]))
+
+    clusters = find_near_duplicates(rows)
+
+    assert [c.rows for c in clusters] == [[10, 2000]]
+    assert len(calls) < 5000  # all pairs would be ~2 million
+
+
+def test_oversized_blocks_are_skipped():
+    rows = [_row("Ann", "Lee", "ann@acme.com") for _ in range(5)]
+
+    assert find_near_duplicates(rows, max_block=3) == []
+    assert [c.rows for c in find_near_duplicates(rows, max_block=5)] == [[0, 1, 2, 3, 4]]
+
+
+def test_merge_fills_blanks_without_repeating_numbers():
+    rows = [
+        {"First Name": "Ann", "Email": "", "Mobile Number": "+61400000001", "Business Number": ""},
+        {"First Name": "Anne", "Email": "ann@acme.com", "Mobile Number": "+61400000009", "Business Number": "+61400000001"},
+        {"First Name": "A", "Email": "other@acme.com", "Mobile Number": "", "Business Number": "+61400000002"},
+    ]
+
+    merged = merge_rows(rows, 0, [1, 2], phone_fields={"Mobile Number", "Business Number"})
+
+    assert merged == {"First Name": "Ann", "Email": "ann@acme.com", "Mobile Number": "+61400000001", "Business Number": "+61400000002"}
+    assert rows[0]["Email"] == ""
+
+
+def test_merge_near_duplicates_deletes_the_others():
+    rows = [_row("Ann", "Lee", "ann@acme.com"), _row("Bob", "Stone"), _row("Anne", "Lee", "", "Acme", "+61400000001")]
+
+    merged = RingCentralCSV().merge_near_duplicates(rows, 0, [2])
+
+    assert rows == [merged, _row("Bob", "Stone")]
+    assert merged["Company"] == "Acme" and merged["Mobile Number"] == "+61400000001"
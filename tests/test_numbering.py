@@ -0,0 +1,146 @@
+import random
+import re
+
+import pytest
+
+from ringcentral_csv_editor.helper import numbering
+from ringcentral_csv_editor.helper.csv_helper import RingCentralCSV
+from ringcentral_csv_editor.helper.numbering import NUMBERING_PLANS, PhoneNormaliser, normalise_number
+
+AU_ERROR = NUMBERING_PLANS["AU"]["error"]
+AU_PLUS_ERROR = NUMBERING_PLANS["AU"]["plus_error"]
+
+
+def _old_au(value):
+    '''The AU-only validator PhoneNormaliser replaced, kept as the reference.'''
+    number = re.sub(r"[^\d+]", "", value.strip())
+    if number.startswith("+"):
+        if re.fullmatch(r"\+61(4\d{8}|[2378]\d{8}|13\d{4}|1(300|800)\d{6})", number):
+            return number
+        raise ValueError(AU_PLUS_ERROR)
+    number = re.sub(r"\D", "", number)
+    for national in (r"04\d{8}", r"0[2378]\d{8}"):
+        if re.fullmatch(national, number):
+            return "+61" + number[1:]
+    if re.fullmatch(r"13\d{4}|1(300|800)\d{6}", number):
+        return "+61" + number
+    if re.fullmatch(r"61(4\d{8}|[2378]\d{8}|13\d{4}|1(300|800)\d{6})", number):
+        return "+" + number
+    raise ValueError(AU_ERROR)
+
+
+def _outcome(fn, value):
+    try:
+        return fn(value)
+    except ValueError as ex:
+        return f"error: {ex}"
+
+
+def test_au_matches_the_old_validator():
+    rng = random.Random(7)
+    leads = ["", "0", "04", "02", "07", "05", "61", "614", "612", "615", "13", "1300", "1800", "1900",
+             "6113", "611300", "+", "+61", "+614", "+6113", "+611800", "+64", "9"]
+    values = []
+    for _ in range(5000):
+        digits = "".join(rng.choice("0123456789") for _ in range(rng.randint(0, 11)))
+        value = rng.choice(leads) + digits
+        # Sprinkle the punctuation people type
+        values.append("".join(ch + rng.choice(["", "", "", " ", "-", ")", "("]) for ch in value))
+
+    for value in values + ["0412 345 678", "(02) 9876 5432", "131 313", "1300-123-456", "+61 4 1234 5678", "+61+412345678", ""]:
+        old = _outcome(_old_au, value)
+        if old.startswith("error") and value.lstrip("( ").startswith("+") and not re.sub(r"\D", "", value).startswith("61"):
+            continue  # other countries' +numbers are accepted now
+        assert _outcome(normalise_number, value) == old, value
+
+
+@pytest.mark.parametrize("region, value, expected", [
+    ("AU", "0412 345 678", "+61412345678"),
+    ("AU", "08 8123 4567", "+61881234567"),
+    ("AU", "13 13 13", "+61131313"),
+    ("AU", "1800 123 456", "+611800123456"),
+    ("AU", "0011 44 7700 900123", "+447700900123"),
+    ("AU", "+44 7700 900123", "+447700900123"),
+    ("NZ", "021 123 4567", "+64211234567"),
+    ("NZ", "09-123 4567", "+6491234567"),
+    ("NZ", "0800 123 456", "+64800123456"),
+    ("NZ", "00 61 412 345 678", "+61412345678"),
+    ("GB", "07700 900123", "+447700900123"),
+    ("GB", "020 7946 0018", "+442079460018"),
+    ("GB", "44 20 7946 0018", "+442079460018"),
+    ("IE", "087 123 4567", "+353871234567"),
+    ("IE", "(01) 234 5678", "+35312345678"),
+    ("US", "(415) 555-2671", "+14155552671"),
+    ("US", "1-415-555-2671", "+14155552671"),
+    ("US", "011 61 2 9876 5432", "+61298765432"),
+    ("SG", "9123 4567", "+6591234567"),
+    ("SG", "6123-4567", "+6561234567"),
+    ("SG", "000 64 21 123 4567", "+64211234567"),
+])
+def test_regions(region, value, expected):
+    assert normalise_number(value, region) == expected
+
+
+@pytest.mark.parametrize("region, value, message", [
+    ("AU", "+999 123", re.escape(AU_PLUS_ERROR)),
+    ("GB", "+999 123", "Unsupported country code"),
+    ("GB", "+44 123", r"Expected United Kingdom number in E\.164 format \(\+44\.\.\.\)"),
+    ("AU", "0512 345 678", re.escape(AU_ERROR)),
+    ("NZ", "012", "Not a valid New Zealand phone number"),
+    ("US", "555-2671", "Not a valid United States / Canada phone number"),
+    ("XX", "0412 345 678", "Unknown region 'XX'"),
+])
+def test_errors(region, value, message):
+    with pytest.raises(ValueError, match=message):
+        normalise_number(value, region)
+
+
+def test_national_form_wins_over_overlapping_code_form():
+    # "131312" is both a national 131xxx number and code 13 + "1312"
+    plans = {"XA": {"name": "Test", "country_code": "13", "trunk_prefix": "", "idd_prefix": "",
+                    "ranges": [{"kind": "a", "prefixes": ["131"], "lengths": [6], "no_trunk": True},
+                               {"kind": "b", "prefixes": ["1"], "lengths": [4]}]}}
+    normaliser = PhoneNormaliser(plans)
+
+    assert normaliser.normalise("131312", "XA") == "+13131312"
+    assert normaliser.normalise("1312", "XA") == "+131312"
+    assert normaliser.normalise("+13 1312", "XA") == "+131312"
+    assert normaliser.regions() == ["XA"]
+
+
+def test_register_plan(monkeypatch):
+    monkeypatch.setattr(numbering, "NUMBERING_PLANS", dict(NUMBERING_PLANS))
+    monkeypatch.setattr(numbering, "_default", None)
+    with pytest.raises(ValueError):
+        normalise_number("0101 2345", "ZZ")
+
+    numbering.register_plan("ZZ", {"name": "Zed", "country_code": "999", "trunk_prefix": "0",
+                                   "ranges": [{"kind": "any", "prefixes": ["1"], "lengths": [7]}]})
+
+    assert normalise_number("0101 2345", "ZZ") == "+9991012345"
+    assert normalise_number("+999 101 2345") == "+9991012345"
+
+
+def test_book_regions(tmp_path, monkeypatch):
+    monkeypatch.setattr(numbering, "REGIONS_PATH", tmp_path / "regions.json")
+    book = tmp_path / "book.csv"
+
+    assert numbering.book_region(book) is None
+    numbering.set_book_region(book, "NZ")
+    assert numbering.book_region(book) == "NZ"
+    assert numbering.book_region(tmp_path / "other.csv") is None
+    with pytest.raises(ValueError, match="Unknown region"):
+        numbering.set_book_region(book, "XX")
+
+    (tmp_path / "regions.json").write_text("{not json", encoding="utf-8")
+    assert numbering.book_region(book) is None
+
+
+def test_field_formatter_uses_the_book_region():
+    nz = RingCentralCSV(region="NZ")
+    nz.fieldnames = ["First Name", "Mobile Number"]
+
+    assert nz.normalise_row({"First Name": "ann", "Mobile Number": "021 1234 5678"})["Mobile Number"] == "+642112345678"
+    assert RingCentralCSV.field_formatter("Business Number", "021 1234 5678", region="NZ") == "+642112345678"
+    with pytest.raises(ValueError):
+        RingCentralCSV.field_formatter("Business Number", "021 1234 5678")
@@ -0,0 +1,69 @@
+import csv
+import mmap
+
+import pytest
+
+from ringcentral_csv_editor.helper.csv_helper import RingCentralCSV
+from ringcentral_csv_editor.helper.parallel_reader import parse_parallel, split_records
+
+FIELDS = ["First Name", "Surname", "Job Title", "Notes"]
+
+
+def _write_book(path, rows):
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        writer.writerows(rows)
+
+
+def _rows():
+    # A literal '"' in an unquoted field flips split_records' quote parity,
+    # so later boundaries are guessed inside the quoted multi-line notes.
+    rows = [["Ann", "Lee", "Desk 5'10\" wide", "plain"]]
+    for i in range(200):
+        rows.append([f"Name{i}", f"Surname{i}", "Engineer", f"line one\nline two {i}\nline three"])
+    return rows
+
+
+def _sequential(path):
+    return RingCentralCSV().checker(str(path))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_literal_quote_in_unquoted_field(tmp_path, workers):
+    path = tmp_path / "book.csv"
+    with path.open("w", newline="", encoding="utf-8") as f:
+        f.write(",".join(FIELDS) + "\r\n")
+        # Written by hand: csv.writer would quote this field
+        f.write("Ann,Lee,Desk 5'10\" wide,plain\r\n")
+        writer = csv.writer(f)
+        writer.writerows(_rows()[1:])
+
+    fieldnames, rows = parse_parallel(path, workers=workers, chunk_size=256)
+
+    assert fieldnames == FIELDS
+    assert rows == _sequential(path)
+    assert rows[0]["Job Title"] == "Desk 5'10\" wide"
+    assert all(r["Notes"].startswith("line one") for r in rows[1:])
+
+
+def test_split_records_quoted_newlines(tmp_path):
+    path = tmp_path / "book.csv"
+    _write_book(path, _rows()[1:])
+
+    fieldnames, rows = parse_parallel(path, workers=2, chunk_size=256)
+
+    assert rows == _sequential(path)
+    assert len(rows) == 200
+
+
+def test_split_records_covers_the_whole_range(tmp_path):
+    path = tmp_path / "book.csv"
+    _write_book(path, _rows()[1:])
+    data = path.read_bytes()
+
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        chunks = split_records(mm, 0, len(data), 300)
+
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(data)
+    assert all(a[1] == b[0] for a, b in zip(chunks, chunks[1:]))
@@ -0,0 +1,133 @@
+import sqlite3
+
+import pytest
+
+from ringcentral_csv_editor.helper.csv_helper import RingCentralCSV
+from ringcentral_csv_editor.helper.registry import NumberRegistry, book_key
+
+FIELDS = ["First Name", "Surname", "Mobile Number", "Business Number", "External Id"]
+
+
+def _row(first, mobile="", business="", ext=""):
+    return {"First Name": first, "Surname": "Lee", "Mobile Number": mobile, "Business Number": business, "External Id": ext}
+
+
+def _rows(n):
+    return [_row(f"Ann{i}", mobile=f"+614{i:08d}") for i in range(n)]
+
+
+def _numbers(registry, book):
+    return sorted(registry._db.execute(
+        "SELECT row, field, number FROM numbers WHERE book = ?", (book_key(book),)
+    ))
+
+
+@pytest.fixture
+def registry(tmp_path):
+    reg = NumberRegistry(tmp_path / "registry.sqlite3")
+    yield reg
+    reg.close()
+
+
+def _save(registry, path, rows, book=None, **kwargs):
+    rc = RingCentralCSV(registry=registry)
+    rc.book = book_key(book) if book else None
+    rc.writer(FIELDS, rows, out_path=path, **kwargs)
+    return rc
+
+
+def test_update_book_writes_only_the_difference(registry, tmp_path):
+    book = tmp_path / "a.csv"
+    rows = _rows(3)
+    assert registry.update_book(book, rows) == (3, 0)
+    assert registry.update_book(book, rows) == (0, 0)
+
+    rows[1]["Mobile Number"] = "+61499999999"
+    rows[2]["Business Number"] = "+61288888888"
+    assert registry.update_book(book, rows) == (2, 1)
+    assert registry.lookup("+61400000001") == []
+    assert registry.lookup("+61499999999") == [(book_key(book), 1, "Mobile Number", "")]
+
+
+def test_inserting_a_row_only_moves_the_later_entries(registry, tmp_path):
+    book = tmp_path / "a.csv"
+    rows = _rows(50)
+    registry.update_book(book, rows)
+
+    rows.insert(0, _row("New", mobile="+61411111111"))
+    assert registry.update_book(book, rows) == (1, 0)
+    assert registry.lookup("+61400000049") == [(book_key(book), 50, "Mobile Number", "")]
+
+    del rows[10]
+    assert registry.update_book(book, rows) == (0, 1)
+    assert _numbers(registry, book) == sorted(
+        (i, "Mobile Number", r["Mobile Number"]) for i, r in enumerate(rows)
+    )
+
+
+def test_conflicts_name_the_other_book(registry, tmp_path):
+    a, b = tmp_path / "a.csv", tmp_path / "b.csv"
+    registry.update_book(a, [_row("Ann", mobile="+61400000001", ext="X1")])
+    registry.update_book(b, [_row("Bob", business="+61400000002")])
+
+    found = registry.conflicts(
+        [_row("Cat", mobile="+61400000002"), _row("Dan", business="+61400000001")], exclude_book=b,
+    )
+
+    assert found == [("+61400000001", 1, "Business Number", book_key(a), 0, "Mobile Number")]
+    assert registry.lookup("+61400000001") == [(book_key(a), 0, "Mobile Number", "X1")]
+    assert "a.csv row 1" in registry.format_conflicts(found)
+
+
+def test_save_as_keeps_the_original_while_it_exists(registry, tmp_path):
+    original, copy, other = tmp_path / "tenant.csv", tmp_path / "tenant-v2.csv", tmp_path / "other.csv"
+    rows = _rows(2)
+    _save(registry, original, rows)
+
+    rc = _save(registry, copy, rows, book=original)
+
+    assert rc.book == book_key(copy)
+    assert {b for b, _n, _u in registry.books()} == {book_key(original), book_key(copy)}
+    # Another book still can't reuse the numbers the original file holds
+    found = registry.conflicts(rows[:1], exclude_book=other)
+    assert {c[3] for c in found} == {book_key(original), book_key(copy)}
+
+
+def test_save_as_drops_the_original_once_gone_or_replaced(registry, tmp_path):
+    original, copy, third = tmp_path / "tenant.csv", tmp_path / "tenant-v2.csv", tmp_path / "tenant-v3.csv"
+    rows = _rows(2)
+    _save(registry, original, rows)
+    original.unlink()
+
+    _save(registry, copy, rows, book=original)
+    assert [b for b, _n, _u in registry.books()] == [book_key(copy)]
+
+    _save(registry, third, rows, book=copy, replace_previous=True)
+    assert copy.exists()
+    assert [b for b, _n, _u in registry.books()] == [book_key(third)]
+    assert registry.conflicts(rows, exclude_book=third) == []
+
+
+def test_version_0_registry_is_migrated(tmp_path):
+    path = tmp_path / "registry.sqlite3"
+    db = sqlite3.connect(path)
+    db.executescript("""
+        CREATE TABLE books (book TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, rows INTEGER NOT NULL, updated TEXT NOT NULL);
+        CREATE TABLE numbers (
+            number TEXT NOT NULL, book TEXT NOT NULL, row INTEGER NOT NULL, field TEXT NOT NULL,
+            external_id TEXT NOT NULL DEFAULT '', PRIMARY KEY (book, row, field)
+        ) WITHOUT ROWID;
+        CREATE INDEX numbers_by_number ON numbers (number);
+        INSERT INTO books VALUES ('/books/a.csv', 1, 1, 3, '2026-01-01T00:00:00');
+        INSERT INTO numbers VALUES ('+61400000001', '/books/a.csv', 0, 'Mobile Number', '');
+        INSERT INTO numbers VALUES ('+61400000001', '/books/a.csv', 2, 'Mobile Number', '');
+    """)
+    db.commit()
+    db.close()
+
+    registry = NumberRegistry(path)
+    try:
+        assert registry.lookup("+61400000001") == [("/books/a.csv", 0, "Mobile Number", "")]
+        assert registry._db.execute("PRAGMA user_version").fetchone()[0] == 1
+    finally:
+        registry.close()
@@ -0,0 +1,169 @@
+import pytest
+
+from ringcentral_csv_editor.helper import rules as rules_module
+from ringcentral_csv_editor.helper.csv_helper import RingCentralCSV
+from ringcentral_csv_editor.helper.rules import RuleSet, UniqueIndex
+
+
+def _validators(columns, fieldnames=("First Name", "Email", "Notes", "Plan", "External Id")):
+    return RuleSet(columns).compile(fieldnames, RingCentralCSV.field_formatter)
+
+
+def _write(tmp_path, text):
+    path = tmp_path / "rules.toml"
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_load(tmp_path):
+    path = _write(tmp_path, '''
+# comment
+[columns."External Id"]
+pattern = "[A-Z0-9-]{1,20}"
+unique = true
+
+[columns."first name"]
+builtin = false
+case = "title"
+''')
+
+    rules = RuleSet.load(path)
+
+    assert rules.source == str(path)
+    assert rules.columns == {
+        "external id": {"pattern": "[A-Z0-9-]{1,20}", "unique": True},
+        "first name": {"builtin": False, "case": "title"},
+    }
+    assert rules.unique_fields(["First Name", "EXTERNAL ID "]) == ["EXTERNAL ID "]
+
+
+def test_default_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(rules_module, "DEFAULT_RULES_PATH", tmp_path / "rules.toml")
+    assert RuleSet.load() is None
+
+    _write(tmp_path, '[columns.Notes]\nmax_length = 3\n')
+    assert RuleSet.load().columns == {"notes": {"max_length": 3}}
+
+    with pytest.raises(FileNotFoundError, match="Rules file not found"):
+        RuleSet.load(tmp_path / "missing.toml")
+
+
+@pytest.mark.parametrize("text, message", [
+    ('[columns.Notes]\nmax_len = 3\n', r"unknown key\(s\) max_len"),
+    ('[columns.Notes]\nrequired = "yes"\n', r"columns\.'Notes'\.required must be true or false"),
+    ('[columns.Notes]\nmax_length = -1\n', "must be a whole number >= 0"),
+    ('[columns.Notes]\nmin_length = true\n', "must be a whole number >= 0"),
+    ('[columns.Notes]\nmax_length = 2.5\n', "must be a whole number >= 0"),
+    ('[columns.Notes]\npattern = 5\n', "pattern must be a string"),
+    ('[columns.Notes]\npattern = "[a-"\n', "pattern is not a valid regex"),
+    ('[columns.Notes]\nallowed = ["a", 1]\n', "allowed must be a list of strings"),
+    ('[columns.Notes]\ncase = "camel"\n', "case must be one of: title, upper, lower"),
+    ('[columns]\nNotes = 5\n', "must be a table"),
+    ('[colums.Notes]\nrequired = true\n', r"unknown section\(s\) colums"),
+    ('[columns.Notes\n', "rules.toml: "),
+])
+def test_load_errors(tmp_path, text, message):
+    with pytest.raises(ValueError, match=message):
+        RuleSet.load(_write(tmp_path, text))
+
+
+def test_columns_without_rules_use_the_builtin():
+    validators = _validators({"Notes": {"max_length": 5}})
+
+    assert validators["First Name"]("  ann  ") == "Ann"
+    with pytest.raises(ValueError, match="letters only"):
+        validators["First Name"]("Ann2")
+
+
+def test_builtin_runs_first_unless_switched_off():
+    assert _validators({"First Name": {"max_length": 10}})["First Name"]("ann") == "Ann"
+    with pytest.raises(ValueError, match="letters only"):
+        _validators({"First Name": {"max_length": 10}})["First Name"]("José")
+
+    own = _validators({"First Name": {"builtin": False, "pattern": r"[\w' .-]+", "case": "title"}})["First Name"]
+    assert own("josé o'neil") == "José O'Neil"
+
+
+def test_required_and_lengths():
+    notes = _validators({"Notes": {"required": True, "min_length": 2, "max_length": 4}})["Notes"]
+
+    assert notes(" ab ") == "ab"
+    with pytest.raises(ValueError, match="Required"):
+        notes("   ")
+    with pytest.raises(ValueError, match="at least 2"):
+        notes("a")
+    with pytest.raises(ValueError, match="at most 4"):
+        notes("abcde")
+    assert _validators({"Notes": {"min_length": 2}})["Notes"]("") == ""
+
+
+def test_pattern_and_message():
+    ext = _validators({"External Id": {"pattern": "[A-Z]{2}-\\d+", "case": "upper"}})["External Id"]
+    assert ext("ab-12") == "AB-12"
+    with pytest.raises(ValueError, match=r"Doesn't match the pattern for External Id: \[A-Z\]"):
+        ext("ab-12x")  # the whole value has to match
+
+    custom = _validators({"External Id": {"pattern": "\\d+", "message": "Digits please"}})["External Id"]
+    with pytest.raises(ValueError, match="^Digits please$"):
+        custom("12a")
+
+
+def test_allowed_values():
+    exact = _validators({"Plan": {"allowed": ["Gold", "Silver"]}})["Plan"]
+    assert exact("Gold") == "Gold"
+    with pytest.raises(ValueError, match="Must be one of: Gold, Silver"):
+        exact("gold")
+
+    folded = _validators({"Plan": {"allowed": ["Gold", "Silver"], "ignore_case": True}})["Plan"]
+    assert folded(" GOLD ") == "Gold"
+
+
+def test_case_applies_before_checks():
+    email = _validators({"Email": {"case": "upper", "pattern": "[A-Z@.]+"}})["Email"]
+
+    # The builtin lower-cases, then case upper-cases, then the pattern sees the result
+    assert email("Ann@Acme.com") == "ANN@ACME.COM"
+
+
+def test_digest_ignores_layout_but_not_rules(tmp_path):
+    one = RuleSet.load(_write(tmp_path, '[columns.Notes]\nmax_length = 3\nrequired = true\n'))
+    two = RuleSet.load(_write(tmp_path, '# same rules\n[columns."notes"]\nrequired = true\nmax_length = 3\n'))
+    three = RuleSet({"Notes": {"max_length": 4, "required": True}})
+
+    assert one.digest() == two.digest() != three.digest()
+
+
+def test_unique_index():
+    rows = [{"External Id": "E1", "Email": "a@x.com"}, {"External Id": "E2", "Email": ""}, {"External Id": " E1 "}]
+    index = UniqueIndex(["External Id", "Email"], rows)
+
+    assert index.counts["External Id"] == {"E1": 2, "E2": 1}
+    assert "" not in index.counts["Email"]
+    assert index.conflicts({"External Id": "E2", "Email": "a@x.com"}) == [
+        "External Id: 'E2' is already used by another row (must be unique)",
+        "Email: 'a@x.com' is already used by another row (must be unique)",
+    ]
+    # Editing a row: its own value doesn't count, other holders do
+    assert index.conflicts({"External Id": "E2"}, replacing=rows[1]) == []
+    assert index.conflicts({"External Id": "E1"}, replacing=rows[0]) != []
+
+    index.remove(rows[2])
+    index.replace(rows[1], {"External Id": "E3"})
+    assert index.counts["External Id"] == {"E1": 1, "E3": 1}
+    index.check({"External Id": "E2"})
+    with pytest.raises(ValueError, match="'E3' is already used"):
+        index.check({"External Id": "E3", "Email": ""})
+
+
+def test_book_with_rules():
+    rc = RingCentralCSV(rules=RuleSet({"External Id": {"unique": True, "pattern": "E\\d+"}}))
+    rc.fieldnames = ["First Name", "Surname", "External Id"]
+    data = []
+
+    rc.append_row(data, {"First Name": "ann", "Surname": "lee", "External Id": "E1"})
+    with pytest.raises(ValueError, match="must be unique"):
+        rc.append_row(data, {"First Name": "bob", "Surname": "ng", "External Id": "E1"})
+    with pytest.raises(ValueError, match="pattern for External Id"):
+        rc.append_row(data, {"First Name": "bob", "Surname": "ng", "External Id": "X1"})
+
+    assert [r["External Id"] for r in data] == ["E1"]
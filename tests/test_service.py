@@ -0,0 +1,180 @@
+import asyncio
+import csv
+import json
+
+import pytest
+
+from ringcentral_csv_editor.helper.rules import RuleSet
+from ringcentral_csv_editor.helper.service import BookService, ServiceError, ServiceServer
+
+FIELDS = ["First Name", "Surname", "Company", "Mobile Number", "External Id"]
+
+
+def _book(tmp_path, rows=None):
+    path = tmp_path / "book.csv"
+    rows = rows if rows is not None else [
+        ["Ann", "Lee", "Acme Widgets", "0412 345 678", "E1"],
+        ["Bob", "Smith", "Acme", "0412 000 111", "E2"],
+        ["Cat", "Smithers", "Globex", "", "E3"],
+        ["Dan2", "Ng", "", "", ""],  # invalid, kept as read
+    ]
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        writer.writerows(rows)
+    return path
+
+
+def _service(tmp_path, **kwargs):
+    service = BookService(_book(tmp_path), rules=RuleSet({"External Id": {"unique": True}}), **kwargs)
+    service.load()
+    service.write_lock = asyncio.Lock()
+    return service
+
+
+def test_load_keeps_invalid_rows(tmp_path):
+    service = _service(tmp_path)
+
+    stats = service.stats()
+    assert stats["rows"] == 4
+    assert stats["invalid"] == [{"row": 4, "error": stats["invalid"][0]["error"]}]
+    assert service.rows[0]["Mobile Number"] == "+61412345678"
+    assert service.rows[3]["First Name"] == "Dan2"
+
+
+def test_validate_checks_rules_and_the_book(tmp_path):
+    service = _service(tmp_path)
+
+    ok = service.validate({"First Name": "Eve", "Surname": "Ray", "Mobile Number": "0499 999 999"})
+    taken = service.validate({"First Name": "Eve", "Surname": "Ray", "Mobile Number": "+61412345678", "External Id": "E2"})
+    bad = service.validate({"First Name": "Eve9", "Surname": "Ray"})
+
+    assert ok == {"valid": True, "row": ok["row"], "errors": []}
+    assert ok["row"]["Mobile Number"] == "+61499999999"
+    assert taken["valid"] is False and len(taken["errors"]) == 2
+    assert "already in row 1" in taken["errors"][0]
+    assert bad["valid"] is False and bad["errors"][0].startswith("First Name:")
+    with pytest.raises(ServiceError):
+        service.validate(["not", "a", "row"])
+
+
+def test_lookup_and_search(tmp_path):
+    service = _service(tmp_path)
+
+    hit = service.lookup("0412 345 678")
+    assert hit["number"] == "+61412345678" and hit["found"]
+    assert [(m["row"], m["field"]) for m in hit["matches"]] == [(1, "Mobile Number")]
+    assert service.lookup("0400 000 000")["found"] is False
+    with pytest.raises(ServiceError) as ex:
+        service.lookup("not a number")
+    assert ex.value.status == 400
+
+    assert [m["First Name"] for m in service.search("smi")["matches"]] == ["Bob", "Cat"]
+    assert [m["First Name"] for m in service.search("acme smi")["matches"]] == ["Bob"]
+
+
+def test_append_is_all_or_nothing_and_indexed(tmp_path):
+    service = _service(tmp_path)
+    good = {"First Name": "Eve", "Surname": "Ray", "Company": "Initech", "Mobile Number": "0499 999 999"}
+    clash = {"First Name": "Fay", "Surname": "Ray", "Mobile Number": "0499 999 999"}
+
+    with pytest.raises(ServiceError) as ex:
+        asyncio.run(service.append([good, clash]))
+    assert ex.value.status == 422
+    assert [e["row"] for e in ex.value.extra["errors"]] == [2]
+    assert len(service.rows) == 4
+
+    result = asyncio.run(service.append([good]))
+    assert result["added"] == 1 and result["rows"][0]["row"] == 5
+    assert service.lookup("+61499999999")["matches"][0]["row"] == 5
+    assert [m["First Name"] for m in service.search("initech")["matches"]] == ["Eve"]
+
+
+def test_export_stays_in_the_export_folder(tmp_path):
+    service = _service(tmp_path)
+    outside = tmp_path.parent / f"{tmp_path.name}-outside.csv"
+
+    result = asyncio.run(service.export())
+    assert result == {"path": str(tmp_path / "book.served.csv"), "rows": 4}
+    assert (tmp_path / "book.served.csv").read_text(encoding="utf-8").count("\n") == 5
+
+    assert asyncio.run(service.export("copy.csv"))["path"] == str(tmp_path.resolve() / "copy.csv")
+    for bad in (str(outside), f"../{outside.name}", ".", "book.csv"):
+        with pytest.raises(ServiceError) as ex:
+            asyncio.run(service.export(bad))
+        assert ex.value.status == 400
+    assert not outside.exists()
+    assert list(tmp_path.glob(".*")) == []
+
+
+# ---- HTTP
+
+
+async def _raw(server, data: bytes) -> tuple[int, dict]:
+    reader, writer = await asyncio.open_connection(server.host, server.port)
+    writer.write(data)
+    await writer.drain()
+    status_line = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        if key.lower() == "content-length":
+            length = int(value)
+    body = await reader.readexactly(length)
+    writer.close()
+    return int(status_line.split()[1]), json.loads(body)
+
+
+def _request(method, path, payload=None, token=None, length=None):
+    body = json.dumps(payload).encode() if payload is not None else b""
+    head = f"{method} {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(body) if length is None else length}\r\n"
+    if token:
+        head += f"Authorization: Bearer {token}\r\n"
+    return head.encode("latin-1") + b"\r\n" + body
+
+
+def _with_server(tmp_path, requests, token=None):
+    async def main():
+        server = ServiceServer(_service(tmp_path), port=0, token=token)
+        await server.start()
+        try:
+            return [await _raw(server, data) for data in requests]
+        finally:
+            server._server.close()
+            await server._server.wait_closed()
+
+    return asyncio.run(main())
+
+
+def test_http_routes_and_errors(tmp_path):
+    replies = _with_server(tmp_path, [
+        _request("GET", "/lookup?number=0412%20345%20678"),
+        _request("GET", "/nope"),
+        _request("POST", "/stats"),
+        _request("GET", "/rows?limit=-1"),
+        _request("POST", "/validate", {"nothing": 1}),
+        b"POST /append HTTP/1.1\r\nContent-Length: 3\r\n\r\n{x}",
+        _request("POST", "/append", {"rows": [{"First Name": "Eve1", "Surname": "Ray"}]}),
+        _request("POST", "/export", {"path": "../elsewhere.csv"}),
+    ])
+
+    assert [status for status, _ in replies] == [200, 404, 405, 400, 400, 400, 422, 400]
+    assert replies[0][1]["matches"][0]["First Name"] == "Ann"
+    assert all("error" in body for _, body in replies[1:])
+    assert not (tmp_path.parent / "elsewhere.csv").exists()
+
+
+def test_http_token_and_bad_lengths(tmp_path):
+    replies = _with_server(tmp_path, [
+        _request("GET", "/stats"),
+        _request("GET", "/stats", token="secret"),
+        _request("POST", "/validate", token="secret", length=-5),
+        _request("POST", "/validate", token="secret", length="lots"),
+        _request("POST", "/validate", token="secret", length=64 * 1024 * 1024),
+    ], token="secret")
+
+    assert [status for status, _ in replies] == [401, 200, 400, 400, 413]
+    assert replies[1][1]["rows"] == 4
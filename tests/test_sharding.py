@@ -0,0 +1,110 @@
+import csv
+import hashlib
+import json
+
+import pytest
+
+from ringcentral_csv_editor.helper.sharding import write_shards
+
+FIELDS = ["First Name", "Surname", "Company"]
+
+
+def _rows(n, companies=("Acme",)):
+    return [
+        {"First Name": f"Ann{i}", "Surname": "Lee", "Company": companies[i % len(companies)]}
+        for i in range(n)
+    ]
+
+
+def _manifest(path):
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _read(path):
+    with path.open(newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def test_row_cap_and_reassembly(tmp_path):
+    rows = _rows(25)
+
+    manifest = _manifest(write_shards(FIELDS, rows, tmp_path, max_rows=10))
+
+    assert [s["rows"] for s in manifest["shards"]] == [10, 10, 5]
+    assert [s["file"] for s in manifest["shards"]] == [
+        "AddressBook-001.csv", "AddressBook-002.csv", "AddressBook-003.csv",
+    ]
+    assert manifest["total_rows"] == 25
+    back = [r for s in manifest["shards"] for r in _read(tmp_path / s["file"])]
+    assert back == rows
+
+
+def test_byte_cap_counts_the_header(tmp_path):
+    rows = _rows(40)
+    rows[7]["Company"] = "x" * 500  # bigger than the cap on its own
+
+    manifest = _manifest(write_shards(FIELDS, rows, tmp_path, max_bytes=200))
+
+    for shard in manifest["shards"]:
+        data = (tmp_path / shard["file"]).read_bytes()
+        assert len(data) == shard["bytes"]
+        assert data.startswith(b"First Name,Surname,Company\r\n")
+        assert shard["bytes"] <= 200 or shard["rows"] == 1
+    assert sum(s["rows"] for s in manifest["shards"]) == 40
+    assert [s["rows"] for s in manifest["shards"] if s["bytes"] > 200] == [1]
+
+
+def test_manifest_checksums_match_files(tmp_path):
+    manifest = _manifest(write_shards(FIELDS, _rows(30), tmp_path, max_rows=7, workers=3))
+
+    for shard in manifest["shards"]:
+        data = (tmp_path / shard["file"]).read_bytes()
+        assert hashlib.sha256(data).hexdigest() == shard["sha256"]
+        assert len(data) == shard["bytes"]
+    assert manifest["fieldnames"] == FIELDS
+    assert (manifest["max_rows"], manifest["max_bytes"], manifest["route_by"]) == (7, None, None)
+
+
+def test_routing_and_colliding_keys(tmp_path):
+    rows = _rows(9, companies=("Acme/Ltd", "Acme Ltd", "acme-ltd"))
+
+    manifest = _manifest(write_shards(FIELDS, rows, tmp_path, max_rows=2, route_by="Company"))
+
+    by_key = {}
+    for shard in manifest["shards"]:
+        by_key.setdefault(shard["key"], []).append(shard["file"])
+        assert {r["Company"] for r in _read(tmp_path / shard["file"])} == {shard["key"]}
+    assert by_key["Acme/Ltd"] == ["AddressBook-Acme-Ltd-001.csv", "AddressBook-Acme-Ltd-002.csv"]
+    # Same sanitised / case-folded key: a hash of the raw value is added
+    assert all(name.startswith("AddressBook-Acme-Ltd-") and len(name.split("-")) == 5 for name in by_key["Acme Ltd"])
+    assert len({n.casefold() for names in by_key.values() for n in names}) == 6
+
+
+def test_template_without_counter_gets_suffixes(tmp_path):
+    manifest = _manifest(write_shards(FIELDS, _rows(5), tmp_path, max_rows=2, name_template="Contacts.csv"))
+
+    assert [s["file"] for s in manifest["shards"]] == ["Contacts.csv", "Contacts-2.csv", "Contacts-3.csv"]
+
+    manifest = _manifest(write_shards(FIELDS, _rows(1), tmp_path / "m", name_template="MANIFEST.json"))
+    assert manifest["shards"][0]["file"] == "MANIFEST-2.json"
+
+
+@pytest.mark.parametrize("template", ["{key}/part-{part}.csv", "sub\\AddressBook-{index}.csv", "..", "{index"])
+def test_bad_templates_are_refused(tmp_path, template):
+    with pytest.raises(ValueError, match="template"):
+        write_shards(FIELDS, _rows(3), tmp_path / "out", max_rows=1, route_by="Company", name_template=template)
+    assert not list((tmp_path / "out").glob("*.csv"))
+
+
+def test_bad_arguments(tmp_path):
+    with pytest.raises(ValueError, match="max_rows"):
+        write_shards(FIELDS, _rows(3), tmp_path, max_rows=0)
+    with pytest.raises(ValueError, match="routing column"):
+        write_shards(FIELDS, _rows(3), tmp_path, route_by="Fax")
+
+
+def test_empty_book_gives_one_header_only_file(tmp_path):
+    manifest = _manifest(write_shards(FIELDS, [], tmp_path, max_rows=10))
+
+    assert [(s["file"], s["rows"]) for s in manifest["shards"]] == [("AddressBook-001.csv", 0)]
+    assert (tmp_path / "AddressBook-001.csv").read_bytes() == b"First Name,Surname,Company\r\n"
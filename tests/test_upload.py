@@ -0,0 +1,195 @@
+import io
+import json
+import threading
+import time
+
+import pytest
+
+from ringcentral_csv_editor.helper.mock_server import MockContactsServer, _Handler
+from ringcentral_csv_editor.helper.upload import BulkUploader, UploadError, row_to_contact, target_key
+
+
+class _Scripted(_Handler):
+    '''
+    Lets a test decide per request: server.script(batch, attempt) returns None
+    to answer normally, a number of seconds to wait first, or (status, headers).
+    '''
+    def do_POST(self):
+        raw = self.rfile.read(int(self.headers["Content-Length"]))
+        srv = self.server
+        batch = json.loads(raw)["batch"]
+        with srv.lock:
+            attempt = srv.attempts[batch] = srv.attempts.get(batch, 0) + 1
+        reply = srv.script(batch, attempt)
+        if isinstance(reply, tuple):
+            with srv.lock:
+                srv.stats["requests"] += 1
+            status, headers = reply
+            self._reply(status, {"message": "scripted"}, headers)
+            return
+        if reply:
+            time.sleep(reply)
+        rfile, self.rfile = self.rfile, io.BytesIO(raw)
+        try:
+            super().do_POST()
+        finally:
+            self.rfile = rfile
+
+
+@pytest.fixture
+def server():
+    srv = MockContactsServer(port=0)
+    srv.RequestHandlerClass = _Scripted
+    srv.script = lambda batch, attempt: None
+    srv.attempts = {}
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _rows(n):
+    return [{"First Name": f"Ann{i}", "Surname": "Lee", "Mobile Number": f"+6141200{i:04d}", "Fax": "x"} for i in range(n)]
+
+
+def _uploader(server, tmp_path, **kwargs):
+    options = {"batch_size": 10, "concurrency": 2, "backoff": 0.01, "state_path": tmp_path / "up.json"}
+    return BulkUploader(server.url, **{**options, **kwargs})
+
+
+def test_row_to_contact():
+    row = {"First Name": " Ann ", " surname": "Lee", "Email": "", "Fax": "123", None: "x", "External Id": "E1"}
+
+    assert row_to_contact(row) == {"firstName": "Ann", "lastName": "Lee", "externalId": "E1"}
+
+
+def test_target_key_ignores_case_of_host_and_trailing_slash():
+    assert target_key("http://Example.com/contacts/") == target_key("http://example.com/contacts")
+    assert target_key("http://example.com/contacts") != target_key("http://example.com/other")
+    assert target_key("http://example.com/contacts", "a") != target_key("http://example.com/contacts", "b")
+
+
+def test_full_upload(server, tmp_path):
+    stats = _uploader(server, tmp_path).upload(_rows(95))
+
+    assert (stats["rows"], stats["batches"], stats["batches_sent"], stats["acked"]) == (95, 10, 10, 10)
+    assert stats["retries"] == 0 and stats["connections"] <= 2
+    assert server.contacts == 95 and len(server.batches) == 10
+    assert not (tmp_path / "up.json").exists()
+
+    # Same batches again: stored once thanks to the Idempotency-Key
+    _uploader(server, tmp_path).upload(_rows(95))
+    assert server.contacts == 95 and server.stats["duplicates"] == 10
+
+
+def test_watermark_only_advances_in_order(server, tmp_path):
+    server.script = lambda batch, attempt: 0.3 if batch == 0 else None
+    seen = []
+
+    _uploader(server, tmp_path, concurrency=4).upload(_rows(50), progress=lambda acked, total: seen.append(acked))
+
+    assert seen == [0, 0, 0, 0, 5]
+
+
+def test_failed_batch_saves_watermark_and_resume_skips_acked(server, tmp_path):
+    server.script = lambda batch, attempt: (400, {}) if batch == 3 else None
+
+    with pytest.raises(UploadError) as ex:
+        _uploader(server, tmp_path, concurrency=1).upload(_rows(100))
+    assert (ex.value.batch, ex.value.status) == (3, 400)
+    state = json.loads((tmp_path / "up.json").read_text(encoding="utf-8"))
+    assert (state["acked"], state["batches"], state["batch_size"]) == (3, 10, 10)
+
+    server.script = lambda batch, attempt: None
+    stats = _uploader(server, tmp_path, concurrency=1).upload(_rows(100))
+
+    assert (stats["skipped_batches"], stats["batches_sent"]) == (3, 7)
+    assert server.contacts == 100 and server.stats["duplicates"] == 0
+    assert not (tmp_path / "up.json").exists()
+
+
+def test_resume_after_out_of_order_failure_is_deduplicated(server, tmp_path):
+    # Batches 1-3 land while batch 0 is slow; batch 4 then fails for good
+    server.script = lambda batch, attempt: (400, {}) if batch == 4 else (0.3 if batch == 0 else None)
+
+    with pytest.raises(UploadError):
+        _uploader(server, tmp_path, concurrency=4).upload(_rows(60))
+    assert json.loads((tmp_path / "up.json").read_text(encoding="utf-8"))["acked"] == 0
+
+    server.script = lambda batch, attempt: None
+    stats = _uploader(server, tmp_path, concurrency=4).upload(_rows(60))
+
+    assert stats["skipped_batches"] == 0
+    assert server.contacts == 60 and len(server.batches) == 6
+    assert server.stats["duplicates"] >= 3
+
+
+def test_retries_503(server, tmp_path):
+    server.script = lambda batch, attempt: (503, {}) if attempt == 1 else None
+
+    stats = _uploader(server, tmp_path).upload(_rows(40))
+
+    assert stats["retries"] == 4 and stats["rate_limited"] == 0
+    assert server.contacts == 40
+
+
+def test_retry_after_is_honoured(server, tmp_path):
+    server.script = lambda batch, attempt: (429, {"Retry-After": "0.2"}) if batch < 2 and attempt == 1 else None
+    started = time.monotonic()
+
+    stats = _uploader(server, tmp_path).upload(_rows(40))
+
+    assert time.monotonic() - started >= 0.2
+    assert stats["rate_limited"] == 2 and stats["retries"] == 2
+    assert server.contacts == 40
+
+
+def test_retries_run_out(server, tmp_path):
+    server.script = lambda batch, attempt: (503, {})
+
+    with pytest.raises(UploadError) as ex:
+        _uploader(server, tmp_path, concurrency=1, max_retries=2).upload(_rows(5))
+
+    assert (ex.value.batch, ex.value.status) == (0, 503)
+    assert server.attempts == {0: 3}
+
+
+def test_rejected_token_is_not_retried(server, tmp_path):
+    server.token = "secret"
+
+    with pytest.raises(UploadError) as ex:
+        _uploader(server, tmp_path, concurrency=1, token="wrong").upload(_rows(30))
+
+    assert ex.value.status == 401
+    assert server.stats["requests"] == 1
+    assert _uploader(server, tmp_path, token="secret").upload(_rows(30))["acked"] == 3
+
+
+def test_state_for_another_target_or_rows(server, tmp_path):
+    server.script = lambda batch, attempt: (400, {}) if batch == 2 else None
+    with pytest.raises(UploadError):
+        _uploader(server, tmp_path, concurrency=1).upload(_rows(50))
+    server.script = lambda batch, attempt: None
+    state = tmp_path / "up.json"
+    fingerprint = json.loads(state.read_text(encoding="utf-8"))["fingerprint"]
+
+    # Another account: the saved watermark does not apply
+    other = _uploader(server, tmp_path, token="other")
+    assert other.load_state(fingerprint) == 0
+
+    # Same target, different batches
+    with pytest.raises(ValueError, match="different rows or batch size"):
+        _uploader(server, tmp_path).upload(_rows(51))
+    with pytest.raises(ValueError, match="different rows or batch size"):
+        _uploader(server, tmp_path, batch_size=5).upload(_rows(50))
+
+    stats = _uploader(server, tmp_path).upload(_rows(51), restart=True)
+    assert stats["skipped_batches"] == 0 and not state.exists()
+
+
+def test_bad_arguments():
+    with pytest.raises(ValueError, match="batch_size"):
+        BulkUploader("http://127.0.0.1:1/contacts", batch_size=0)
+    with pytest.raises(ValueError, match="http"):
+        BulkUploader("ftp://example.com/contacts")
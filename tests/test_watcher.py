@@ -0,0 +1,83 @@
+import csv
+import json
+import threading
+import time
+
+from ringcentral_csv_editor.helper.watcher import FolderWatcher, process_file
+
+FIELDS = ["First Name", "Surname", "Mobile Number", "Business Number", "External Id"]
+
+
+def _write(path, rows):
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        writer.writerows(rows)
+
+
+def _rules(tmp_path):
+    path = tmp_path / "rules.toml"
+    path.write_text('[columns."External Id"]\nunique = true\n', encoding="utf-8")
+    return str(path)
+
+
+def test_report_uses_input_row_numbers(tmp_path):
+    src = tmp_path / "drop.csv"
+    _write(src, [
+        ["Ann", "Lee", "0412 000 001", "", "E1"],
+        ["Bob2", "Lee", "0412 000 002", "", "E2"],  # invalid name
+        ["Cat", "Lee", "0412 000 003", "", "E1"],  # unique clash
+        ["Dan", "Lee", "0412 000 004", "0412 000 001", "E4"],
+        ["Eve", "Lee", "", "0412 000 004", "E5"],
+    ])
+
+    report = process_file(str(src), str(tmp_path / "out"), rules_path=_rules(tmp_path))
+
+    assert report["status"] == "ok"
+    assert (report["rows_read"], report["rows_written"]) == (5, 3)
+    assert [i["row"] for i in report["invalid"]] == [2, 3]
+    assert report["duplicates"] == [
+        {"number": "+61412000001", "row": 1, "field": "Mobile Number", "duplicate_row": 4, "duplicate_field": "Business Number"},
+        {"number": "+61412000004", "row": 4, "field": "Mobile Number", "duplicate_row": 5, "duplicate_field": "Business Number"},
+    ]
+    on_disk = json.loads((tmp_path / "out" / "drop.report.json").read_text(encoding="utf-8"))
+    assert on_disk["duplicates"] == report["duplicates"]
+    assert set(on_disk["timings"]) >= {"read_s", "normalise_s", "duplicates_s", "write_s", "total_s"}
+    with (tmp_path / "out" / "drop.cleaned.csv").open(newline="", encoding="utf-8") as f:
+        assert [r["First Name"] for r in csv.DictReader(f)] == ["Ann", "Dan", "Eve"]
+
+
+def test_unreadable_file_is_reported_not_raised(tmp_path):
+    src = tmp_path / "junk.csv"
+    src.write_text("no,header,here\n1,2,3\n", encoding="utf-8")
+
+    report = process_file(str(src), str(tmp_path / "out"), rules_path=_rules(tmp_path))
+
+    assert report["status"] == "failed"
+    assert "header row" in report["error"]
+    assert (tmp_path / "out" / "junk.report.json").exists()
+
+
+def test_watcher_processes_and_archives(tmp_path):
+    drop, out = tmp_path / "drop", tmp_path / "out"
+    drop.mkdir()
+    _write(drop / "a.csv", [["Ann", "Lee", "0412 000 001", "", ""]])
+    (drop / "b.csv").write_text("nothing useful\n", encoding="utf-8")
+    watcher = FolderWatcher(drop, out, workers=1, poll_interval=0.05, rules_path=_rules(tmp_path))
+
+    thread = threading.Thread(target=watcher.run)
+    thread.start()
+    try:
+        deadline = time.monotonic() + 30
+        while watcher.stats["processed"] + watcher.stats["failed"] < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        watcher.stop()
+        thread.join(timeout=30)
+
+    assert not thread.is_alive()
+    assert (watcher.stats["processed"], watcher.stats["failed"]) == (1, 1)
+    assert (drop / "processed" / "a.csv").exists()
+    assert (drop / "failed" / "b.csv").exists()
+    assert (out / "a.cleaned.csv").exists()
+    assert list(drop.glob("*.csv")) == []